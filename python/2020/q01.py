@@ -2,18 +2,18 @@ import itertools
 import math
 import typing as t
 
-import aocd
+from aoc import inputs
 
 import utils
 
 
-def part_one(numbers: t.List[int]):
+def part_one(numbers: t.Sequence[int]) -> int:
     """
     Find the two numbers that sum to 2020 and multiply them for the answer
 
     O(n log n)
     """
-    numbers.sort()
+    numbers = utils.sorted_array(numbers)
     start = 0
     end = len(numbers) - 1
     while start < end:
@@ -24,12 +24,11 @@ def part_one(numbers: t.List[int]):
         elif result > 2020:
             end -= 1
         else:
-            print(f"Part 1: {first} * {second} = {first * second}")
-            return
-    print("No Solution")
+            return first * second
+    return -1
 
 
-def part_two(numbers: t.List[int]):
+def part_two(numbers: t.Sequence[int]) -> int:
     """
     Find the three numbers that sum to 2020 and multiply them for the answer
 
@@ -37,12 +36,15 @@ def part_two(numbers: t.List[int]):
     """
     for combo in itertools.combinations(numbers, 3):
         if sum(combo) == 2020:
-            print(f"Part 2: {' * '.join(map(str, combo))} = {math.prod(combo)}")
-            return
-    print("No Solution")
+            return math.prod(combo)
+    return -1
+
+
+def prepare(data: str) -> t.Tuple[t.Sequence[int]]:
+    return (utils.int_numbers(data),)
 
 
 if __name__ == "__main__":
-    numbers = utils.int_numbers(aocd.get_data(day=1, year=2020))
-    part_one(numbers)
-    part_two(numbers)
+    numbers = prepare(inputs.get_data(day=1, year=2020))
+    print("Part 1: ", part_one(*numbers))
+    print("Part 2: ", part_two(*numbers))
@@ -1,6 +1,6 @@
 import typing as t
 
-import aocd
+from aoc import inputs
 
 
 def parse(policy: str) -> t.Tuple[int, int, str, str]:
@@ -27,7 +27,11 @@ def part_two(policies: t.List[str]) -> int:
     return counter
 
 
+def prepare(data: str) -> t.Tuple[t.List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
-    policies = aocd.get_data(day=2, year=2020).splitlines()
-    print("Part 1: ", part_one(policies))
-    print("Part 2: ", part_two(policies))
+    policies = prepare(inputs.get_data(day=2, year=2020))
+    print("Part 1: ", part_one(*policies))
+    print("Part 2: ", part_two(*policies))
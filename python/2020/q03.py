@@ -1,6 +1,6 @@
 import typing as t
 
-import aocd
+from aoc import inputs
 
 
 def traverse(treemap: t.List[str], down: int, right: int) -> int:
@@ -29,7 +29,11 @@ def part_two(treemap: t.List[str]) -> int:
     )
 
 
+def prepare(data: str) -> t.Tuple[t.List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
-    treemap = aocd.get_data(day=3, year=2020).splitlines()
-    print("Part 1: ", part_one(treemap))
-    print("Part 2: ", part_two(treemap))
+    treemap = prepare(inputs.get_data(day=3, year=2020))
+    print("Part 1: ", part_one(*treemap))
+    print("Part 2: ", part_two(*treemap))
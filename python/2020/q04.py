@@ -1,5 +1,5 @@
 import re
-import aocd
+from aoc import inputs
 
 
 def part_one(batchfile: str) -> int:
@@ -24,6 +24,6 @@ def part_two(batchfile: str) -> int:
 
 
 if __name__ == "__main__":
-    batchfile = aocd.get_data(day=4, year=2020)
+    batchfile = inputs.get_data(day=4, year=2020)
     print("Part 1: ", part_one(batchfile))
     print("Part 2: ", part_two(batchfile))
@@ -1,20 +1,28 @@
 import typing as t
-import aocd
+from aoc import inputs
 
+from utils.bits import pattern
 
-table = str.maketrans("FBLR", "0101")
+
+def seat_id(boarding_pass: str) -> int:
+    # the row and column are one binary number, B and R the ones
+    return pattern(boarding_pass, "BR")
 
 
 def part_one(passes: t.List[str]) -> int:
-    return max(int(bp.translate(table), 2) for bp in passes)
+    return max(seat_id(bp) for bp in passes)
 
 
 def part_two(passes: t.List[str]) -> int:
-    ordered = sorted(int(bp.translate(table), 2) for bp in passes)
+    ordered = sorted(seat_id(bp) for bp in passes)
     return next(bp + 1 for n, bp in enumerate(ordered) if ordered[n + 1] == bp + 2)
 
 
+def prepare(data: str) -> t.Tuple[t.List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
-    passes = aocd.get_data(day=5, year=2020).splitlines()
-    print("Part 1: ", part_one(passes))
-    print("Part 2: ", part_two(passes))
+    passes = prepare(inputs.get_data(day=5, year=2020))
+    print("Part 1: ", part_one(*passes))
+    print("Part 2: ", part_two(*passes))
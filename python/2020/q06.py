@@ -1,6 +1,6 @@
 import typing as t
 
-import aocd
+from aoc import inputs
 
 
 def part_one(data: t.List[str]) -> int:
@@ -13,7 +13,11 @@ def part_two(data: t.List[str]) -> int:
     )
 
 
+def prepare(data: str) -> t.Tuple[t.List[str]]:
+    return (data.split("\n\n"),)
+
+
 if __name__ == "__main__":
-    data = aocd.get_data(day=6, year=2020).split("\n\n")
-    print("Part 1: ", part_one(data))
-    print("Part 2: ", part_two(data))
+    data = prepare(inputs.get_data(day=6, year=2020))
+    print("Part 1: ", part_one(*data))
+    print("Part 2: ", part_two(*data))
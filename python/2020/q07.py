@@ -1,41 +1,40 @@
-import itertools
+from __future__ import annotations
+
 import typing as t
 
-import aocd
-import networkx as nx
-from parse import compile
+from aoc import inputs
+
+from utils.graph import Graph
+from utils.template import compile
 
-outer_parser = compile("{} bag")
+rule_parser = compile("{} bags contain {}.")
 inner_parser = compile("{:d} {} bag")
 
 
-def build_graph(rules: t.List[str]) -> nx.DiGraph:
-    graph = nx.DiGraph()
-    for rule in rules:
-        outer_colour = outer_parser.search(rule)[0]
-        inside = [color for color in inner_parser.findall(rule)]
-        bags = [color[1] for color in inside]
-        weights = [color[0] for color in inside]
-        graph.add_weighted_edges_from(zip(itertools.repeat(outer_colour), bags, weights))
-    return graph
+def build_graph(rules: str) -> Graph:
+    """An edge from each colour of bag to each colour it holds, weighted by how many."""
+    return Graph.from_edges(
+        (outer_colour, colour, count)
+        for outer_colour, contents in rule_parser.scan(rules, lines=True)
+        for count, colour in inner_parser.scan(contents)
+    )
+
 
+def part_one(graph: Graph) -> int:
+    return len(graph.ancestors(graph.id("shiny gold")))
 
-def part_one(graph: nx.DiGraph) -> int:
-    return len(nx.ancestors(graph, "shiny gold"))
 
+def part_two(graph: Graph) -> int:
+    # the bags inside a bag are the bags it holds and everything inside each of them
+    inside = graph.fold(lambda node, edges: sum(count * (1 + held) for _, count, held in edges))
+    return inside[graph.id("shiny gold")]
 
-def part_two(graph: nx.DiGraph) -> int:
-    def counter(node: str) -> int:
-        total = 0
-        for next_node, attrs in graph[node].items():
-            total += attrs["weight"] + (counter(next_node) * attrs["weight"])
-        return total
 
-    return counter("shiny gold")
+def prepare(data: str) -> t.Tuple[Graph]:
+    return (build_graph(data),)
 
 
 if __name__ == "__main__":
-    data = aocd.get_data(day=7, year=2020).splitlines()
-    g = build_graph(data)
-    print("Part 1: ", part_one(g))
-    print("Part 2: ", part_two(g))
+    g = prepare(inputs.get_data(day=7, year=2020))
+    print("Part 1: ", part_one(*g))
+    print("Part 2: ", part_two(*g))
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import typing as t
-import aocd
+from aoc import inputs
 from enum import Enum
 
-from parse import compile
+from utils.template import compile
 
 
 parser = compile("{opcode} {num:d}")
@@ -24,32 +24,39 @@ class OpCode(str, Enum):
         return OpCode.acc
 
 
-@dataclass(eq=True)
 class Instruction:
-    opcode: OpCode
-    num: int
+    __slots__ = ("opcode", "num")
 
     def __init__(self, opcode: str, num: int):
         self.opcode = OpCode[opcode]
         self.num = num
 
+    def __eq__(self, other: t.Any) -> bool:
+        if not isinstance(other, Instruction):
+            return NotImplemented
+        return self.opcode is other.opcode and self.num == other.num
+
+    def __hash__(self):
+        return hash((self.opcode, self.num))
+
+    def __repr__(self):
+        return f"Instruction(opcode={self.opcode!r}, num={self.num!r})"
+
     def execute(self, pointer: int, acc: int) -> t.Tuple[int, int]:
-        return self._exec(pointer, acc, self.opcode, self.num)
+        opcode = self.opcode
+        if opcode is OpCode.nop:
+            return pointer + 1, acc
+        elif opcode is OpCode.acc:
+            return pointer + 1, acc + self.num
+        elif opcode is OpCode.jmp:
+            return pointer + self.num, acc
+        raise ValueError
 
     def flipped(self) -> Instruction:
         if self.opcode is OpCode.acc:
             return self
         return Instruction(self.opcode.flip().value, self.num)
 
-    def _exec(self, pointer: int, acc: int, opcode: OpCode, num: int) -> t.Tuple[int, int]:
-        if opcode == OpCode.nop:
-            return pointer + 1, acc
-        elif opcode == OpCode.acc:
-            return pointer + 1, acc + num
-        elif opcode == OpCode.jmp:
-            return pointer + num, acc
-        raise ValueError
-
 
 @dataclass
 class Frame:
@@ -93,10 +100,11 @@ def part_two(instructions: t.List[Instruction]) -> int:
     return acc
 
 
+def prepare(data: str) -> t.Tuple[t.List[Instruction]]:
+    return ([Instruction(opcode, num) for opcode, num in parser.scan(data, lines=True)],)
+
+
 if __name__ == "__main__":
-    instructions: t.List[Instruction] = [
-        Instruction(**parser.search(instruction).named)
-        for instruction in aocd.get_data(day=8, year=2020).splitlines()
-    ]
-    print("Part 1: ", part_one(instructions))
-    print("Part 2: ", part_two(instructions))
+    instructions = prepare(inputs.get_data(day=8, year=2020))
+    print("Part 1: ", part_one(*instructions))
+    print("Part 2: ", part_two(*instructions))
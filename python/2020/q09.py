@@ -1,17 +1,26 @@
 from collections import deque
 import itertools
 import typing as t
-import aocd
+from aoc import generators, inputs, variants
+from aoc.budgets import budget
 
+first_invalid = variants.problem(
+    "2020 q09 first invalid",
+    size=len,
+    sample=lambda size, seed: prepare(generators.generate(2020, 9, size, seed)),
+    default="pairs",
+    crossovers=[(8, "queue"), (181, "pairs")],
+)
 
+
+@first_invalid.variant("queue")
+@budget(ms=150, mb=5)
 def part_one_optimised(data: t.List[int]) -> int:
     """
     I expected that this version would have better performance as it doesn't
     need to re-compute the combinations of all "middle" numbers. Turns out that
     computing every combination, once, is more expensive than recomputing a subset
     of combinations many times.
-
-    Runtime: 29.6ms
     """
     low = 0
     high = 25
@@ -28,8 +37,9 @@ def part_one_optimised(data: t.List[int]) -> int:
     return -1
 
 
-def part_one(data: t.List[int]) -> int:
-    """5.75ms"""
+@first_invalid.variant("pairs")
+@budget(ms=40, mb=5)
+def part_one_pairs(data: t.List[int]) -> int:
     low = 0
     high = 25
     while high < len(data):
@@ -43,7 +53,13 @@ def part_one(data: t.List[int]) -> int:
     return -1
 
 
-def part_two(data: t.List[int], target: int) -> int:
+def part_one(data: t.List[int]) -> int:
+    return first_invalid(data)
+
+
+def part_two(data: t.List[int], target: t.Optional[int] = None) -> int:
+    if target is None:
+        target = part_one(data)
     if target <= 0:
         return -1
     start = end = 0
@@ -58,8 +74,12 @@ def part_two(data: t.List[int], target: int) -> int:
     return -1
 
 
+def prepare(data: str) -> t.Tuple[t.List[int]]:
+    return ([int(num) for num in data.splitlines()],)
+
+
 if __name__ == "__main__":
-    data = [int(num) for num in aocd.get_data(day=9, year=2020).splitlines()]
+    data, = prepare(inputs.get_data(day=9, year=2020))
     p1 = part_one(data)
     print("Part 1: ", p1)
     print("Part 2: ", part_two(data, p1))
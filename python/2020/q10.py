@@ -1,22 +1,22 @@
+from array import array
 from functools import lru_cache
 
 import typing as t
-import aocd
+from aoc import inputs
 
 from collections import Counter
-from utils import int_numbers
+from utils import int_numbers, sorted_array
 
 
-def part_one(data: t.List[int]) -> int:
-    data = sorted(data)
+def part_one(data: t.Sequence[int]) -> int:
+    data = sorted_array(data)
     # include outlet and device
-    data = [0] + data + [data[-1] + 3]
+    data = array("q", [0]) + data + array("q", [data[-1] + 3])
     counter = Counter([jolt - data[i - 1] for i, jolt in enumerate(data)][1:])
     return counter[1] * counter[3]
 
 
-def part_two(data: t.List[int]) -> int:
-    data = sorted(data)
+def part_two(data: t.Sequence[int]) -> int:
     valid = set(data)
     last = max(data)
 
@@ -33,7 +33,11 @@ def part_two(data: t.List[int]) -> int:
     return combos(0)
 
 
+def prepare(data: str) -> t.Tuple[t.Sequence[int]]:
+    return (int_numbers(data),)
+
+
 if __name__ == "__main__":
-    data = int_numbers(aocd.get_data(day=10, year=2020))
-    print("Part 1: ", part_one(data))
-    print("Part 2: ", part_two(data))
+    data = prepare(inputs.get_data(day=10, year=2020))
+    print("Part 1: ", part_one(*data))
+    print("Part 2: ", part_two(*data))
@@ -4,7 +4,7 @@ import dataclasses
 import enum
 import operator
 import typing as t
-import aocd
+from aoc import inputs
 
 
 class Heading(enum.IntEnum):
@@ -93,7 +93,11 @@ def part_two(data: str) -> int:
     return sum(map(abs, ship))
 
 
+def prepare(data: str) -> t.Tuple[t.List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
-    data = aocd.get_data(day=12, year=2020).splitlines()
-    print("Part 1: ", part_one(data))
-    print("Part 2: ", part_two(data))
+    data = prepare(inputs.get_data(day=12, year=2020))
+    print("Part 1: ", part_one(*data))
+    print("Part 2: ", part_two(*data))
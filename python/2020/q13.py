@@ -1,17 +1,21 @@
 import math
 import typing as t
-import aocd
+from aoc import inputs
 
 
-def part_one(depart: int, buses: t.List[int]) -> int:
-    return math.prod(min((bus - (depart % bus), bus) for bus in buses))
+Schedule = t.List[t.Tuple[int, int]]
 
 
-def part_two(buses: t.List[t.Tuple[int, int]]) -> int:
+def part_one(depart: int, schedule: Schedule) -> int:
+    return math.prod(min((bus - (depart % bus), bus) for bus, _ in schedule))
+
+
+def part_two(depart: int, schedule: Schedule) -> int:
+    # the departure time plays no part in finding the earliest aligned timestamp
     # buses = [(7, 0), (13, 1), (59, 4), (31, 6), (19, 7)]
     t = 0
     combined_factor = 1
-    for bus, offset in buses:
+    for bus, offset in schedule:
         # find each successive multiple, and skip ahead by the combined multiples to find the next
         while (t + offset) % bus != 0:
             t += combined_factor
@@ -20,9 +24,13 @@ def part_two(buses: t.List[t.Tuple[int, int]]) -> int:
     return t
 
 
-if __name__ == "__main__":
-    depart, timetable = aocd.get_data(day=13, year=2020).splitlines()
-    buses = [int(bus) for bus in timetable.split(",") if bus != "x"]
+def prepare(data: str) -> t.Tuple[int, Schedule]:
+    depart, timetable = data.splitlines()
     schedule = [(int(bus), idx) for idx, bus in enumerate(timetable.split(",")) if bus != "x"]
-    print("Part 1: ", part_one(int(depart), buses))
-    print("Part 2: ", part_two(schedule))
+    return int(depart), schedule
+
+
+if __name__ == "__main__":
+    notes = prepare(inputs.get_data(day=13, year=2020))
+    print("Part 1: ", part_one(*notes))
+    print("Part 2: ", part_two(*notes))
@@ -1,12 +1,22 @@
 import typing as t
-import aocd
+from aoc import generators, inputs, variants
+from aoc.budgets import budget
 
+# the work is the number of turns, whatever the starting numbers
+memory_game = variants.problem(
+    "2020 q15 memory game",
+    size=lambda data, target=2020: target,
+    sample=lambda size, seed: (*prepare(generators.generate(2020, 15, 6, seed)), size),
+    default="list",
+    crossovers=[(8, "dict"), (181, "list")],
+)
 
+
+@memory_game.variant("dict")
+@budget(ms=14000, mb=600, target=30_000_000)
 def solve_dict(data: t.List[int], target=2020) -> int:
     """
     Store last turn per spoken number in a dictionary
-
-    Time: 8s
     """
     spoken = {num: turn for turn, num in enumerate(data, 1)}
     speak = -1
@@ -17,13 +27,15 @@ def solve_dict(data: t.List[int], target=2020) -> int:
     return speak
 
 
+@memory_game.variant("list")
+@budget(ms=7500, mb=500, target=30_000_000)
 def solve_preallocate(data: t.List[int], target=2020) -> int:
     """
     Preallocate an array to avoid hash overhead.
-
-    Time: 4s
     """
-    spoken = [0] * target
+    # with a spare last slot for the first turn's `spoken[-1]`, so that it can't clobber the
+    # turn of any number that is actually spoken
+    spoken = [0] * (max(target, max(data) + 1) + 1)
     for turn, num in enumerate(data, 1):
         spoken[num] = turn
     speak = -1
@@ -34,7 +46,19 @@ def solve_preallocate(data: t.List[int], target=2020) -> int:
     return speak
 
 
+def part_one(data: t.List[int]) -> int:
+    return memory_game(data, 2020)
+
+
+def part_two(data: t.List[int]) -> int:
+    return memory_game(data, 30000000)
+
+
+def prepare(data: str) -> t.Tuple[t.List[int]]:
+    return ([int(num) for num in data.split(",")],)
+
+
 if __name__ == "__main__":
-    data = [int(num) for num in aocd.get_data(day=15, year=2020).split(",")]
-    print("Part 1: ", solve_preallocate(data, 2020))
-    print("Part 2: ", solve_preallocate(data, 30000000))
+    data = prepare(inputs.get_data(day=15, year=2020))
+    print("Part 1: ", part_one(*data))
+    print("Part 2: ", part_two(*data))
@@ -1,15 +1,18 @@
 from collections import defaultdict
-import itertools
 import math
-from parse import compile
+from utils.template import compile
 import typing as t
-import aocd
 
+from aoc import inputs
+
+import utils
 from utils import only
+from utils.boxes import IntervalSet
+
+np = utils.lazy_import("numpy")
 
 
-Range = t.Set[int]
-Sections = t.Dict[str, Range]
+Sections = t.Dict[str, IntervalSet]
 Ticket = t.List[int]
 Tickets = t.List[Ticket]
 InputData = t.Tuple[Sections, Ticket, Tickets]
@@ -28,10 +31,8 @@ def parse_input(
     section_strings, your_ticket, nearby_tickets = data.split("\n\n")
     for sect in section_strings.splitlines():
         named = range_parser.parse(sect).named
-        sections[named["location"]] = set(
-            itertools.chain(
-                range(named["r1s"], named["r1e"] + 1), range(named["r2s"], named["r2e"] + 1)
-            )
+        sections[named["location"]] = IntervalSet(
+            [(named["r1s"], named["r1e"]), (named["r2s"], named["r2e"])]
         )
 
     ticket = [int(num) for num in your_ticket.splitlines()[1].split(",")]
@@ -41,26 +42,22 @@ def parse_input(
 
 
 def part_one(sections: Sections, your_ticket: Ticket, nearby: Tickets) -> int:
-    valid = set(itertools.chain(*sections.values()))
-    return sum(itertools.chain(*(set(ticket).difference(valid) for ticket in nearby)))
+    values = np.array(nearby)
+    valid = IntervalSet().union(*sections.values())
+    return int(values[~valid.contains(values)].sum())
 
 
 def part_two(sections: Sections, your_ticket: Ticket, nearby: Tickets) -> int:
-    valid_ranges = set(itertools.chain(*sections.values()))
-    valid_tickets = [ticket for ticket in nearby if set(ticket).issubset(valid_ranges)] + [
-        your_ticket
-    ]
-
-    columns: t.List[Range] = [
-        {ticket[n] for ticket in valid_tickets} for n in range(len(your_ticket))
-    ]
+    values = np.array(nearby + [your_ticket])
+    valid = IntervalSet().union(*sections.values())
+    # your own ticket narrows the columns down too
+    columns = values[valid.contains(values).all(axis=1)].T
     candidates: t.Dict[str, t.Set[int]] = defaultdict(set)
 
     # multiple candidates for each section
     for section, valid_range in sections.items():
-        for idx, column in enumerate(columns):
-            if column.issubset(valid_range):
-                candidates[section].add(idx)
+        fits = valid_range.contains(columns).all(axis=1)
+        candidates[section].update(np.flatnonzero(fits).tolist())
 
     # solve from smallest to largest
     section_names = sorted(candidates, key=lambda k: len(candidates[k]))
@@ -79,8 +76,12 @@ def part_two(sections: Sections, your_ticket: Ticket, nearby: Tickets) -> int:
     )
 
 
+# the parsed sections and tickets are exactly the arguments to each part
+prepare = parse_input
+
+
 if __name__ == "__main__":
-    data = aocd.get_data(day=16, year=2020)
+    data = inputs.get_data(day=16, year=2020)
     sections, ticket, tickets = parse_input(data)
     print("Part 1: ", part_one(sections, ticket, tickets))
     print("Part 2: ", part_two(sections, ticket, tickets))
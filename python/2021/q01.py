@@ -1,11 +1,13 @@
 import utils
-from typing import List
-import aocd
+from typing import Sequence, Tuple
+from aoc import inputs
 
 
-def part_one(numbers: List[int]) -> int:
+def part_one(numbers: Sequence[int]) -> int:
     """
     Find how many numbers are greater than the previous
+
+    O(n)
     """
     greater_count = 0
     last_number = numbers[0]
@@ -17,7 +19,7 @@ def part_one(numbers: List[int]) -> int:
     return greater_count
 
 
-def part_two(numbers: List[int]) -> int:
+def part_two(numbers: Sequence[int]) -> int:
     last_sum = None
     greater_count = 0
     for i in range(len(numbers) - 2):
@@ -28,7 +30,11 @@ def part_two(numbers: List[int]) -> int:
     return greater_count
 
 
+def prepare(data: str) -> Tuple[Sequence[int]]:
+    return (utils.int_numbers(data),)
+
+
 if __name__ == "__main__":
-    numbers = utils.int_numbers(aocd.get_data(day=1, year=2021))
-    print(part_one(numbers))
-    print(part_two(numbers))
+    numbers = prepare(inputs.get_data(day=1, year=2021))
+    print(part_one(*numbers))
+    print(part_two(*numbers))
@@ -1,28 +1,28 @@
 import utils
-from typing import List, Tuple
-import aocd
+from typing import Sequence, Tuple
+from aoc import inputs
 
 command_map = {"forward": (0, 1), "down": (1, 1), "up": (1, -1)}
 
 
-def part_one(data: List[Tuple[str, int]]) -> int:
+def part_one(directions: Sequence[str], amounts: Sequence[int]) -> int:
     """
     Find how many numbers are greater than the previous
     """
     position = [0, 0]  # horizontal, depth
-    for direction, amount in data:
+    for direction, amount in zip(directions, amounts):
         index, mult = command_map[direction]
         position[index] += mult * amount
 
     return position[0] * position[1]
 
 
-def part_two(data: List[Tuple[str, int]]) -> int:
+def part_two(directions: Sequence[str], amounts: Sequence[int]) -> int:
     """
     Find how many numbers are greater than the previous
     """
     position = [0, 0, 0]  # horizontal, depth, aim
-    for direction, amount in data:
+    for direction, amount in zip(directions, amounts):
         # print(direction)
         if direction == "down":
             position[2] += amount
@@ -35,7 +35,11 @@ def part_two(data: List[Tuple[str, int]]) -> int:
     return position[0] * position[1]
 
 
+def prepare(data: str) -> Tuple[utils.Categorical, Sequence[int]]:
+    return utils.parse_columns(data, [str, int])
+
+
 if __name__ == "__main__":
-    data = utils.parse_lines(aocd.get_data(day=2, year=2021), separator=" ", types=(str, int))
-    print(part_one(data))
-    print(part_two(data))
+    data = prepare(inputs.get_data(day=2, year=2021))
+    print(part_one(*data))
+    print(part_two(*data))
@@ -1,6 +1,6 @@
 import utils
-from typing import List
-import aocd
+from typing import List, Tuple
+from aoc import inputs
 
 
 def part_one(data: List[str]) -> int:
@@ -57,7 +57,11 @@ def part_two(data: List[int]) -> int:
     return o2 * co2
 
 
+def prepare(data: str) -> Tuple[List[str]]:
+    return (utils.parse_lines(data, str),)
+
+
 if __name__ == "__main__":
-    data = utils.parse_lines(aocd.get_data(day=3, year=2021), str)
-    print(part_one(data))
-    print(part_two(data))
+    data = prepare(inputs.get_data(day=3, year=2021))
+    print(part_one(*data))
+    print(part_two(*data))
@@ -1,13 +1,23 @@
 import utils
-from typing import List, Optional
-import aocd
+from typing import Dict, List, Optional, Tuple
+from aoc import inputs
 from dataclasses import dataclass, field
 
 
-@dataclass
 class BingoNumber:
-    number: int
-    picked: bool = False
+    __slots__ = ("number", "picked")
+
+    def __init__(self, number: int, picked: bool = False):
+        self.number = number
+        self.picked = picked
+
+    def __eq__(self, other):
+        if not isinstance(other, BingoNumber):
+            return NotImplemented
+        return self.number == other.number and self.picked == other.picked
+
+    def __repr__(self):
+        return f"BingoNumber(number={self.number!r}, picked={self.picked!r})"
 
 
 @dataclass
@@ -15,6 +25,8 @@ class BingoBoard:
     last_number_picked: Optional[int] = None
     has_won: bool = False
     numbers: List[List[BingoNumber]] = field(default_factory=list)  # row, col
+    # where each number is on the board
+    positions: Dict[int, Tuple[int, int]] = field(default_factory=dict, repr=False)
 
     def is_winner(self) -> bool:
         for row in range(5):
@@ -30,15 +42,16 @@ class BingoBoard:
 
     def add_row(self, row: str):
         self.numbers.append([BingoNumber(number=int(n)) for n in row.split()])
+        for col, cell in enumerate(self.numbers[-1]):
+            self.positions.setdefault(cell.number, (len(self.numbers) - 1, col))
 
     def pick_number(self, number: int) -> bool:
-        for row in range(5):
-            for col in range(5):
-                if self.numbers[row][col].number == number:
-                    self.numbers[row][col].picked = True
-                    self.last_number_picked = number
-                    return True
-        return False
+        if number not in self.positions:
+            return False
+        row, col = self.positions[number]
+        self.numbers[row][col].picked = True
+        self.last_number_picked = number
+        return True
 
     def unmarked_numbers(self):
         for row in range(5):
@@ -84,7 +97,11 @@ def part_two(data) -> int:
     return last_board_to_win.last_number_picked * sum(last_board_to_win.unmarked_numbers())
 
 
+def prepare(data: str) -> Tuple[List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
-    data = aocd.get_data(day=4, year=2021).splitlines()
-    print(part_one(data))
-    print(part_two(data))
+    data = prepare(inputs.get_data(day=4, year=2021))
+    print(part_one(*data))
+    print(part_two(*data))
@@ -1,6 +1,6 @@
 import utils
-from typing import List, Optional
-import aocd
+from typing import List, Optional, Tuple
+from aoc import inputs
 from dataclasses import dataclass, field
 import re
 from collections import defaultdict
@@ -95,8 +95,12 @@ def test():
     assert part_two(data) == 12, part_two(data)
 
 
+def prepare(data: str) -> Tuple[List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
     test()
-    data = aocd.get_data(day=5, year=2021).splitlines()
-    print(part_one(data))
-    print(part_two(data))
+    data = prepare(inputs.get_data(day=5, year=2021))
+    print(part_one(*data))
+    print(part_two(*data))
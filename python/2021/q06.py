@@ -1,9 +1,26 @@
 import utils
-from typing import List, Tuple
-import aocd
+from typing import Sequence, Tuple
+from aoc import generators, inputs, variants
 from collections import defaultdict
 
 
+def sample(size: int, seed: int) -> Tuple[Sequence[int], int]:
+    """A school `size` fish-days big: up to 80 days, with the fish for the rest of it."""
+    num_days = min(size, 80)
+    return (*prepare(generators.generate(2021, 6, max(size // num_days, 1), seed)), num_days)
+
+
+# simulate steps every fish on every day while the school grows exponentially, so it costs
+# at least fish × days, where tally costs fish + days. The size is fish × days
+lanternfish = variants.problem(
+    "2021 q06 lanternfish",
+    size=lambda data, num_days: len(data) * num_days,
+    sample=sample,
+    default="tally",
+    crossovers=[(8, "simulate"), (45, "tally")],
+)
+
+
 def model_a_day(fish_timers):
     result = []
     new_fish_count = 0
@@ -18,9 +35,9 @@ def model_a_day(fish_timers):
     return result + [8] * new_fish_count
 
 
-def part_one(data: List[int]) -> int:
-    num_days = 80
-    fish = data.copy()
+@lanternfish.variant("simulate")
+def simulate(data: Sequence[int], num_days: int) -> int:
+    fish = data
     for day in range(num_days):
         fish = model_a_day(fish)
     return len(fish)
@@ -38,19 +55,26 @@ def model_a_day_2(fish_timers):
     return result
 
 
-def part_two(data: List[int]) -> int:
-    num_days = 256
+@lanternfish.variant("tally")
+def tally(data: Sequence[int], num_days: int) -> int:
     fish_timers = defaultdict(int)
     for initial_timer in data:
         fish_timers[initial_timer] += 1
 
-    for day in range(num_days):
+    for _ in range(num_days):
         fish_timers = model_a_day_2(fish_timers)
-        print(day, fish_timers)
 
     return sum(fish_timers.values())
 
 
+def part_one(data: Sequence[int]) -> int:
+    return lanternfish(data, 80)
+
+
+def part_two(data: Sequence[int]) -> int:
+    return lanternfish(data, 256)
+
+
 def test():
     fish_timers = [2, 3, 2, 0, 1]
     result = model_a_day(fish_timers)
@@ -63,8 +87,12 @@ def test():
     assert result_3 == {0: 2, 1: 1, 5: 1, 6: 1, 8: 1, 7: 1}, result_3
 
 
+def prepare(data: str) -> Tuple[Sequence[int]]:
+    return (utils.int_array(data, ","),)
+
+
 if __name__ == "__main__":
     test()
-    data = [int(i) for i in aocd.get_data(day=6, year=2021).split(",")]
-    print(part_one(data))
-    print(part_two(data))
+    data = prepare(inputs.get_data(day=6, year=2021))
+    print(part_one(*data))
+    print(part_two(*data))
@@ -1,23 +1,29 @@
-import aocd
+from typing import Sequence, Tuple
+
+from aoc import inputs
+
+import utils
 
 
 def part_one(data):
     return min(sum([abs(d - i) for d in data]) for i in range(min(data), max(data)))
 
 
-# precalc triangle numbers
-triangle_numbers = []
-for i in range(10000):
-    triangle_numbers.append(sum(range(i + 1)))
+def triangle_number(n):
+    return n * (n + 1) // 2
 
 
 def part_two(data):
     return min(
-        sum([triangle_numbers[abs(d - i)] for d in data]) for i in range(min(data), max(data))
+        sum([triangle_number(abs(d - i)) for d in data]) for i in range(min(data), max(data))
     )
 
 
+def prepare(data: str) -> Tuple[Sequence[int]]:
+    return (utils.int_array(data, ","),)
+
+
 if __name__ == "__main__":
-    data = [int(i) for i in aocd.get_data(day=7, year=2021).split(",")]
-    print(part_one(data))
-    print(part_two(data))
+    data = prepare(inputs.get_data(day=7, year=2021))
+    print(part_one(*data))
+    print(part_two(*data))
@@ -1,4 +1,4 @@
-import aocd
+from aoc import inputs
 from collections import defaultdict
 
 working_digits = {
@@ -98,12 +98,15 @@ def test():
     assert digits == 7470, digits
 
 
+def prepare(input):
+    pre_and_posts = [line.split(" | ") for line in input.splitlines()]
+    return ([[[set(y) for y in x.split()] for x in item] for item in pre_and_posts],)
+
+
 if __name__ == "__main__":
     test()
-    lines = aocd.get_data(day=8, year=2021).splitlines()
-    pre_and_posts = [line.split(" | ") for line in lines]
-    data = [[[set(y) for y in x.split()] for x in item] for item in pre_and_posts]
+    data = prepare(inputs.get_data(day=8, year=2021))
     # print(data)
 
-    print(part_one(data))
-    print(part_two(data))
+    print(part_one(*data))
+    print(part_two(*data))
@@ -1,77 +1,31 @@
-import aocd
-from collections import defaultdict
+from __future__ import annotations
 
+from aoc import inputs
+import utils
+from utils.grid import Grid
 
-class Grid:
-    def __init__(self, input_lines):
-        self.values = [[int(c) for c in line.strip()] for line in input_lines]
+np = utils.lazy_import("numpy")
 
-    def coord_at(self, r, c):
-        return self.values[r][c]
 
-    @property
-    def num_columns(self):
-        return len(self.values[0])
+def low_points(grid: Grid) -> np.ndarray:
+    """Cells lower than all of their neighbours; anything beats the edge of the map."""
+    low = np.ones(grid.shape, dtype=bool)
+    for neighbour in grid.neighbours(fill=10):
+        low &= grid.cells < neighbour
+    return low
 
-    @property
-    def num_rows(self):
-        return len(self.values)
 
-    def neighbours(self, r, c):
-        for rx, cx in [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
-            if 0 <= rx < self.num_rows and 0 <= cx < self.num_columns:
-                yield (rx, cx)
+def part_one(grid: Grid) -> int:
+    low = low_points(grid)
+    return int((grid.cells[low] + 1).sum())
 
-    def coord_is_lower_than_neighbours(self, r, c):
-        coord = self.coord_at(r, c)
-        for pair in self.neighbours(r, c):
-            if self.coord_at(*pair) <= coord:
-                return
-        return coord  # coord is not greater than or equal to any of its neigbours
 
-    def inside(self, r, c) -> bool:
-        if 0 <= r < self.num_rows and 0 <= c < self.num_columns:
-            return self.coord_at(r, c) < 9
-        return False
-
-    def _map_basin(self, seen: set, r, c) -> set:
-        if not self.inside(r, c):
-            return seen
-
-        seen.add((r, c))
-        for pair in self.neighbours(r, c):
-            if pair not in seen:
-                seen = self._map_basin(seen, *pair)
-
-        return seen
-
-    def basin_size(self, r, c) -> int:
-        basin_coords = self._map_basin(set(), r, c)
-        return len(basin_coords)
-
-
-def part_one(input_lines):
-    grid = Grid(input_lines)
-    risk = 0
-    for r in range(grid.num_rows):
-        for c in range(grid.num_columns):
-            n = grid.coord_is_lower_than_neighbours(r, c)
-            if n is not None:
-                risk += n + 1
-
-    return risk
-
-
-def part_two(input_lines):
-    grid = Grid(input_lines)
-    basin_sizes = []
-    for r in range(grid.num_rows):
-        for c in range(grid.num_columns):
-            n = grid.coord_is_lower_than_neighbours(r, c)
-            if n is not None:
-                basin_sizes.append(grid.basin_size(r, c))
-
-    sorted_sizes = sorted(basin_sizes)
+def part_two(grid: Grid) -> int:
+    # basins are the regions walled in by 9s, each counted once per low point it holds
+    labels = grid.components(grid.cells < 9)
+    sizes = np.bincount(labels[labels >= 0], minlength=grid.rows * grid.columns)
+    basin_sizes = sizes[labels[low_points(grid)]]
+    sorted_sizes = sorted(basin_sizes.tolist())
     return sorted_sizes[-3] * sorted_sizes[-2] * sorted_sizes[-1]
 
 
@@ -81,12 +35,16 @@ def test():
 9856789892
 8767896781
 9899965678"""
-    answer = part_one(input.splitlines())
+    answer = part_one(*prepare(input))
     assert answer == 17, answer
 
 
+def prepare(input):
+    return (Grid.parse(input),)
+
+
 if __name__ == "__main__":
     test()
-    lines = aocd.get_data(day=9, year=2021).splitlines()
-    print(part_one(lines))
-    print(part_two(lines))
+    grid = prepare(inputs.get_data(day=9, year=2021))
+    print(part_one(*grid))
+    print(part_two(*grid))
@@ -1,6 +1,6 @@
-import aocd
+from aoc import inputs
 from collections import defaultdict
-from typing import Tuple
+from typing import List, Tuple
 
 
 def check_line(line) -> Tuple[int, list]:
@@ -60,8 +60,12 @@ def test():
     assert c == 288957, c
 
 
+def prepare(data: str) -> Tuple[List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
     test()
-    lines = aocd.get_data(day=10, year=2021).splitlines()
-    print(part_one(lines))
-    print(part_two(lines))
+    lines = prepare(inputs.get_data(day=10, year=2021))
+    print(part_one(*lines))
+    print(part_two(*lines))
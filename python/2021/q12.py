@@ -1,79 +1,74 @@
-import aocd
-from collections import defaultdict
-from typing import List, Dict
+from aoc import inputs
+from collections import Counter
+from typing import List, Tuple
 
+from utils.graph import Graph
 
-class Graph:
+
+class Caves:
     def __init__(self, input_lines):
-        self.nodes = defaultdict(list)
-        for line in input_lines:
-            lhs, rhs = line.strip().split("-")
-            self.nodes[lhs].append(rhs)
-            self.nodes[rhs].append(lhs)
-
-    def find_all_paths(self, start, end, path=[]):
-        path = path + [start]
-        if start == end:
-            return [path]
-        paths = []
-
-        def _can_visit(node):
-            if node.lower() != node:
-                return True
-            if node not in path:
-                return True
-            return False
-
-        for node in self.nodes[start]:
-            if _can_visit(node):
-                newpaths = self.find_all_paths(node, end, path)
-                for newpath in newpaths:
-                    paths.append(newpath)
-        return paths
-
-    def find_all_paths_with_one_revisit(
-        self,
-        start,
-        end,
-        path=[],
-    ):
-        path = path + [start]
-        if start == end:
-            return [path]
-        paths = []
-
-        def _can_visit(node):
-            if (node.lower() != node) or (node not in path):
-                return True
-            if (node.lower() == node) and (node not in ("start", "end")):
-                # allow the small cave node if no other lowercase node appears > 1 time
-                # Horrendously inefficient, but works. For faster results pass around a dict
-                # that tallies each node's uses.
-                for small_cave in {p for p in path if p.lower() == p}:
-                    if path.count(small_cave) > 1:
-                        return False
-                return True
-
-            return False
-
-        for node in self.nodes[start]:
-            can_visit = _can_visit(node)
-            if can_visit:
-                newpaths = self.find_all_paths_with_one_revisit(node, end, path)
-                for newpath in newpaths:
-                    paths.append(newpath)
-
-        return paths
+        edges = (line.strip().split("-") for line in input_lines)
+        self.graph = Graph.from_edges(edges, undirected=True)
+        self.small = [name.lower() == name for name in self.graph.names]
+        self.routes = self.small_cave_routes()
+
+    def small_cave_routes(self) -> Graph:
+        """
+        The moves from one small cave to the next, weighted by how many ways there are to
+        make them: straight there, or through any one big cave on the way. Big caves never
+        join each other (or paths could go round them forever), so that is every way.
+        """
+        sources, targets = [], []
+        for cave, small in enumerate(self.small):
+            if not small:
+                continue
+            for beside in self.graph.neighbours(cave).tolist():
+                if self.small[beside]:
+                    sources.append(cave)
+                    targets.append(beside)
+                    continue
+                for beyond in self.graph.neighbours(beside).tolist():
+                    sources.append(cave)
+                    targets.append(beyond)
+        counts = Counter(zip(sources, targets))
+        sources, targets = zip(*counts) if counts else ((), ())
+        return Graph.from_arrays(len(self.graph), sources, targets, list(counts.values()))
+
+    def count_paths(self, start="start", end="end", revisit=False) -> int:
+        """
+        The number of paths from `start` to `end` through each small cave at most once, or
+        one small cave twice if `revisit`.
+
+        Paths are counted by state (cave, small caves visited so far, revisit used) rather
+        than followed one by one. Every move visits a new small cave or uses up the revisit,
+        so a state can only be reached in one number of moves and the states can be taken a
+        move at a time, adding up the paths into each.
+        """
+        start, end = self.graph.id(start), self.graph.id(end)
+        frontier = Counter({(start, 1 << start, not revisit): 1})
+        total = 0
+        while frontier:
+            following: Counter = Counter()
+            for (cave, visited, revisited), paths in frontier.items():
+                for beyond, ways in self.routes.edges(cave):
+                    if beyond == start:
+                        continue
+                    if beyond == end:
+                        total += paths * ways
+                    elif not visited & 1 << beyond:
+                        following[beyond, visited | 1 << beyond, revisited] += paths * ways
+                    elif not revisited:
+                        following[beyond, visited, True] += paths * ways
+            frontier = following
+        return total
 
 
 def part_one(input_lines):
-    graph = Graph(input_lines)
-    return len(graph.find_all_paths("start", "end"))
+    return Caves(input_lines).count_paths()
 
 
 def part_two(input_lines):
-    graph = Graph(input_lines)
-    return len(graph.find_all_paths_with_one_revisit("start", "end"))
+    return Caves(input_lines).count_paths(revisit=True)
 
 
 def test():
@@ -84,15 +79,19 @@ A-b
 b-d
 A-end
 b-end"""
-    graph = Graph(input.splitlines())
-    result_one = len(graph.find_all_paths("start", "end"))
+    caves = Caves(input.splitlines())
+    result_one = caves.count_paths()
     assert result_one == 10, result_one
-    result_two = len(graph.find_all_paths_with_one_revisit("start", "end"))
+    result_two = caves.count_paths(revisit=True)
     assert result_two == 36, result_two
 
 
+def prepare(data: str) -> Tuple[List[str]]:
+    return (data.splitlines(),)
+
+
 if __name__ == "__main__":
     test()
-    lines = aocd.get_data(day=12, year=2021).splitlines()
-    print(part_one(lines))
-    print(part_two(lines))
+    lines = prepare(inputs.get_data(day=12, year=2021))
+    print(part_one(*lines))
+    print(part_two(*lines))
@@ -1,71 +1,42 @@
-import aocd
-from collections import defaultdict
+from aoc import inputs
 import re
 
+import utils
+from utils.grid import Grid
 
-class Grid:
-    def __init__(self, input_lines):
-        self.x_size = 0
-        self.y_size = 0
-        self.values = defaultdict(bool)
-        for line in input_lines:
-            x, y = [int(n) for n in line.strip().split(",")]
-            self.x_size = max(self.x_size, x + 1)
-            self.y_size = max(self.y_size, y + 1)
-            self.values[(x, y)] = True
-
-    def __str__(self):
-        result = ""
-        for y in range(self.y_size):
-            for x in range(self.x_size):
-                if self.values[(x, y)]:
-                    result += "#"
-                else:
-                    result += "."
-            result += "\n"
-        return result
-
-    def fold_y(self, value):
-        for y in range(value, self.y_size):
-            for x in range(self.x_size):
-                self.values[(x, value - (y - value))] |= self.values[(x, y)]
-
-        self.y_size = value
-
-    def fold_x(self, value):
-        for x in range(value, self.x_size):
-            for y in range(self.y_size):
-                self.values[(value - (x - value), y)] |= self.values[(x, y)]
-
-        self.x_size = value
-
-    def apply_folds(self, folds, limit=None):
-        for fold in folds[:limit]:
-            dim, value = re.match(r"fold along (.)=(\d+)", fold).groups()
-            if dim == "x":
-                self.fold_x(int(value))
-            elif dim == "y":
-                self.fold_y(int(value))
-
-    def num_dots(self):
-        count = 0
-        for x in range(self.x_size):
-            for y in range(self.y_size):
-                if self.values[(x, y)]:
-                    count += 1
-        return count
-
-
-def part_one(coords, folds):
-    grid = Grid(coords)
-    grid.apply_folds(folds, limit=1)
-    return grid.num_dots()
-
-
-def part_two(coords, folds):
-    grid = Grid(coords)
-    grid.apply_folds(folds)
-    return str(grid)
+np = utils.lazy_import("numpy")
+
+
+def make_paper(coords) -> Grid:
+    xs, ys = np.array([line.strip().split(",") for line in coords], dtype=int).T
+    return Grid.from_points(ys, xs)
+
+
+def fold(paper: Grid, dim: str, value: int) -> Grid:
+    # fold rows up; folding columns left is the same on the transpose
+    cells = paper.cells if dim == "y" else paper.cells.T
+    folded = np.zeros((value, cells.shape[1]), dtype=bool)
+    folded[: min(value, len(cells))] = cells[:value]
+    # rows folded past the top edge are lost
+    overlap = min(value, len(cells) - 1 - value)
+    if overlap > 0:
+        folded[value - overlap :] |= cells[value + 1 : value + 1 + overlap][::-1]
+    return Grid(folded if dim == "y" else folded.T)
+
+
+def apply_folds(paper: Grid, folds, limit=None) -> Grid:
+    for line in folds[:limit]:
+        dim, value = re.match(r"fold along (.)=(\d+)", line).groups()
+        paper = fold(paper, dim, int(value))
+    return paper
+
+
+def part_one(paper: Grid, folds) -> int:
+    return int(apply_folds(paper, folds, limit=1).cells.sum())
+
+
+def part_two(paper: Grid, folds) -> str:
+    return apply_folds(paper, folds).render(".#")
 
 
 def test():
@@ -94,9 +65,8 @@ fold along x=5
     coords, folds = get_coords_and_folds(input.splitlines())
     assert len(coords) == 18
     assert len(folds) == 2
-    grid = Grid(coords)
-    grid.apply_folds(folds)
-    result = str(grid)
+    grid = apply_folds(make_paper(coords), folds)
+    result = grid.render(".#")
     assert (
         result
         == """#####
@@ -108,7 +78,7 @@ fold along x=5
 .....
 """
     ), result
-    num_dots = grid.num_dots()
+    num_dots = grid.cells.sum()
     assert num_dots == 16, num_dots
 
 
@@ -128,9 +98,13 @@ def get_coords_and_folds(lines):
     return coords, folds
 
 
+def prepare(input):
+    coords, folds = get_coords_and_folds(input.splitlines())
+    return make_paper(coords), folds
+
+
 if __name__ == "__main__":
     test()
-    lines = aocd.get_data(day=13, year=2021).splitlines()
-    coords, folds = get_coords_and_folds(lines)
-    print(part_one(coords, folds))
-    print(part_two(coords, folds))
+    paper, folds = prepare(inputs.get_data(day=13, year=2021))
+    print(part_one(paper, folds))
+    print(part_two(paper, folds))
@@ -1,4 +1,4 @@
-import aocd
+from aoc import inputs
 from collections import defaultdict
 
 
@@ -88,6 +88,6 @@ def part_two(input):
 
 if __name__ == "__main__":
     test()
-    input = aocd.get_data(day=14, year=2021)
+    input = inputs.get_data(day=14, year=2021)
     print(part_one(input))
     print(part_two(input))
@@ -1,69 +1,44 @@
-from collections import defaultdict
-from typing import Dict
-import aocd
-from astar import AStar
+from aoc import inputs
 
+import utils
+from utils.graph import Graph
+from utils.grid import Grid
 
-class RiskMazeSolver(AStar):
+np = utils.lazy_import("numpy")
 
-    """sample use of the astar algorithm. In this exemple we work on a maze made of ascii characters,
-    and a 'node' is just a (x,y) tuple that represents a reachable position"""
+
+class RiskMaze:
+    """A grid of risk levels, entering a cell costing its risk; the start cell is free."""
 
     def __init__(self, lines):
-        self.risks = [[int(c) for c in line] for line in lines.splitlines()]
+        self.set_grid(Grid.parse(lines))
+
+    def set_grid(self, grid: Grid):
+        self.grid = grid
+        self.graph = Graph.lattice(grid.shape, costs=grid.cells)
 
     def __str__(self):
-        result = ""
-        for row in range(self.height):
-            for col in range(self.width):
-                result += str(self.risks[row][col])
-            result += "\n"
-        return result
+        return str(self.grid)
 
     @property
     def width(self):
-        return len(self.risks[0])
+        return self.grid.columns
 
     @property
     def height(self):
-        return len(self.risks)
-
-    def heuristic_cost_estimate(self, n1, n2):
-        """computes the 'direct' distance between two (x,y) tuples"""
-        return 1  # I think setting this to 1 is equivalent to Dijkstra
-
-    def distance_between(self, n1, n2):
-        """return the risk increase of the destination"""
-        return self.risks[n2[0]][n2[1]]
-
-    def neighbors(self, node):
-        x, y = node
-        return [
-            (nx, ny)
-            for nx, ny in [(x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)]
-            if 0 <= nx < self.width and 0 <= ny < self.height
-        ]
-
-    def risk_sum(self, path):
-        sum = 0
-        for p in list(path)[1:]:
-            sum += self.risks[p[0]][p[1]]
-        return sum
+        return self.grid.rows
+
+    def lowest_risk(self):
+        """The least total risk of a path from the top left corner to the bottom right."""
+        corner = len(self.graph) - 1
+        return self.graph.shortest_paths(0, corner)[corner]
 
     def expand_field(self, factor=5):
-        new_risks = defaultdict(lambda: defaultdict(int))
-        for row_inc in range(factor):
-            for col_inc in range(factor):
-                increase = row_inc + col_inc
-                for row in range(self.height):
-                    for col in range(self.width):
-                        new_row = self.height * row_inc + row
-                        new_col = self.width * col_inc + col
-                        new_value = self.risks[row][col] + increase
-                        if new_value > 9:
-                            new_value -= 9
-                        new_risks[new_row][new_col] = new_value
-        self.risks = new_risks
+        tiled = self.grid.tile(factor, factor).cells
+        # each tile is one riskier than the tile above it or to its left
+        tile = np.arange(factor)
+        increase = np.add.outer(tile, tile).repeat(self.height, 0).repeat(self.width, 1)
+        self.set_grid(Grid((tiled + increase - 1) % 9 + 1))
 
 
 def test():
@@ -77,14 +52,13 @@ def test():
 3125421639
 1293138521
 2311944581"""
-    gg = RiskMazeSolver(input)
-    path = gg.astar((0, 0), (gg.width - 1, gg.height - 1))
-    result = gg.risk_sum(path)
+    gg = RiskMaze(input)
+    result = gg.lowest_risk()
     assert result == 40, result
 
     input_2 = """19
 23"""
-    gg_2 = RiskMazeSolver(input_2)
+    gg_2 = RiskMaze(input_2)
     gg_2.expand_field(factor=2)
     assert (
         str(gg_2)
@@ -97,23 +71,18 @@ def test():
 
 
 def part_one(input):
-    gg = RiskMazeSolver(input)
-    path = gg.astar((0, 0), (gg.width - 1, gg.height - 1))
-    result = gg.risk_sum(path)
-    assert result == 604
-    return result
+    gg = RiskMaze(input)
+    return gg.lowest_risk()
 
 
 def part_two(input):
-    gg = RiskMazeSolver(input)
+    gg = RiskMaze(input)
     gg.expand_field()
-    path = gg.astar((0, 0), (gg.width - 1, gg.height - 1))
-    result = gg.risk_sum(path)
-    return result
+    return gg.lowest_risk()
 
 
 if __name__ == "__main__":
     test()
-    input = aocd.get_data(day=15, year=2021)
+    input = inputs.get_data(day=15, year=2021)
     print("Part One: ", part_one(input))
     print("Part Two: ", part_two(input))
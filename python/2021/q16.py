@@ -1,8 +1,11 @@
-import aocd
-from bitstring import BitArray
+from __future__ import annotations
+
+from aoc import inputs
 from functools import reduce
 import operator
 
+from utils.bits import BitReader
+
 
 OPERATIONS = {
     0: sum,
@@ -15,63 +18,48 @@ OPERATIONS = {
 }
 
 
-def bits_to_int(bits):
-    return int(bits.bin, 2)
-
-
-def parse_literal(packet: BitArray):
-    literal_bits = ""
+def parse_literal(packet: BitReader):
+    value = 0
     cont = True
-    i = 0
     while cont:
-        cont = packet[i]
-        literal_bits += packet[i + 1 : i + 5].bin
-        i += 5
-    value = int(literal_bits, 2)
-    return value, i
+        cont = packet.flag()
+        value = value << 4 | packet.read(4)
+    return value
 
 
-def parse_operator(packet: BitArray):
+def parse_operator(packet: BitReader):
     params = []
     version_sum = 0
-    length_type_id = packet[0]
+    length_type_id = packet.flag()
     if length_type_id:
-        i = 12
-        for _ in range(bits_to_int(packet[1:12])):
-            value, vc, inc = parse_packet(packet[i:])
+        for _ in range(packet.read(11)):
+            value, vc = parse_packet(packet)
             params.append(value)
             version_sum += vc
-            i += inc
     else:
-        subpacket_length = bits_to_int(packet[1:16])
-        i = 16
-        while i - 16 < subpacket_length:
-            value, vc, inc = parse_packet(packet[i:])
+        subpackets = packet.window(packet.read(15))
+        while len(subpackets):
+            value, vc = parse_packet(subpackets)
             params.append(value)
             version_sum += vc
-            i += inc
 
-    return params, version_sum, i
+    return params, version_sum
 
 
-def parse_packet(packet: BitArray):
-    version_sum = 0
-    version_id = bits_to_int(packet[0:3])
-    version_sum += version_id
-    type_id = bits_to_int(packet[3:6])
+def parse_packet(packet: BitReader):
+    """Read one packet, and any inside it: its value and the sum of their version numbers."""
+    version_sum = packet.read(3)
+    type_id = packet.read(3)
     if type_id == 4:
-        value, inc = parse_literal(packet[6:])
-        return value, version_sum, inc + 6
+        return parse_literal(packet), version_sum
     else:
-        params, vc, inc = parse_operator(packet[6:])
+        params, vc = parse_operator(packet)
         value = OPERATIONS[type_id](params)
-        return value, version_sum + vc, inc + 6
+        return value, version_sum + vc
 
 
 def parse(transmission):
-    packet = BitArray(hex=transmission)
-    value, vc, _ = parse_packet(packet)
-    return value, vc
+    return parse_packet(BitReader.from_hex(transmission))
 
 
 def test():
@@ -113,6 +101,6 @@ def part_two(input):
 
 if __name__ == "__main__":
     test()
-    input = aocd.get_data(day=16, year=2021)
+    input = inputs.get_data(day=16, year=2021)
     print("Part One: ", part_one(input))
     print("Part Two: ", part_two(input))
@@ -1,77 +1,73 @@
+import re
 from typing import Tuple
 
+from aoc import inputs
+import utils
+from utils.boxes import Box
 
-class Probe:
-    target_x: Tuple[int, int]
-    target_y: Tuple[int, int]
-
-    def __init__(self, target_x: Tuple, target_y: Tuple):
-        self.target_x = target_x
-        self.target_y = target_y
+np = utils.lazy_import("numpy")
 
-    def is_in_target_x(self, position):
-        return self.target_x[0] <= position[0] <= self.target_x[1]
 
-    def is_in_target_y(self, position):
-        return self.target_y[0] <= position[1] <= self.target_y[1]
+class Probe:
+    target: Box
 
-    def is_in_target(self, position):
-        return self.is_in_target_x(position) and self.is_in_target_y(position)
+    def __init__(self, target_x: Tuple, target_y: Tuple):
+        self.target = Box.of(target_x, target_y)
 
     def missed_target(self, position):
-        return position[1] < self.target_y[0]
-
-    def fire(self, x_vel: int, y_vel: int):
-        max_y = 0
-        position = [0, 0]
-        while True:
-            position[0] += x_vel
-            position[1] += y_vel
-            if x_vel > 0:
-                x_vel -= 1
-            elif x_vel < 0:
-                x_vel += 1
+        return position[1] < self.target.lower[1]
+
+    def fire(self, x_vel, y_vel):
+        """
+        Fire the probe at every pair of velocities at once: for each, whether it lands in the
+        target and the highest it gets. Each step moves only the probes still in flight.
+        """
+        x_vel, y_vel = np.broadcast_arrays(np.asarray(x_vel), np.asarray(y_vel))
+        shape = x_vel.shape
+        x_vel, y_vel = x_vel.ravel().astype(np.int64), y_vel.ravel().astype(np.int64)
+        hit = np.zeros(len(x_vel), dtype=bool)
+        max_y = np.zeros(len(x_vel), dtype=np.int64)
+        flying = np.arange(len(x_vel))
+        position = np.zeros((len(x_vel), 2), dtype=np.int64)
+        highest = np.zeros(len(x_vel), dtype=np.int64)
+        while len(flying):
+            position[:, 0] += x_vel
+            position[:, 1] += y_vel
+            x_vel -= np.sign(x_vel)
             y_vel -= 1
-            max_y = max(max_y, position[1])
-            # print(position)
-            if self.is_in_target(position):
-                # print("HIT", position)
-                return True, max_y
-            if self.missed_target(position):
-                # print("MISS", position)
-                return False, max_y
-
-
-def part_one():
-    p = Probe(target_x=(241, 275), target_y=(-75, -49))
+            np.maximum(highest, position[:, 1], out=highest)
+            inside = self.target.contains(position)
+            landed = inside | self.missed_target(position.T)
+            hit[flying[inside]] = True
+            max_y[flying[landed]] = highest[landed]
+            keep = ~landed
+            flying, position, x_vel, y_vel, highest = (
+                a[keep] for a in (flying, position, x_vel, y_vel, highest)
+            )
+        return hit.reshape(shape), max_y.reshape(shape)
+
+
+def part_one(target_x=(241, 275), target_y=(-75, -49)):
+    p = Probe(target_x=target_x, target_y=target_y)
     # Max y height is aided by min x velocity
-    max_y = 0
-
-    for y_vel in range(72, 75):
-        for x_vel in range(0, 1000):
-            hit, my = p.fire(x_vel, y_vel)
-            if hit:
-                max_y = max(max_y, my)
-                print(f"{y_vel} -> {max_y}")
-
-    return max_y
+    y_vel, x_vel = np.ogrid[-target_y[0] - 3 : -target_y[0], 0 : target_x[1] + 1]
+    hit, max_y = p.fire(x_vel, y_vel)
+    return int(max_y[hit].max(initial=0))
 
 
-def part_two():
-    p = Probe(target_x=(241, 275), target_y=(-75, -49))
-    velocities = set()
+def part_two(target_x=(241, 275), target_y=(-75, -49)):
+    p = Probe(target_x=target_x, target_y=target_y)
+    y_vel, x_vel = np.ogrid[target_y[0] : -target_y[0], 1 : target_x[1] + 1]
+    hit, _ = p.fire(x_vel, y_vel)
+    return int(hit.sum())
 
-    for y_vel in range(-75, 75):
-        for x_vel in range(1, 1000):
-            vector = (x_vel, y_vel)
-            hit, my = p.fire(*vector)
-            if hit:
-                print(vector)
-                velocities.add(vector)
 
-    return len(velocities)
+def prepare(input):
+    x1, x2, y1, y2 = [int(n) for n in re.findall(r"-?\d+", input)]
+    return (x1, x2), (y1, y2)
 
 
 if __name__ == "__main__":
-    print(part_one())
-    print(part_two())
+    target = prepare(inputs.get_data(day=17, year=2021))
+    print(part_one(*target))
+    print(part_two(*target))
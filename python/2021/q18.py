@@ -1,5 +1,12 @@
-import aocd
+from __future__ import annotations
+
+from aoc import inputs
 import math
+import os
+from utils.shm import Arena, SharedRagged, fan_out
+
+# fewer numbers than this are summed pairwise quicker than workers start
+FAN_OUT = 40
 
 
 class SFN:  # snailfishnumber
@@ -25,6 +32,26 @@ class SFN:  # snailfishnumber
                 r.append(child.as_list())
         return r
 
+    def leaves(self):
+        """Every regular number with how many pairs hold it, left to right."""
+        return [(digit, len(path)) for digit, path in self.digit_paths()]
+
+    @classmethod
+    def from_leaves(cls, leaves):
+        """The number whose `leaves()` these are."""
+        leaves = [(int(digit), int(depth)) for digit, depth in leaves]
+        position = 0
+
+        def element(depth):
+            nonlocal position
+            digit, leaf_depth = leaves[position]
+            if leaf_depth == depth:
+                position += 1
+                return digit
+            return [element(depth + 1), element(depth + 1)]
+
+        return cls(element(0))
+
     def __add__(self, other: "SFN"):
         return SFN((self.as_list(), other.as_list())).reduce()
 
@@ -156,6 +183,7 @@ def test():
     ):
         magnitude = SFN(number).magnitude()
         assert magnitude == expected, magnitude
+        assert SFN.from_leaves(SFN(number).leaves()).as_list() == number
 
     sfn1 = SFN([[[[4, 3], 4], 4], [7, [[8, 4], 9]]])
     sfn2 = SFN([1, 1])
@@ -213,10 +241,9 @@ def test():
     assert result.magnitude() == 4140, result.magnitude()
 
 
-def sum_input(input):
+def sum_sfns(sfns):
     tally = None
-    for line in input.splitlines():
-        sfn = SFN(eval(line))
+    for sfn in sfns:
         if tally is None:
             tally = sfn
         else:
@@ -224,21 +251,46 @@ def sum_input(input):
     return tally
 
 
-def part_one(input):
-    return sum_input(input).magnitude()
+def sum_input(input):
+    return sum_sfns(prepare(input)[0])
+
+
+def part_one(sfns):
+    return sum_sfns(sfns).magnitude()
 
 
-def part_two(input):
+def max_magnitude(sfns, firsts):
     max_mag = 0
-    sfns = [SFN(eval(line)) for line in input.splitlines()]
-    for sfn1 in sfns:
+    for i in firsts:
         for sfn2 in sfns:
-            max_mag = max(max_mag, (sfn1 + sfn2).magnitude())
+            max_mag = max(max_mag, (sfns[i] + sfn2).magnitude())
     return max_mag
 
 
+def shared_max_magnitude(numbers: SharedRagged, firsts: range):
+    return max_magnitude([SFN.from_leaves(leaves) for leaves in numbers.view()], firsts)
+
+
+def part_two(sfns, workers=None):
+    """
+    Every ordered pair is summed, which is shared out by first number between `workers`
+    processes (default one per CPU) that read the numbers from shared memory.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(sfns))
+    if workers == 1 or len(sfns) < FAN_OUT:
+        return max_magnitude(sfns, range(len(sfns)))
+    with Arena() as arena:
+        numbers = arena.publish_ragged([sfn.leaves() for sfn in sfns], dtype="int64")
+        firsts = [range(n, len(sfns), workers) for n in range(workers)]
+        return max(fan_out(shared_max_magnitude, numbers, firsts, workers))
+
+
+def prepare(input):
+    return ([SFN(eval(line)) for line in input.splitlines()],)
+
+
 if __name__ == "__main__":
     test()
-    input = aocd.get_data(day=18, year=2021)
-    print("Part One: ", part_one(input))
-    print("Part Two: ", part_two(input))
+    sfns = prepare(inputs.get_data(day=18, year=2021))
+    print("Part One: ", part_one(*sfns))
+    print("Part Two: ", part_two(*sfns))
@@ -1,46 +1,53 @@
-import aocd
+from __future__ import annotations
+
+from aoc import inputs
 from dataclasses import dataclass, field
 import typing as t
-import numpy as np
 import re
 from ast import literal_eval
 
 
-class Beacon:
-    coords: np.array
+class Beacon(tuple):
+    """A point as a plain (x, y, z) tuple, so hashing and comparing it happen in C."""
+
+    __slots__ = ()
 
-    def __init__(self, coords):
-        self.coords = np.array(coords, int)
+    def __new__(cls, coords):
+        # arithmetic below builds its results with tuple.__new__, skipping the conversion
+        return super().__new__(cls, map(int, coords))
+
+    @property
+    def coords(self) -> t.Tuple[int, int, int]:
+        """A plain tuple now, no longer a numpy array: convert it for vectorised arithmetic."""
+        return tuple(self)
 
     @property
     def x(self):
-        return self.coords[0]
+        return self[0]
 
     @property
     def y(self):
-        return self.coords[1]
+        return self[1]
 
     @property
     def z(self):
-        return self.coords[2]
-
-    def __eq__(self, other):
-        return tuple(self.coords) == tuple(other.coords)
+        return self[2]
 
     def __str__(self):
-        return str(tuple(self.coords))
+        return str(tuple(self))
 
     def __repr__(self):
         return str(self)
 
-    def __hash__(self):
-        return hash(tuple(self.coords))
-
     def __add__(self, other):
-        return Beacon(self.coords + other.coords)
+        return tuple.__new__(Beacon, (self[0] + other[0], self[1] + other[1], self[2] + other[2]))
 
     def __sub__(self, other):
-        return Beacon(self.coords - other.coords)
+        return tuple.__new__(Beacon, (self[0] - other[0], self[1] - other[1], self[2] - other[2]))
+
+    def rotate(self, matrix):
+        x, y, z = self
+        return tuple.__new__(Beacon, [a * x + b * y + c * z for a, b, c in matrix])
 
     def normalize(self, origin: "Beacon"):
         return self - origin
@@ -84,7 +91,7 @@ class Scanner:
             ((-1, 0, 0), (0, -1, 0), (0, 0, 1)),
         ]
         for matrix in rotmatrices:
-            yield [Beacon(np.round(np.dot(matrix, b.coords))) for b in self.beacons]
+            yield [b.rotate(matrix) for b in self.beacons]
 
     def try_to_align(self, other: "Scanner", threshold=12, test=False):
         assert (
@@ -155,8 +162,7 @@ def beacon_union(aligned_scanners):
     return united_beacons
 
 
-def tasks(input):
-    scanners: t.List[Scanner] = create_scanners_from_input(input)
+def tasks(scanners: t.List[Scanner]):
     scanners[0].is_normalized = True
     scanners[0].origin = Beacon([0, 0, 0])
     align_scanners(scanners)
@@ -332,12 +338,15 @@ def test():
 891,-625,532
 -652,-548,-490
 30,-46,-14"""
-    part1, part2 = tasks(input)
+    part1, part2 = tasks(*prepare(input))
     assert part1 == 79, part1
     assert part2 == 3621, part2
 
 
+def prepare(input):
+    return (create_scanners_from_input(input),)
+
+
 if __name__ == "__main__":
     test()
-    input = aocd.get_data(day=19, year=2021)
-    print(tasks(input))
+    print(tasks(*prepare(inputs.get_data(day=19, year=2021))))
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from aoc import inputs
 from collections import Counter
 import typing as t
 
@@ -23,23 +23,33 @@ class Game:
                     return
 
 
-@dataclass
 class Player:
-    position: int
-    score: int = 0
+    __slots__ = ("position", "score")
+
+    def __init__(self, position: int, score: int = 0):
+        self.position = position
+        self.score = score
+
+    def __eq__(self, other):
+        if not isinstance(other, Player):
+            return NotImplemented
+        return self.position == other.position and self.score == other.score
 
     def __hash__(self):
-        return hash((self.position, self.score))
+        # positions are 1 to 10, so this is a different int for every player
+        return self.score * 16 + self.position
 
+    def __repr__(self):
+        return f"Player(position={self.position!r}, score={self.score!r})"
 
-def part_one():
+
+def part_one(p1_start=10, p2_start=9):
     g = Game()
-    p1 = Player(position=10)
-    p2 = Player(position=9)
+    p1 = Player(position=p1_start)
+    p2 = Player(position=p2_start)
     g.play(players=(p1, p2))
     min_score = min((p1.score, p2.score))
     result = min_score * g.num_rolls
-    assert result == 918081
     return result
 
 
@@ -58,13 +68,9 @@ def dice_frequencies():
 DICE_FREQS = dice_frequencies()
 
 
-@dataclass
-class GameState:
+class GameState(t.NamedTuple):
     players: t.Tuple
 
-    def __hash__(self):
-        return hash(self.players)
-
     def is_complete(self):
         return self.winner() is not None
 
@@ -125,9 +131,9 @@ def count_wins(games: Counter) -> Counter:
     return wins
 
 
-def part_two():
-    p1 = Player(position=10)
-    p2 = Player(position=9)
+def part_two(p1_start=10, p2_start=9):
+    p1 = Player(position=p1_start)
+    p2 = Player(position=p2_start)
 
     completed_games = dirac(players=(p1, p2))
     wins = count_wins(completed_games)
@@ -150,8 +156,13 @@ def test():
     assert max(wins.values()) == 444356092776315, max(wins.values())
 
 
+def prepare(input):
+    return tuple(int(line.rsplit(":", 1)[1]) for line in input.splitlines())
+
+
 if __name__ == "__main__":
     test()
-    print("Part One:", part_one())
-    print("Part Two:", part_two())
+    starts = prepare(inputs.get_data(day=21, year=2021))
+    print("Part One:", part_one(*starts))
+    print("Part Two:", part_two(*starts))
 #
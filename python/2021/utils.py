@@ -1 +0,0 @@
-../utils.py
\ No newline at end of file
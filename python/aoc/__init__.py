@@ -0,0 +1,3 @@
+"""
+Tooling for running the python/<year>/qNN.py solvers as one suite.
+"""
@@ -0,0 +1,384 @@
+import argparse
+import functools
+import pathlib
+import sys
+import time
+import typing as t
+
+from aoc import (
+    bench,
+    cache,
+    checks,
+    crossovers,
+    daemon,
+    generators,
+    history,
+    inputs,
+    memory,
+    objects,
+    pipeline,
+    profiling,
+    puzzles,
+    runner,
+    scheduler,
+    startup,
+    variants,
+)
+
+
+def add_selection(parser: argparse.ArgumentParser):
+    parser.add_argument("--year", type=int, action="append", help="repeatable, default all")
+    parser.add_argument("--day", type=int, action="append", help="repeatable, default all")
+
+
+def add_history(parser: argparse.ArgumentParser):
+    parser.add_argument("--history", help=f"history database, default {history.DEFAULT_PATH}")
+    parser.add_argument("--no-history", action="store_true", help="don't record this run")
+
+
+def record(args: argparse.Namespace, kind: str, timings: t.List[history.Timing]):
+    # a run answered entirely from the cache timed nothing, and would only be an empty run
+    # diluting `history list`
+    if args.no_history or not timings:
+        return
+    with history.History(args.history) as db:
+        run_id = db.record(kind, timings)
+    print(f"recorded as run {run_id}")
+
+
+def past_costs(args: argparse.Namespace) -> scheduler.Costs:
+    """What earlier runs say each part costs, without creating a history that doesn't exist."""
+    path = pathlib.Path(args.history or history.DEFAULT_PATH)
+    if not path.exists():
+        return {}
+    with history.History(path) as db:
+        return db.costs()
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="solve puzzles in parallel")
+    add_selection(run)
+    run.add_argument("-j", "--workers", type=int, help="default: one per CPU")
+    run.add_argument("--inputs", help=f"input store directory, default {inputs.DEFAULT_ROOT}")
+    add_history(run)
+    run.add_argument("--daemon", action="store_true", help="solve on a running daemon")
+    run.add_argument("--socket", help=f"daemon socket, default {daemon.DEFAULT_SOCKET}")
+    run.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="read and parse inputs ahead of the workers, once per puzzle",
+    )
+    run.add_argument(
+        "--depth", type=int, help="with --pipeline: puzzles to read ahead, default one per worker"
+    )
+    run.add_argument(
+        "--profile", choices=profiling.MODES, help="profile every part; skips the history"
+    )
+    run.add_argument("--profile-dir", help=f"default {profiling.DEFAULT_DIR}")
+    run.add_argument(
+        "--sample-interval", type=float, default=5.0, help="ms of CPU per sample, default 5"
+    )
+    run.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace allocations for peak memory and top sites; skips the history",
+    )
+    run.add_argument("--memory-budget", type=float, help="MB, fail parts that use more")
+    run.add_argument("--no-cache", action="store_true", help="solve every part, even unchanged")
+    run.add_argument("--cache-dir", help=f"default {cache.DEFAULT_ROOT}")
+    run.add_argument("--cache-size", type=float, default=256, help="MB, default 256")
+
+    store = commands.add_parser("inputs", help="manage the offline input store")
+    store.add_argument("action", choices=["fetch", "add", "list", "verify"])
+    add_selection(store)
+    store.add_argument("--file", help="for add: read the input from this file, default stdin")
+    store.add_argument("--inputs", help=f"input store directory, default {inputs.DEFAULT_ROOT}")
+
+    generate = commands.add_parser("generate", help="print a synthetic input of any size")
+    generate.add_argument("year", type=int)
+    generate.add_argument("day", type=int)
+    generate.add_argument("--size", type=int, required=True, help="the puzzle's natural n")
+    generate.add_argument("--seed", type=int, default=0)
+
+    scaling = commands.add_parser("bench", help="fit scaling exponents over synthetic inputs")
+    add_selection(scaling)
+    scaling.add_argument("--part", action="append", help="repeatable, default every part")
+    scaling.add_argument("--start", type=int, default=8, help="smallest size, default 8")
+    scaling.add_argument("--factor", type=float, default=2.0, help="size ratio, default 2")
+    scaling.add_argument("--steps", type=int, default=8, help="sizes in the ladder, default 8")
+    scaling.add_argument("--repeats", type=int, default=3)
+    scaling.add_argument("--warmup", type=int, default=1)
+    scaling.add_argument("--seed", type=int, default=0)
+    scaling.add_argument(
+        "--max-seconds", type=float, default=2.0, help="stop climbing once a run is this slow"
+    )
+    scaling.add_argument(
+        "--tolerance", type=float, default=0.35, help="allowed excess over the declared exponent"
+    )
+    scaling.add_argument("--json", help="also write the curves to this file")
+    add_history(scaling)
+
+    past = commands.add_parser("history", help="list recorded runs or check for regressions")
+    past.add_argument("action", choices=["list", "compare"])
+    past.add_argument("--history", help=f"history database, default {history.DEFAULT_PATH}")
+    past.add_argument("--run", type=int, help="for compare: the run to check, default latest")
+    past.add_argument("--window", type=int, default=10, help="baseline runs, default 10")
+    past.add_argument("--sigma", type=float, default=3.0, help="default 3")
+    past.add_argument(
+        "--min-slowdown", type=float, default=0.1, help="relative, default 0.1 (10%%)"
+    )
+
+    warm = commands.add_parser("daemon", help="keep warm workers for repeated runs")
+    warm.add_argument("action", choices=["start", "stop", "status"])
+    add_selection(warm)
+    warm.add_argument("-j", "--workers", type=int, help="default: one per CPU")
+    warm.add_argument("--inputs", help=f"input store directory, default {inputs.DEFAULT_ROOT}")
+    warm.add_argument("--socket", help=f"default {daemon.DEFAULT_SOCKET}")
+
+    audit = commands.add_parser("startup", help="audit import time of each solver")
+    add_selection(audit)
+    audit.add_argument("--budget", type=float, help="ms, fail solvers that take longer to load")
+    audit.add_argument("--json", help="also write the audit to this file")
+
+    hot = commands.add_parser("objects", help="memory and hash/eq speed of hot small objects")
+    add_selection(hot)
+    hot.add_argument("--count", type=int, default=100_000, help="objects made, default 100000")
+    hot.add_argument("--repeats", type=int, default=3)
+    hot.add_argument("--json", help="also write the samples to this file")
+    hot.add_argument("--baseline", help="samples written by an earlier --json, to compare")
+
+    racing = commands.add_parser("variants", help="race interchangeable variants, save crossovers")
+    add_selection(racing)
+    racing.add_argument("--start", type=int, default=8, help="smallest size, default 8")
+    racing.add_argument("--factor", type=float, default=2.0, help="size ratio, default 2")
+    racing.add_argument("--steps", type=int, default=12, help="sizes in the ladder, default 12")
+    racing.add_argument("--repeats", type=int, default=3)
+    racing.add_argument("--seed", type=int, default=0)
+    racing.add_argument(
+        "--max-seconds", type=float, default=2.0, help="stop a variant once a run is this slow"
+    )
+    racing.add_argument("--json", help="also write the timings to this file")
+    racing.add_argument("--file", help=f"crossovers file, default {variants.DEFAULT_PATH}")
+    racing.add_argument("--no-save", action="store_true", help="don't write the crossovers")
+
+    budgeted = commands.add_parser("check", help="fail functions over their declared budgets")
+    add_selection(budgeted)
+    budgeted.add_argument("--inputs", help=f"input store directory, default {inputs.DEFAULT_ROOT}")
+    budgeted.add_argument(
+        "--scale", type=float, help="scale time budgets by this instead of calibrating"
+    )
+
+    cached = commands.add_parser("cache", help="inspect or empty the answer and parse cache")
+    cached.add_argument("action", choices=["info", "clear"])
+    cached.add_argument("--cache-dir", help=f"default {cache.DEFAULT_ROOT}")
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        print(generators.generate(args.year, args.day, args.size, args.seed))
+        return 0
+    if args.command == "history":
+        return show_history(args)
+    if args.command == "cache":
+        return manage_cache(args)
+
+    if args.command in ("bench", "variants") and args.factor <= 1:
+        parser.error(f"--factor must be over 1, not {args.factor}")
+
+    selected = puzzles.discover(args.year, args.day)
+
+    if args.command == "run":
+        if args.daemon and args.pipeline:
+            parser.error("--pipeline doesn't apply to --daemon, which keeps parsed inputs already")
+        options = dict(
+            profile=args.profile,
+            profile_dir=args.profile_dir,
+            sample_interval=args.sample_interval / 1000,
+            track_memory=args.memory,
+            memory_budget=int(args.memory_budget * memory.MB) if args.memory_budget else None,
+            cache_dir=args.cache_dir,
+            cache_size=int(args.cache_size * memory.MB),
+            use_cache=not args.no_cache,
+        )
+        if args.daemon:
+            results, elapsed = run_on_daemon(args, options)
+        else:
+            if args.pipeline:
+                suite = functools.partial(pipeline.run, depth=args.depth)
+            else:
+                suite = runner.run
+            results, elapsed = suite(
+                selected,
+                workers=args.workers,
+                store=args.inputs,
+                costs=past_costs(args),
+                **options,
+            )
+        print(runner.report(results, elapsed))
+        if args.profile:
+            print(f"profiles written to {args.profile_dir or profiling.DEFAULT_DIR}")
+        if not (args.profile or args.memory):
+            record(args, "run", runner.timings(results))
+        return int(not all(r.ok for r in results))
+    if args.command == "inputs":
+        return manage_inputs(args, selected)
+    if args.command == "daemon":
+        return manage_daemon(args, selected)
+    if args.command == "bench":
+        return run_bench(args, selected)
+    if args.command == "startup":
+        audits = [startup.audit_runner()] + [startup.audit_puzzle(p) for p in selected]
+        budget = args.budget / 1000 if args.budget else None
+        print(startup.report(audits, budget))
+        if args.json:
+            startup.dump(audits, args.json)
+        return int(any(a.error or (budget and a.load > budget) for a in audits))
+    if args.command == "objects":
+        samples = [s for p in selected for s in objects.collect(p, args.count, args.repeats)]
+        print(objects.report(samples, objects.load(args.baseline) if args.baseline else None))
+        if args.json:
+            objects.dump(samples, args.json)
+    if args.command == "variants":
+        return race_variants(args, selected)
+    if args.command == "check":
+        scale = args.scale or checks.calibrate() / checks.REFERENCE_SECONDS
+        found = checks.check(selected, scale, args.inputs)
+        print(checks.report(found, scale))
+        return int(not all(c.ok for c in found))
+    return 0
+
+
+def manage_inputs(args: argparse.Namespace, selected: t.List[puzzles.Puzzle]) -> int:
+    store = inputs.InputStore(args.inputs)
+    if args.action == "fetch":
+        for puzzle in selected:
+            if (puzzle.year, puzzle.day) not in store:
+                print(puzzle, store.fetch(puzzle.year, puzzle.day))
+    elif args.action == "add":
+        if len(args.year or ()) != 1 or len(args.day or ()) != 1:
+            print("add needs exactly one --year and --day", file=sys.stderr)
+            return 2
+        data = open(args.file).read() if args.file else sys.stdin.read()
+        print(store.add(args.year[0], args.day[0], data))
+    elif args.action == "list":
+        for key, entry in sorted(store.manifest().items()):
+            print(f"{key}  {entry['sha256']}  {entry['size']} bytes")
+    elif args.action == "verify":
+        bad = store.verify()
+        for year, day in bad:
+            print(f"{year}/{day:02d} is missing or does not match the manifest")
+        return int(bool(bad))
+    return 0
+
+
+def run_bench(args: argparse.Namespace, selected: t.List[puzzles.Puzzle]) -> int:
+    sizes = bench.ladder(args.start, args.factor, args.steps)
+    curves = []
+    for puzzle in selected:
+        if (puzzle.year, puzzle.day) not in generators.available():
+            continue
+        for part in puzzles.parts(puzzles.load(puzzle)):
+            if args.part and part not in args.part:
+                continue
+            curve = bench.benchmark(
+                puzzle,
+                part,
+                sizes,
+                repeats=args.repeats,
+                warmup=args.warmup,
+                seed=args.seed,
+                max_seconds=args.max_seconds,
+                tolerance=args.tolerance,
+            )
+            curves.append(curve)
+    print(bench.report(curves))
+    if args.json:
+        bench.dump(curves, args.json)
+    record(args, "bench", bench.timings(curves))
+    return int(any(c.flagged for c in curves))
+
+
+def race_variants(args: argparse.Namespace, selected: t.List[puzzles.Puzzle]) -> int:
+    sizes = bench.ladder(args.start, args.factor, args.steps)
+    races = [
+        crossovers.race(problem, sizes, args.repeats, args.seed, args.max_seconds)
+        for puzzle in selected
+        for problem in crossovers.problems(puzzle)
+    ]
+    print(crossovers.report(races))
+    if args.json:
+        crossovers.dump(races, args.json)
+    agreed = {r.problem: r.crossovers() for r in races if not r.disagreements}
+    if agreed and not args.no_save:
+        variants.save(agreed, args.file)
+        print(f"crossovers saved to {args.file or variants.DEFAULT_PATH}")
+    return int(len(agreed) < len(races))
+
+
+def show_history(args: argparse.Namespace) -> int:
+    with history.History(args.history) as db:
+        if args.action == "list":
+            for row in db.runs():
+                commit = (row["git_commit"] or "-")[:10] + ("+" if row["dirty"] else "")
+                print(
+                    f"{row['id']:>5}  {row['started']}  {row['kind']:<6} {commit:<12} "
+                    f"{row['parts']} timings"
+                )
+            return 0
+        regressions = db.compare(
+            args.run, window=args.window, sigma=args.sigma, min_slowdown=args.min_slowdown
+        )
+    for regression in regressions:
+        print(regression)
+    return int(bool(regressions))
+
+
+def run_on_daemon(
+    args: argparse.Namespace, options: t.Dict[str, t.Any]
+) -> t.Tuple[t.List[runner.Result], float]:
+    start = time.perf_counter()
+    with daemon.Client(args.socket) as client:
+        pending = client.jobs(args.year, args.day)
+        # the daemon's workers take requests in the order they arrive
+        ordered = scheduler.longest_first(pending, past_costs(args))
+        results = {job: r for job, r in zip(ordered, client.solve_all(ordered, **options))}
+    return [results[job] for job in pending], time.perf_counter() - start
+
+
+def manage_daemon(args: argparse.Namespace, selected: t.List[puzzles.Puzzle]) -> int:
+    if args.action == "start":
+        server = daemon.Server(args.socket, args.workers, args.inputs, selected)
+        try:
+            server.run()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    try:
+        with daemon.Client(args.socket) as client:
+            response = client.request("shutdown" if args.action == "stop" else "ping")
+    except daemon.DaemonError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if args.action == "status":
+        print(f"daemon {response['pid']} with {response['workers']} workers")
+    return 0
+
+
+def manage_cache(args: argparse.Namespace) -> int:
+    store = cache.Cache(args.cache_dir)
+    if args.action == "info":
+        namespaces: t.Dict[str, t.List[int]] = {}
+        for _, size, path in store.entries():
+            namespaces.setdefault(path.parent.parent.name, []).append(size)
+        print(store.root)
+        for namespace, sizes in sorted(namespaces.items()):
+            print(f"{namespace:<10} {len(sizes):>6} entries {sum(sizes) / memory.MB:>8.1f} MB")
+    elif args.action == "clear":
+        print(f"removed {store.clear() / memory.MB:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Scaling benchmarks: time each part over a ladder of synthetic input sizes and fit the
+empirical growth exponent, i.e. the slope of log(time) against log(size).
+
+A part declares its complexity in its docstring, e.g. "O(n log n)". When the measured exponent
+is worse than the declared one (plus a tolerance for log factors and noise) the part is
+flagged, so a change that makes a solver asymptotically slower is caught even if it is still
+quick at the real input size.
+"""
+import contextlib
+import dataclasses
+import io
+import json
+import math
+import re
+import signal
+import statistics
+import time
+import typing as t
+
+from aoc import generators, history, inputs, puzzles
+from aoc.puzzles import Puzzle
+
+_complexity_re = re.compile(r"O\(([^)]*)\)")
+_power_re = re.compile(r"n\s*(?:\^|\*\*)\s*(\d+(?:\.\d+)?)")
+
+# below this a run's time is mostly the fixed cost of calling, parsing and setting up, which
+# flattens the slope, so `fit` leaves such sizes out
+OVERHEAD_SECONDS = 1e-3
+
+
+@dataclasses.dataclass
+class Point:
+    size: int
+    times: t.List[float]
+    input_hash: t.Optional[str] = None
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+
+@dataclasses.dataclass
+class Curve:
+    puzzle: Puzzle
+    part: str
+    declared: t.Optional[str] = None
+    points: t.List[Point] = dataclasses.field(default_factory=list)
+    exponent: t.Optional[float] = None
+    r2: t.Optional[float] = None
+    flagged: bool = False
+    stopped: t.Optional[str] = None
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "year": self.puzzle.year,
+            "day": self.puzzle.day,
+            "part": self.part,
+            "declared": self.declared,
+            "declared_exponent": declared_exponent(self.declared),
+            "exponent": self.exponent,
+            "r2": self.r2,
+            "flagged": self.flagged,
+            "stopped": self.stopped,
+            "points": [
+                {
+                    "size": p.size,
+                    "input_hash": p.input_hash,
+                    "best": p.best,
+                    "median": p.median,
+                    "times": p.times,
+                }
+                for p in self.points
+            ],
+        }
+
+
+def declared_complexity(func: t.Callable) -> t.Optional[str]:
+    match = _complexity_re.search(func.__doc__ or "")
+    return match[0] if match else None
+
+
+def declared_exponent(complexity: t.Optional[str]) -> t.Optional[float]:
+    """
+    The polynomial degree of an O() string, ignoring log factors: O(1) -> 0, O(n log n) -> 1,
+    O(n^3) -> 3. Exponential growth is infinity. None if it can't be read.
+    """
+    if not complexity:
+        return None
+    body = _complexity_re.fullmatch(complexity)[1].replace(" ", "")
+    if body == "1" or body == "logn":
+        return 0.0
+    if re.search(r"\d\^n|\^n", body):
+        return math.inf
+    powers = [float(p) for p in _power_re.findall(body)]
+    if powers:
+        return max(powers)
+    if "n" in body.replace("logn", ""):
+        return 1.0
+    return None
+
+
+def fit(points: t.Sequence[Point]) -> t.Tuple[t.Optional[float], t.Optional[float]]:
+    """
+    Least squares slope and r^2 of log(best time) against log(size), over the sizes that took
+    at least `OVERHEAD_SECONDS`, or the larger half of the sizes when fewer than two did.
+    """
+    usable = [p for p in points if p.best >= OVERHEAD_SECONDS]
+    if len(usable) < 2:
+        ordered = sorted((p for p in points if p.best > 0), key=lambda p: p.size)
+        usable = ordered[len(ordered) // 2 :]
+    if len(usable) < 2:
+        return None, None
+    xs = [math.log(p.size) for p in usable]
+    ys = [math.log(p.best) for p in usable]
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    syy = sum((y - my) ** 2 for y in ys)
+    if not sxx:
+        return None, None
+    slope = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy else 1.0
+    return slope, r2
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """Raise TimeoutError in the main thread if the block runs longer than `seconds`."""
+
+    def expire(signum, frame):
+        raise TimeoutError(f"took longer than {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def ladder(start: int, factor: float, steps: int) -> t.List[int]:
+    if factor <= 1:
+        raise ValueError(f"the size ratio must be over 1, not {factor}")
+    sizes: t.List[int] = []
+    size = float(start)
+    while len(sizes) < steps:
+        if not sizes or int(size) > sizes[-1]:
+            sizes.append(int(size))
+        size *= factor
+    return sizes
+
+
+def measure(
+    func: t.Callable,
+    prepare: t.Callable[[], t.Tuple],
+    repeats: int = 3,
+    warmup: int = 1,
+    timeout: float = 60.0,
+) -> t.List[float]:
+    """
+    Time `func(*prepare())`. Arguments are prepared afresh for every call, outside the timing,
+    since several parts sort or otherwise modify their input.
+    """
+    times = []
+    for n in range(warmup + repeats):
+        args = prepare()
+        with deadline(timeout), contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+        if n >= warmup:
+            times.append(elapsed)
+    return times
+
+
+def benchmark(
+    puzzle: Puzzle,
+    part: str,
+    sizes: t.Sequence[int],
+    repeats: int = 3,
+    warmup: int = 1,
+    seed: int = 0,
+    max_seconds: float = 5.0,
+    tolerance: float = 0.35,
+) -> Curve:
+    """
+    Climb the size ladder until it ends or one run takes longer than `max_seconds`. Warmup is
+    skipped once a single run gets expensive, so a slow part costs about one run per size.
+    """
+    module = puzzles.load(puzzle)
+    func = getattr(module, part)
+    curve = Curve(puzzle, part, declared_complexity(func))
+    for size in sizes:
+        try:
+            data = generators.generate(puzzle.year, puzzle.day, size, seed)
+        except ValueError:
+            # below the smallest size the generator can make valid
+            continue
+        slow = bool(curve.points) and curve.points[-1].best * 2 > max_seconds / 2
+        try:
+            times = measure(
+                func,
+                lambda: puzzles.prepare(module, data),
+                repeats=1 if slow else repeats,
+                warmup=0 if slow else warmup,
+                timeout=max_seconds * 4,
+            )
+        except TimeoutError as e:
+            curve.stopped = f"size {size} {e}"
+            break
+        except RecursionError:
+            curve.stopped = f"size {size} hit the recursion limit"
+            break
+        curve.points.append(Point(size, times, inputs.digest(data)))
+        if min(times) > max_seconds:
+            curve.stopped = f"size {size} took {min(times):.1f}s"
+            break
+    curve.exponent, curve.r2 = fit(curve.points)
+    declared = declared_exponent(curve.declared)
+    if declared is not None and curve.exponent is not None:
+        curve.flagged = curve.exponent > declared + tolerance
+    return curve
+
+
+def timings(curves: t.Iterable[Curve]) -> t.List[history.Timing]:
+    """The best time at each size, which is the figure the exponent is fitted to."""
+    return [
+        history.Timing(c.puzzle.year, c.puzzle.day, c.part, p.input_hash, p.best, size=p.size)
+        for c in curves
+        for p in c.points
+    ]
+
+
+def duration(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds * 1e6:.0f}us"
+
+
+def report(curves: t.Sequence[Curve]) -> str:
+    lines = [f"{'puzzle':<10} {'part':<9} {'declared':<12} {'fitted':>7} {'r2':>5}  timings"]
+    for c in curves:
+        fitted = f"{c.exponent:.2f}" if c.exponent is not None else "-"
+        r2 = f"{c.r2:.2f}" if c.r2 is not None else "-"
+        timings = "  ".join(f"{p.size}:{duration(p.best)}" for p in c.points)
+        flag = "  WORSE THAN DECLARED" if c.flagged else ""
+        lines.append(
+            f"{str(c.puzzle):<10} {c.part:<9} {c.declared or '-':<12} {fitted:>7} {r2:>5}  "
+            f"{timings}{flag}"
+        )
+        if c.stopped:
+            lines.append(f"{'':<21}stopped at {c.stopped}")
+    return "\n".join(lines)
+
+
+def dump(curves: t.Sequence[Curve], path: str):
+    with open(path, "w") as f:
+        json.dump([c.as_dict() for c in curves], f, indent=2)
@@ -0,0 +1,45 @@
+"""
+Time and memory budgets that solver functions declare, in place of timings in docstrings:
+
+    @budget(ms=40, mb=5)
+    def part_one(data): ...
+
+    @budget(ms=12000, mb=800, target=30_000_000)
+    def solve_dict(data, target=2020): ...
+
+`python -m aoc check` (see `aoc.checks`) calls every function with a budget on the arguments
+`prepare` makes from the puzzle input, plus any keyword arguments given to `budget`, and fails
+the ones that take longer or use more memory than they declare. Times are milliseconds on the
+reference machine, which the check scales to the host it runs on.
+"""
+import dataclasses
+import typing as t
+
+
+@dataclasses.dataclass
+class Budget:
+    ms: t.Optional[float] = None
+    mb: t.Optional[float] = None
+    kwargs: t.Dict[str, t.Any] = dataclasses.field(default_factory=dict)
+
+
+def budget(ms: t.Optional[float] = None, mb: t.Optional[float] = None, **kwargs) -> t.Callable:
+    """
+    Declare that the decorated function takes at most `ms` milliseconds on the reference
+    machine and `mb` MB of memory, when called on the puzzle input with `kwargs`.
+    """
+
+    def declare(func: t.Callable) -> t.Callable:
+        func.budget = Budget(ms, mb, kwargs)
+        return func
+
+    return declare
+
+
+def budgeted(module: t.Any) -> t.List[str]:
+    """The names of the functions in a solver that declare a budget, each once."""
+    found = {}
+    for value in vars(module).values():
+        if callable(value) and isinstance(getattr(value, "budget", None), Budget):
+            found.setdefault(id(value), value.__name__)
+    return list(found.values())
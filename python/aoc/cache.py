@@ -0,0 +1,248 @@
+"""
+Content-addressed cache of part answers and parsed inputs.
+
+An answer is stored under a hash of (solver source, input hash, part), where the solver
+source is the module plus every local module it imports, found by walking `import`
+statements with `ast` rather than importing anything. Editing a solver or a helper it uses
+therefore only invalidates the entries that depended on it, and entries never need explicit
+invalidation: stale ones simply stop being looked up and age out.
+
+Parsed inputs, what a solver's `prepare` returns, are stored the same way under (parser hash,
+input hash), where the parser hash only covers `prepare` and what it uses. While iterating on
+a part, the input is parsed once and then unpickled.
+
+Entries are pickles in `<root>/<namespace>/<key[:2]>/<key>`. Recency is the file's mtime,
+touched on every hit, and whenever the store grows past `max_bytes` the least recently used
+files are removed until it is back under. Writes go through a per-process temporary file and
+`os.replace`, so concurrent workers can share one store.
+"""
+import ast
+import functools
+import hashlib
+import os
+import pathlib
+import pickle
+import typing as t
+
+from aoc import puzzles
+from aoc.puzzles import Puzzle
+
+DEFAULT_ROOT = pathlib.Path(os.environ.get("AOC_CACHE", puzzles.ROOT.parent / ".aoc" / "cache"))
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+# tooling the solvers import for their __main__ blocks, which doesn't change any answer
+_ignored_packages = {"aoc"}
+
+
+def _module_files(name: str, search: t.Sequence[pathlib.Path]) -> t.List[pathlib.Path]:
+    """
+    The local files `import name` could load from any of the `search` directories, including
+    parent package __init__s.
+    """
+    parts = name.split(".")
+    if parts[0] in _ignored_packages:
+        return []
+    files = []
+    for directory in search:
+        found = []
+        for depth in range(1, len(parts) + 1):
+            base = directory.joinpath(*parts[:depth])
+            if (base / "__init__.py").is_file():
+                found.append(base / "__init__.py")
+            elif depth == len(parts) and base.with_suffix(".py").is_file():
+                found.append(base.with_suffix(".py"))
+            else:
+                break
+        if len(found) == len(parts):
+            files.extend(found)
+    return files
+
+
+def local_imports(path: pathlib.Path) -> t.Set[pathlib.Path]:
+    """Every local module `path` imports, directly or through other local modules."""
+    # a solver run as a script imports from its own directory, run by the suite from ROOT
+    search = [path.parent, puzzles.ROOT]
+    seen: t.Set[pathlib.Path] = set()
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        tree = ast.parse(current.read_bytes(), filename=str(current))
+        for node in ast.walk(tree):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # `from package import name` may import a submodule
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            for name in names:
+                for found in _module_files(name, search):
+                    if found not in seen and found != path:
+                        seen.add(found)
+                        pending.append(found)
+    return seen
+
+
+_hashes: t.Dict[t.Tuple, t.Tuple[puzzles.Fingerprint, str]] = {}
+
+
+def _until_changed(func: t.Callable[..., str]) -> t.Callable[..., str]:
+    """
+    Memoise a hash of a solver's files until any of them changes on disk, rather than for the
+    life of the process, which for a daemon's workers outlasts many edits.
+    """
+
+    @functools.wraps(func)
+    def memoised(puzzle: Puzzle, *args: t.Any) -> str:
+        key = (func.__name__, puzzle.path, *args)
+        if key in _hashes:
+            seen, digest = _hashes[key]
+            if puzzles.fingerprint(seen) == seen:
+                return digest
+        # taken first, so that an edit made while hashing shows up as a change
+        seen = puzzles.fingerprint([puzzle.path, *local_imports(puzzle.path)])
+        digest = func(puzzle, *args)
+        _hashes[key] = (seen, digest)
+        return digest
+
+    return memoised
+
+
+@_until_changed
+def source_hash(puzzle: Puzzle) -> str:
+    """Hash of a solver's source and every local module it depends on."""
+    h = hashlib.sha256()
+    for path in [puzzle.path] + sorted(local_imports(puzzle.path)):
+        h.update(str(path.relative_to(puzzles.ROOT)).encode())
+        h.update(b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _names(node: ast.AST) -> t.Set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _defined(node: ast.stmt) -> t.Set[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return set().union(*(_names(target) for target in targets))
+    return set()
+
+
+@_until_changed
+def parser_hash(puzzle: Puzzle, entry: str = "prepare") -> str:
+    """
+    Hash of the part of a solver that parses its input: `entry`, every top level definition
+    it refers to by name (transitively), the module's imports and the local modules they load.
+    Editing a part leaves parsed inputs cached; editing anything the parser uses doesn't.
+    """
+    source = puzzle.path.read_text()
+    tree = ast.parse(source, filename=str(puzzle.path))
+    definitions: t.Dict[str, t.List[ast.stmt]] = {}
+    imports = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(node)
+        for name in _defined(node):
+            definitions.setdefault(name, []).append(node)
+    used: t.List[ast.stmt] = []
+    pending = [entry]
+    seen = set(pending)
+    while pending:
+        for node in definitions.get(pending.pop(), []):
+            if node in used:
+                continue
+            used.append(node)
+            for name in _names(node) - seen:
+                seen.add(name)
+                pending.append(name)
+    h = hashlib.sha256()
+    for node in imports + sorted(used, key=lambda node: node.lineno):
+        h.update(ast.get_source_segment(source, node).encode())
+        h.update(b"\0")
+    for path in sorted(local_imports(puzzle.path)):
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def key(*parts: t.Any) -> str:
+    return hashlib.sha256("\0".join(map(str, parts)).encode()).hexdigest()
+
+
+class Cache:
+    def __init__(
+        self,
+        root: t.Union[str, pathlib.Path, None] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.root = pathlib.Path(root or DEFAULT_ROOT)
+        self.max_bytes = max_bytes
+
+    def path(self, namespace: str, key: str) -> pathlib.Path:
+        return self.root / namespace / key[:2] / key
+
+    def get(self, namespace: str, key: str, default: t.Any = None) -> t.Any:
+        path = self.path(namespace, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # truncated, or pickled from a class that has since changed
+            path.unlink(missing_ok=True)
+            return default
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, namespace: str, key: str, value: t.Any):
+        path = self.path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{key}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, path)
+        self.evict()
+
+    def entries(self) -> t.List[t.Tuple[float, int, pathlib.Path]]:
+        """(last used, size, path) of every entry, least recently used first."""
+        found = []
+        for path in self.root.glob("*/*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return sorted(found)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes: t.Optional[int] = None) -> int:
+        """Remove least recently used entries until the store fits. Returns bytes freed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total - freed <= limit:
+                break
+            path.unlink(missing_ok=True)
+            freed += size
+        return freed
+
+    def clear(self) -> int:
+        return self.evict(0)
@@ -0,0 +1,134 @@
+"""
+Check the budgets solver functions declare (see `aoc.budgets`) on the puzzle input.
+
+Budgets are milliseconds on the reference machine, the one where `calibrate()` took
+`REFERENCE_SECONDS`. The check times the same loop on the host first and scales every time
+budget by how much slower or faster it ran, so a budget written on one machine holds on
+another, as far as a loop of int, list and dict operations stands for what the solvers do.
+Memory isn't scaled.
+
+Each function runs in a fresh worker, so its memory is the growth in the worker's peak RSS
+over the call, which costs nothing to measure where tracemalloc would slow a long part down
+many times. The memory budget is also applied as an address space limit, and a function is
+stopped at four times its time budget, so a runaway one fails rather than hangs.
+"""
+import contextlib
+import dataclasses
+import io
+import time
+import typing as t
+
+from aoc import bench, budgets, inputs, memory, puzzles, runner
+from aoc.budgets import Budget
+from aoc.puzzles import Puzzle
+
+# the best of `calibrate()` on the machine the budgets were written on
+REFERENCE_SECONDS = 0.037
+
+
+def calibration_loop(n: int = 200_000) -> int:
+    table: t.Dict[int, int] = {}
+    values = [0] * 1024
+    total = 0
+    for i in range(n):
+        key = (i * 7919) & 1023
+        values[key] += i
+        table[key] = table.get(key, 0) + 1
+        total += values[key] % 13
+    return total
+
+
+def calibrate(repeats: int = 7) -> float:
+    """The best time of the calibration loop, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        calibration_loop()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@dataclasses.dataclass
+class Check:
+    puzzle: Puzzle
+    function: str
+    budget: Budget
+    scale: float = 1.0
+    seconds: t.Optional[float] = None
+    used: t.Optional[int] = None
+    error: t.Optional[str] = None
+
+    @property
+    def allowed(self) -> t.Optional[float]:
+        """The time budget on this host, in seconds."""
+        return None if self.budget.ms is None else self.budget.ms / 1000 * self.scale
+
+    @property
+    def over(self) -> t.List[str]:
+        found = []
+        if self.allowed is not None and self.seconds is not None and self.seconds > self.allowed:
+            found.append("time")
+        if self.budget.mb is not None and self.used is not None:
+            if self.used > self.budget.mb * memory.MB:
+                found.append("memory")
+        return found
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.over
+
+
+def measure(
+    puzzle: Puzzle, function: str, scale: float = 1.0, store: t.Optional[str] = None
+) -> Check:
+    """Call one budgeted function on the puzzle input. Runs inside a fresh worker."""
+    module = puzzles.load(puzzle)
+    func = getattr(module, function)
+    check = Check(puzzle, function, func.budget, scale)
+    limit = int(check.budget.mb * memory.MB) if check.budget.mb else None
+    try:
+        data = inputs.InputStore(store).text(puzzle.year, puzzle.day)
+        with contextlib.redirect_stdout(io.StringIO()):
+            args = puzzles.prepare(module, data)
+            before = memory.peak_rss()
+            # a deadline of 0 is none at all
+            with memory.address_space_limit(limit), bench.deadline((check.allowed or 0) * 4):
+                start = time.perf_counter()
+                func(*args, **check.budget.kwargs)
+                check.seconds = time.perf_counter() - start
+            check.used = memory.peak_rss() - before
+    except TimeoutError:
+        check.error = f"stopped after {bench.duration(check.allowed * 4)}"
+    except Exception as e:
+        check.error = f"{type(e).__name__}: {e}"
+    return check
+
+
+def check(
+    selected: t.Sequence[Puzzle], scale: float = 1.0, store: t.Optional[str] = None
+) -> t.List[Check]:
+    checks = []
+    for puzzle in selected:
+        for function in budgets.budgeted(puzzles.load(puzzle)):
+            with runner.worker_pool(1) as pool:
+                checks.append(pool.submit(measure, puzzle, function, scale, store).result())
+    return checks
+
+
+def report(checks: t.Sequence[Check], scale: float) -> str:
+    lines = [
+        f"time budgets scaled by {scale:.2f} for this host",
+        f"{'puzzle':<10} {'function':<20} {'time':>9} {'budget':>9} {'memory':>10} "
+        f"{'budget':>10}",
+    ]
+    for c in checks:
+        seconds = bench.duration(c.seconds) if c.seconds is not None else "-"
+        allowed = bench.duration(c.allowed) if c.allowed is not None else "-"
+        used = f"{c.used / memory.MB:.1f} MB" if c.used is not None else "-"
+        mb = f"{c.budget.mb:.1f} MB" if c.budget.mb is not None else "-"
+        verdict = c.error or (f"OVER BUDGET ({', '.join(c.over)})" if c.over else "ok")
+        lines.append(
+            f"{str(c.puzzle):<10} {c.function:<20} {seconds:>9} {allowed:>9} {used:>10} "
+            f"{mb:>10}  {verdict}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+"""
+Race the variants of each problem (see `aoc.variants`) over a ladder of input sizes, and find
+the sizes where the fastest one changes.
+
+At every size each variant first solves the problem's sample once, untimed unless it is
+already slow, which warms it up and gives the answer that all the variants must agree on. A
+variant that disagrees or raises is reported and its problem's crossovers aren't saved. Like
+`aoc.bench`, a variant stops climbing the ladder once a run takes longer than
+`max_seconds`, and is taken to be slower than the others at the sizes it didn't reach.
+
+A crossover is put at the geometric mean of the last size the old winner won and the first
+the new one did, since the ladder doubles and the times grow as powers of the size. Where
+they differ from the crossovers the problem declares, both are reported: the declared ones
+were raced on another host, and may need updating if this one is the reference.
+"""
+import contextlib
+import dataclasses
+import io
+import json
+import math
+import time
+import typing as t
+
+from aoc import bench, puzzles, variants
+from aoc.puzzles import Puzzle
+from aoc.variants import Problem
+
+
+@dataclasses.dataclass
+class Race:
+    problem: str
+    points: t.Dict[str, t.List[bench.Point]]
+    stopped: t.Dict[str, str] = dataclasses.field(default_factory=dict)
+    disagreements: t.List[str] = dataclasses.field(default_factory=list)
+    declared: variants.Crossovers = dataclasses.field(default_factory=list)
+
+    def winners(self) -> t.List[t.Tuple[int, str]]:
+        """The fastest variant at each size any of them was timed at."""
+        best: t.Dict[int, t.Tuple[float, str]] = {}
+        for name, points in self.points.items():
+            for p in points:
+                best[p.size] = min(best.get(p.size, (math.inf, name)), (p.best, name))
+        return [(size, best[size][1]) for size in sorted(best)]
+
+    def crossovers(self) -> variants.Crossovers:
+        found: variants.Crossovers = []
+        previous = None
+        for size, name in self.winners():
+            if not found:
+                found.append((size, name))
+            elif name != found[-1][1]:
+                found.append((round(math.sqrt(previous * size)), name))
+            previous = size
+        return found
+
+    @property
+    def drifted(self) -> bool:
+        """Whether the problem declares crossovers and this race found others."""
+        return bool(self.declared) and self.crossovers() != self.declared
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "problem": self.problem,
+            "crossovers": self.crossovers(),
+            "declared": self.declared,
+            "stopped": self.stopped,
+            "disagreements": self.disagreements,
+            "variants": {
+                name: [{"size": p.size, "best": p.best, "times": p.times} for p in points]
+                for name, points in self.points.items()
+            },
+        }
+
+
+def problems(puzzle: Puzzle) -> t.List[Problem]:
+    """The problems a solver declares, each once, however many names it has."""
+    module = puzzles.load(puzzle)
+    found = {id(v): v for v in vars(module).values() if isinstance(v, Problem)}
+    return list(found.values())
+
+
+def race(
+    problem: Problem,
+    sizes: t.Sequence[int],
+    repeats: int = 3,
+    seed: int = 0,
+    max_seconds: float = 2.0,
+) -> Race:
+    result = Race(
+        problem.name, {name: [] for name in problem.variants}, declared=list(problem.declared)
+    )
+    running = dict(problem.variants)
+    for size in sizes:
+        try:
+            problem.sample(size, seed)
+        except ValueError:
+            # below the smallest size the sample can be made at
+            continue
+        answers = {}
+        for name, variant in list(running.items()):
+            if not variant.fits(size):
+                result.stopped[name] = f"size {size}, over its limit of {variant.max_size}"
+                del running[name]
+                continue
+            args = problem.sample(size, seed)
+            try:
+                with bench.deadline(max_seconds * 4), contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    answers[name] = variant.func(*args)
+                    first = time.perf_counter() - start
+                times = [first]
+                if first * 4 < max_seconds:
+                    times = bench.measure(
+                        variant.func,
+                        lambda: problem.sample(size, seed),
+                        repeats=repeats,
+                        warmup=0,
+                        timeout=max_seconds * 4,
+                    )
+            except TimeoutError as e:
+                result.stopped[name] = f"size {size} {e}"
+                del running[name]
+                continue
+            except Exception as e:
+                result.disagreements.append(f"size {size}: {name} raised {e!r}")
+                del running[name]
+                continue
+            result.points[name].append(bench.Point(size, times))
+            if min(times) > max_seconds:
+                result.stopped[name] = f"size {size} took {min(times):.1f}s"
+                del running[name]
+        values = list(answers.values())
+        if any(value != values[0] for value in values[1:]):
+            given = ", ".join(f"{name} gave {answer!r}" for name, answer in answers.items())
+            result.disagreements.append(f"size {size}: {given}")
+        if not running:
+            break
+    return result
+
+
+def report(races: t.Sequence[Race]) -> str:
+    lines = [f"{'problem':<30} {'variant':<10} timings"]
+    for r in races:
+        for n, (name, points) in enumerate(r.points.items()):
+            timings = "  ".join(f"{p.size}:{bench.duration(p.best)}" for p in points)
+            lines.append(f"{r.problem if n == 0 else '':<30} {name:<10} {timings}")
+            if name in r.stopped:
+                lines.append(f"{'':<41}stopped at {r.stopped[name]}")
+        points = ", ".join(f"{name} from {size}" for size, name in r.crossovers())
+        lines.append(f"{'':<30} {'fastest':<10} {points or '-'}")
+        if r.drifted:
+            declared = ", ".join(f"{name} from {size}" for size, name in r.declared)
+            lines.append(f"{'':<30} {'declared':<10} {declared}, not what this host measures")
+        lines.extend(f"{'':<30} DISAGREE   {d}" for d in r.disagreements)
+    return "\n".join(lines)
+
+
+def dump(races: t.Sequence[Race], path: str):
+    with open(path, "w") as f:
+        json.dump([r.as_dict() for r in races], f, indent=2)
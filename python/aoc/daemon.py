@@ -0,0 +1,311 @@
+"""
+A long lived solver daemon, so repeated runs only pay for solving.
+
+`Server` starts a pool of worker processes which import every solver (and the dependencies
+they load lazily) once, then keep them, along with pickles of every parsed input they have
+seen, for as long as the daemon runs. It listens on a Unix socket for JSON lines:
+
+    {"id": 1, "op": "solve", "year": 2021, "day": 19, "part": "tasks"}
+    {"id": 2, "op": "solve", "year": 2021, "day": 1, "part": "part_one", "input": "199\\n200"}
+    {"id": 3, "op": "jobs", "years": [2021], "days": [1, 2]}
+    {"id": 4, "op": "ping"}
+    {"id": 5, "op": "shutdown"}
+
+and answers each with one line carrying the same id. Requests on one connection are handled
+concurrently and answered as they finish, so a client can submit a whole suite at once.
+Without "input" the daemon reads the input store it was started with.
+
+`Client` is the other end, used by `python -m aoc run --daemon`.
+"""
+import asyncio
+import concurrent.futures
+import contextlib
+import json
+import multiprocessing
+import os
+import pathlib
+import socket
+import types
+import typing as t
+
+from aoc import memory, puzzles, runner
+from aoc.puzzles import Puzzle
+
+DEFAULT_SOCKET = pathlib.Path(
+    os.environ.get("AOC_SOCKET", puzzles.ROOT.parent / ".aoc" / "daemon.sock")
+)
+
+# the runner.solve options a client may set, any other is refused
+OPTIONS = {
+    "use_cache",
+    "cache_dir",
+    "cache_size",
+    "track_memory",
+    "memory_budget",
+    "profile",
+    "profile_dir",
+    "sample_interval",
+}
+
+# parsed inputs pickled by this worker process, see runner.parse
+_memo: t.Dict[str, bytes] = {}
+
+
+class DaemonError(Exception):
+    pass
+
+
+def warm(selected: t.List[Puzzle]):
+    """Import every solver, and whatever each one imports lazily. Runs in every worker."""
+    for puzzle in selected:
+        try:
+            module = puzzles.load(puzzle)
+        except Exception:
+            # the solve request will report it
+            continue
+        for value in list(vars(module).values()):
+            if isinstance(value, types.ModuleType):
+                # attribute access is what makes a lazily imported module load
+                getattr(value, "__name__", None)
+
+
+def ping() -> int:
+    return os.getpid()
+
+
+def solve(
+    puzzle: Puzzle, part: str, data: t.Optional[str], store: t.Optional[str], options: t.Dict
+) -> runner.Result:
+    return runner.solve(puzzle, part, data, store, memo=_memo, **options)
+
+
+def jsonable(value: t.Any) -> t.Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [jsonable(v) for v in value]
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def encode(result: runner.Result) -> t.Dict[str, t.Any]:
+    return {
+        "year": result.puzzle.year,
+        "day": result.puzzle.day,
+        "part": result.part,
+        "answer": jsonable(result.answer),
+        "wall": result.wall,
+        "cpu": result.cpu,
+        "peak": result.peak,
+        "traced": result.traced,
+        "sites": [[s.location, s.size, s.count] for s in result.sites],
+        "parse": result.parse,
+        "parse_cached": result.parse_cached,
+        "cached": result.cached,
+        "input_hash": result.input_hash,
+        "error": result.error,
+    }
+
+
+def decode(payload: t.Dict[str, t.Any]) -> runner.Result:
+    return runner.Result(
+        Puzzle(payload["year"], payload["day"]),
+        payload["part"],
+        answer=payload["answer"],
+        wall=payload["wall"],
+        cpu=payload["cpu"],
+        peak=payload["peak"],
+        traced=payload["traced"],
+        sites=[memory.Site(*site) for site in payload["sites"]],
+        input_hash=payload["input_hash"],
+        cached=payload["cached"],
+        parse=payload["parse"],
+        parse_cached=payload["parse_cached"],
+        error=payload["error"],
+    )
+
+
+class Server:
+    def __init__(
+        self,
+        path: t.Union[str, pathlib.Path, None] = None,
+        workers: t.Optional[int] = None,
+        store: t.Optional[str] = None,
+        selected: t.Optional[t.List[Puzzle]] = None,
+    ):
+        self.path = pathlib.Path(path or DEFAULT_SOCKET)
+        self.workers = workers or os.cpu_count() or 1
+        self.store = store
+        self.selected = selected if selected is not None else puzzles.discover()
+        self.stopping: t.Optional[asyncio.Event] = None
+        self.pool: t.Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    async def serve(self):
+        if self.path.exists():
+            if alive(self.path):
+                raise DaemonError(f"a daemon is already listening on {self.path}")
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=warm,
+            initargs=(self.selected,),
+        )
+        try:
+            # submitting one job per worker starts them all, so they warm up before any request
+            pids = await asyncio.gather(
+                *(loop.run_in_executor(self.pool, ping) for _ in range(self.workers))
+            )
+            # the parent answers "jobs" requests, which needs the modules too
+            warm(self.selected)
+            server = await asyncio.start_unix_server(self.handle, path=str(self.path))
+            print(f"listening on {self.path} with {len(set(pids))} warm workers", flush=True)
+            async with server:
+                await self.stopping.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        pending = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self.respond(line, writer, lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock):
+        request: t.Dict[str, t.Any] = {}
+        try:
+            request = json.loads(line)
+            response = await self.dispatch(request)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        response["id"] = request.get("id")
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def dispatch(self, request: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        op = request.get("op", "solve")
+        if op == "ping":
+            return {"pid": os.getpid(), "workers": self.workers}
+        if op == "shutdown":
+            self.stopping.set()
+            return {}
+        if op == "jobs":
+            selected = puzzles.discover(request.get("years"), request.get("days"))
+            return {"jobs": [[p.year, p.day, part] for p, part in runner.jobs(selected)]}
+        if op == "solve":
+            options = request.get("options", {})
+            unknown = sorted(set(options) - OPTIONS)
+            if unknown:
+                raise ValueError(f"unknown options {', '.join(unknown)}")
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.pool,
+                solve,
+                Puzzle(request["year"], request["day"]),
+                request["part"],
+                request.get("input"),
+                self.store,
+                options,
+            )
+            return encode(result)
+        raise ValueError(f"unknown op {op!r}")
+
+
+def alive(path: t.Union[str, pathlib.Path]) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+class Client:
+    def __init__(self, path: t.Union[str, pathlib.Path, None] = None):
+        self.path = pathlib.Path(path or DEFAULT_SOCKET)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(str(self.path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            self.socket.close()
+            raise DaemonError(
+                f"no daemon on {self.path}, start one with `python -m aoc daemon start`"
+            ) from None
+        self.file = self.socket.makefile("rwb")
+        self.next_id = 0
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, op: str, **fields: t.Any) -> int:
+        self.next_id += 1
+        self.file.write(json.dumps({"id": self.next_id, "op": op, **fields}).encode() + b"\n")
+        return self.next_id
+
+    def receive(self) -> t.Dict[str, t.Any]:
+        line = self.file.readline()
+        if not line:
+            raise DaemonError("the daemon closed the connection")
+        return json.loads(line)
+
+    def request(self, op: str, **fields: t.Any) -> t.Dict[str, t.Any]:
+        self.send(op, **fields)
+        self.file.flush()
+        response = self.receive()
+        if set(response) == {"id", "error"}:
+            raise DaemonError(response["error"])
+        return response
+
+    def jobs(
+        self, years: t.Optional[t.List[int]] = None, days: t.Optional[t.List[int]] = None
+    ) -> t.List[t.Tuple[Puzzle, str]]:
+        response = self.request("jobs", years=years, days=days)
+        return [(Puzzle(year, day), part) for year, day, part in response["jobs"]]
+
+    def solve(
+        self, year: int, day: int, part: str, data: t.Optional[str] = None, **options: t.Any
+    ) -> runner.Result:
+        fields = {"input": data} if data is not None else {}
+        return decode(
+            self.request("solve", year=year, day=day, part=part, options=options, **fields)
+        )
+
+    def solve_all(
+        self, jobs: t.Sequence[t.Tuple[Puzzle, str]], **options: t.Any
+    ) -> t.List[runner.Result]:
+        """Submit every job at once and return the results in the same order."""
+        ids = {
+            self.send("solve", year=p.year, day=p.day, part=part, options=options): n
+            for n, (p, part) in enumerate(jobs)
+        }
+        self.file.flush()
+        results: t.List[t.Optional[runner.Result]] = [None] * len(jobs)
+        for _ in jobs:
+            response = self.receive()
+            if set(response) == {"id", "error"}:
+                raise DaemonError(response["error"])
+            results[ids[response["id"]]] = decode(response)
+        return t.cast(t.List[runner.Result], results)
@@ -0,0 +1,842 @@
+"""
+Synthetic puzzle inputs of any size, for load testing the solvers.
+
+Every generator takes a `size` knob and a seeded `random.Random` and returns the input text
+exactly as adventofcode.com would serve it. `size` is the puzzle's natural n, noted on each
+generator: the number of lines, records or items, or the side length for square grids. Inputs
+are always valid, i.e. they have the unique structure each puzzle promises (a pair summing to
+2020, a single corrupted instruction, coprime bus ids, ...), so the solvers answer rather than
+fail, however big they get.
+
+    python -m aoc generate 2021 15 --size 10000 --seed 1 > big.txt
+"""
+import itertools
+import random
+import string
+import typing as t
+
+Generator = t.Callable[[int, random.Random], str]
+
+_generators: t.Dict[t.Tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int) -> t.Callable[[Generator], Generator]:
+    def register(func: Generator) -> Generator:
+        _generators[(year, day)] = func
+        return func
+
+    return register
+
+
+def available() -> t.List[t.Tuple[int, int]]:
+    return sorted(_generators)
+
+
+def generate(year: int, day: int, size: int, seed: int = 0) -> str:
+    try:
+        func = _generators[(year, day)]
+    except KeyError:
+        raise LookupError(f"No generator for {year} day {day}") from None
+    if size < 1:
+        raise ValueError("size must be positive")
+    return func(size, random.Random(seed))
+
+
+# helpers
+
+
+def _digit_table(weights: t.Dict[str, int]) -> bytes:
+    """A bytes.translate table that maps random bytes onto characters in proportion to weights"""
+    chars = "".join(char * weight for char, weight in weights.items())
+    return bytes(ord(chars[i * len(chars) // 256]) for i in range(256))
+
+
+def _grid(rng: random.Random, width: int, height: int, table: bytes) -> str:
+    # randbytes + translate keeps 10k x 10k grids to a few seconds
+    return "\n".join(rng.randbytes(width).translate(table).decode() for _ in range(height))
+
+
+def _name(n: int, alphabet: str = string.ascii_lowercase) -> str:
+    """Digit free, unique names: a, b, ..., z, ba, bb, ..."""
+    name = ""
+    while True:
+        n, r = divmod(n, len(alphabet))
+        name = alphabet[r] + name
+        if not n:
+            return name
+
+
+def _signed(n: int) -> str:
+    return f"{n:+d}"
+
+
+# 2020
+
+
+@generator(2020, 1)
+def expenses(size: int, rng: random.Random) -> str:
+    """size: expense entries. Exactly one pair and one triple sum to 2020."""
+    if size < 5:
+        raise ValueError("need at least 5 expenses")
+    pair = rng.randint(21, 1000)
+    a = rng.randint(1, 500)
+    b = rng.randint(a + 1, 1009 - a)
+    triple = (a, b, 2020 - a - b)
+    numbers = [pair, 2020 - pair, *triple]
+
+    def ambiguous() -> bool:
+        # the planted values must not combine into a second answer
+        pairs = [c for c in itertools.combinations(numbers, 2) if sum(c) == 2020]
+        triples = [c for c in itertools.combinations(numbers, 3) if sum(c) == 2020]
+        return len(pairs) > 1 or len(triples) > 1
+
+    while ambiguous():
+        pair = rng.randint(21, 1000)
+        numbers[:2] = [pair, 2020 - pair]
+    # filler can't take part in any sum
+    numbers += [rng.randint(2021, 10 ** 6) for _ in range(size - len(numbers))]
+    rng.shuffle(numbers)
+    return "\n".join(map(str, numbers))
+
+
+@generator(2020, 2)
+def policies(size: int, rng: random.Random) -> str:
+    """size: password policy lines"""
+    lines = []
+    for _ in range(size):
+        low = rng.randint(1, 10)
+        high = rng.randint(low + 1, 20)
+        letter = rng.choice(string.ascii_lowercase[:8])
+        password = "".join(rng.choices(string.ascii_lowercase[:8], k=rng.randint(high, high + 6)))
+        lines.append(f"{low}-{high} {letter}: {password}")
+    return "\n".join(lines)
+
+
+@generator(2020, 3)
+def treemap(size: int, rng: random.Random) -> str:
+    """size: rows of a 31 column slope"""
+    return _grid(rng, 31, size, _digit_table({".": 4, "#": 1}))
+
+
+@generator(2020, 4)
+def passports(size: int, rng: random.Random) -> str:
+    """size: passport records, with a mix of missing and invalid fields"""
+    valid = {
+        "byr": lambda: str(rng.randint(1920, 2002)),
+        "iyr": lambda: str(rng.randint(2010, 2020)),
+        "eyr": lambda: str(rng.randint(2020, 2030)),
+        "hgt": lambda: rng.choice([f"{rng.randint(150, 193)}cm", f"{rng.randint(59, 76)}in"]),
+        "hcl": lambda: "#" + "".join(rng.choices("0123456789abcdef", k=6)),
+        "ecl": lambda: rng.choice(["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]),
+        "pid": lambda: "".join(rng.choices(string.digits, k=9)),
+        "cid": lambda: str(rng.randint(1, 350)),
+    }
+    invalid = {
+        "byr": lambda: str(rng.randint(1800, 1919)),
+        "iyr": lambda: str(rng.randint(2021, 2040)),
+        "eyr": lambda: str(rng.randint(2031, 2040)),
+        "hgt": lambda: rng.choice([f"{rng.randint(100, 149)}cm", f"{rng.randint(77, 99)}", "70"]),
+        "hcl": lambda: "".join(rng.choices("0123456789abcdef", k=6)),
+        "ecl": lambda: rng.choice(["zzz", "xry", "#123abc"]),
+        "pid": lambda: "".join(rng.choices(string.digits, k=rng.choice([8, 10]))),
+        "cid": lambda: str(rng.randint(1, 350)),
+    }
+    records = []
+    for _ in range(size):
+        fields = [f for f in valid if rng.random() > 0.05]
+        kind = rng.random()
+        tokens = [
+            f"{f}:{(invalid if kind < 0.2 and rng.random() < 0.3 else valid)[f]()}" for f in fields
+        ]
+        rng.shuffle(tokens)
+        record = tokens[0]
+        for token in tokens[1:]:
+            record += rng.choice(" \n") + token
+        records.append(record)
+    return "\n\n".join(records)
+
+
+@generator(2020, 5)
+def boarding_passes(size: int, rng: random.Random) -> str:
+    """
+    size: boarding passes. Seat ids are a contiguous run with exactly one gap, using more row
+    bits than the real ten when there are more than 1000 passes.
+    """
+    bits = max(10, (size + 8).bit_length() + 1)
+    start = rng.randint(1, (1 << bits) - size - 3)
+    seats = list(range(start, start + size + 1))
+    seats.remove(rng.choice(seats[1:-1]))
+    rng.shuffle(seats)
+    row = str.maketrans("01", "FB")
+    column = str.maketrans("01", "LR")
+    passes = []
+    for seat in seats:
+        code = format(seat, f"0{bits}b")
+        passes.append(code[:-3].translate(row) + code[-3:].translate(column))
+    return "\n".join(passes)
+
+
+@generator(2020, 6)
+def customs(size: int, rng: random.Random) -> str:
+    """size: groups of 1-5 people"""
+    groups = []
+    for _ in range(size):
+        people = [
+            "".join(rng.sample(string.ascii_lowercase, rng.randint(1, 26)))
+            for _ in range(rng.randint(1, 5))
+        ]
+        groups.append("\n".join(people))
+    return "\n\n".join(groups)
+
+
+@generator(2020, 7)
+def bag_rules(size: int, rng: random.Random) -> str:
+    """size: bag colours, at least 3. The rules form a DAG with shiny gold near the top."""
+    if size < 3:
+        raise ValueError("need at least 3 colours")
+    colours = ["clear", "dark", "dim", "drab", "faded", "light", "muted", "pale", "plaid", "wavy"]
+    names = [f"{_name(n)} {colours[n % len(colours)]}" for n in range(size - 1)]
+    gold = rng.randint(1, max(1, len(names) // 2))
+    names.insert(gold, "shiny gold")
+    lines = []
+    for i, outer in enumerate(names):
+        later = range(i + 1, len(names))
+        inside = rng.sample(later, min(len(later), rng.randint(0, 4)))
+        # shiny gold has to be in the graph, so it holds and is held by something
+        if i == gold - 1 and gold not in inside:
+            inside.append(gold)
+        if i == gold and not inside and later:
+            inside.append(rng.choice(later))
+        if not inside:
+            lines.append(f"{outer} bags contain no other bags.")
+            continue
+        counts = [rng.randint(1, 5) for _ in inside]
+        contents = ", ".join(
+            f"{n} {names[j]} {'bag' if n == 1 else 'bags'}" for j, n in zip(inside, counts)
+        )
+        lines.append(f"{outer} bags contain {contents}.")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+@generator(2020, 8)
+def handheld(size: int, rng: random.Random) -> str:
+    """
+    size: instructions. A straight run of acc/nop with forward jmps over dead regions of
+    backward jmps, so exactly one corrupted jmp turned nop sends the program into a loop.
+    """
+    program: t.List[t.Tuple[str, int]] = []
+    live_jumps = []
+    while len(program) < size:
+        for _ in range(rng.randint(1, 5)):
+            if rng.random() < 0.6:
+                program.append(("acc", rng.randint(-50, 50)))
+            else:
+                # flipping any live nop to jmp lands on an instruction already executed
+                program.append(("nop", -rng.randint(0, len(program))))
+        if len(program) + 3 >= size:
+            break
+        dead = rng.randint(2, 3)
+        live_jumps.append(len(program))
+        program.append(("jmp", dead + 1))
+        for _ in range(dead):
+            target = rng.randint(0, live_jumps[-1])
+            program.append(("jmp", target - len(program)))
+    if not live_jumps:
+        raise ValueError("size is too small for a corrupted jmp")
+    corrupt = rng.choice(live_jumps)
+    program[corrupt] = ("nop", program[corrupt][1])
+    return "\n".join(f"{op} {_signed(num)}" for op, num in program)
+
+
+@generator(2020, 9)
+def xmas(size: int, rng: random.Random) -> str:
+    """
+    size: numbers after the 25 number preamble. Every number is the sum of two of the 25
+    before it, except one near the end which is instead the sum of a contiguous run. The
+    numbers grow exponentially with size, as the puzzle rules imply.
+    """
+    data = rng.sample(range(1, 60), 25)
+    invalid_at = 25 + max(0, size - 1 - rng.randint(0, size // 10))
+    while len(data) < size + 25:
+        window = data[-25:]
+        if len(data) == invalid_at:
+            sums = {a + b for a, b in itertools.combinations(window, 2)}
+            while True:
+                start = rng.randint(0, len(data) - 27)
+                candidate = sum(data[start : start + rng.randint(2, 17)])
+                if candidate not in sums and candidate not in data:
+                    data.append(candidate)
+                    break
+        else:
+            a, b = rng.sample(window, 2)
+            if a + b not in window:
+                data.append(a + b)
+    return "\n".join(map(str, data))
+
+
+@generator(2020, 10)
+def adapters(size: int, rng: random.Random) -> str:
+    """size: adapters, each 1 or 3 jolts above the previous"""
+    jolt = 0
+    jolts = []
+    for _ in range(size):
+        jolt += rng.choice((1, 1, 1, 3))
+        jolts.append(jolt)
+    rng.shuffle(jolts)
+    return "\n".join(map(str, jolts))
+
+
+@generator(2020, 11)
+def seat_layout(size: int, rng: random.Random) -> str:
+    """size: side of a square seat layout"""
+    return _grid(rng, size, size, _digit_table({"L": 3, ".": 1}))
+
+
+@generator(2020, 12)
+def navigation(size: int, rng: random.Random) -> str:
+    """size: navigation instructions"""
+    lines = []
+    for _ in range(size):
+        action = rng.choice("NESWLRFF")
+        units = rng.choice((90, 180, 270)) if action in "LR" else rng.randint(1, 100)
+        lines.append(f"{action}{units}")
+    return "\n".join(lines)
+
+
+def _primes(count: int, above: int) -> t.List[int]:
+    primes: t.List[int] = []
+    n = above
+    while len(primes) < count:
+        n += 1
+        if all(n % d for d in range(2, int(n ** 0.5) + 1)):
+            primes.append(n)
+    return primes
+
+
+@generator(2020, 13)
+def shuttle(size: int, rng: random.Random) -> str:
+    """size: buses in service. Ids are distinct primes so the schedule is always solvable."""
+    buses = _primes(size, 10)
+    rng.shuffle(buses)
+    slots = ["x"] * (size * rng.randint(2, 8))
+    # like the real schedules, the first bus leaves at offset 0
+    for position, bus in zip([0] + rng.sample(range(1, len(slots)), size - 1), buses):
+        slots[position] = str(bus)
+    return f"{rng.randint(10 ** 5, 10 ** 7)}\n{','.join(slots)}"
+
+
+@generator(2020, 14)
+def docking(size: int, rng: random.Random) -> str:
+    """size: program lines. Masks float at most nine bits, like the real puzzle."""
+    lines = []
+    while len(lines) < size:
+        mask = rng.choices("01", k=36)
+        for position in rng.sample(range(36), rng.randint(0, 9)):
+            mask[position] = "X"
+        lines.append(f"mask = {''.join(mask)}")
+        for _ in range(min(rng.randint(1, 8), size - len(lines))):
+            lines.append(f"mem[{rng.randint(0, 65535)}] = {rng.randint(0, 2 ** 36 - 1)}")
+    return "\n".join(lines)
+
+
+@generator(2020, 15)
+def starting_numbers(size: int, rng: random.Random) -> str:
+    """
+    size: starting numbers. The work is driven by the fixed turn targets, so this only
+    scales the setup. Numbers must be below the part one target of 2020.
+    """
+    if size > 2020:
+        raise ValueError("at most 2020 distinct starting numbers fit below turn 2020")
+    return ",".join(map(str, rng.sample(range(2020), size)))
+
+
+@generator(2020, 16)
+def tickets(size: int, rng: random.Random) -> str:
+    """
+    size: nearby tickets, about a fifth of them invalid.
+
+    Field i accepts values from value classes 0..i (split into two ranges), and the column for
+    field i only holds values from class i, so field i has exactly i + 1 candidate columns and
+    elimination from the smallest always succeeds.
+    """
+    fields = 20
+    width = 20
+    names = [
+        f"departure {p}" for p in ("location", "station", "platform", "track", "date", "time")
+    ]
+    names += [f"arrival {p}" for p in ("location", "station", "platform", "track")]
+    names += [
+        "class",
+        "duration",
+        "price",
+        "route",
+        "row",
+        "seat",
+        "train",
+        "type",
+        "wagon",
+        "zone",
+    ]
+    rng.shuffle(names)
+
+    centre = 500
+    classes = []
+    low = high = centre
+    for i in range(fields):
+        if i % 2:
+            classes.append((low - width, low - 1))
+            low -= width
+        else:
+            classes.append((high, high + width - 1))
+            high += width
+    rules = []
+    for i, name in enumerate(names):
+        lo = min(classes[j][0] for j in range(i + 1))
+        hi = max(classes[j][1] for j in range(i + 1))
+        split = rng.randint(lo, hi - 1)
+        rules.append(f"{name}: {lo}-{split} or {split + 1}-{hi}")
+    rng.shuffle(rules)
+
+    column_class = list(range(fields))
+    rng.shuffle(column_class)
+
+    def ticket(invalid: bool) -> str:
+        values = [rng.randint(*classes[c]) for c in column_class]
+        if invalid:
+            values[rng.randrange(fields)] = rng.choice(
+                [rng.randint(0, low - 1), rng.randint(high, 999)]
+            )
+        return ",".join(map(str, values))
+
+    nearby = [ticket(rng.random() < 0.2) for _ in range(size)]
+    return "\n".join(rules + ["", "your ticket:", ticket(False), "", "nearby tickets:"] + nearby)
+
+
+# 2021
+
+
+@generator(2021, 1)
+def depths(size: int, rng: random.Random) -> str:
+    """size: sonar depths, a random walk"""
+    depth = rng.randint(100, 200)
+    readings = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 15))
+        readings.append(depth)
+    return "\n".join(map(str, readings))
+
+
+@generator(2021, 2)
+def course(size: int, rng: random.Random) -> str:
+    """size: commands"""
+    return "\n".join(
+        f"{rng.choice(('forward', 'forward', 'down', 'up'))} {rng.randint(1, 9)}"
+        for _ in range(size)
+    )
+
+
+def _diagnostic_filters_to_one(rows: t.List[str], keep_most: bool) -> bool:
+    for position in range(len(rows[0])):
+        ones = sum(row[position] == "1" for row in rows)
+        most = "1" if ones * 2 >= len(rows) else "0"
+        digit = most if keep_most else "01"[most == "0"]
+        rows = [row for row in rows if row[position] == digit]
+        if len(rows) <= 1:
+            return len(rows) == 1
+    return False
+
+
+@generator(2021, 3)
+def diagnostic(size: int, rng: random.Random) -> str:
+    """size: distinct binary report lines, at least 12 bits wide"""
+    width = max(12, size.bit_length() + 2)
+    while True:
+        rows = [format(n, f"0{width}b") for n in rng.sample(range(1 << width), size)]
+        # both ratings must whittle down to a single row
+        if _diagnostic_filters_to_one(rows, True) and _diagnostic_filters_to_one(rows, False):
+            return "\n".join(rows)
+
+
+@generator(2021, 4)
+def bingo(size: int, rng: random.Random) -> str:
+    """size: boards. Every number gets drawn, so every board eventually wins."""
+    pool = list(range(max(100, size)))
+    draws = pool[:]
+    rng.shuffle(draws)
+    boards = []
+    for _ in range(size):
+        numbers = rng.sample(pool, 25)
+        boards.append(
+            "\n".join(" ".join(f"{n:>2}" for n in numbers[r * 5 : r * 5 + 5]) for r in range(5))
+        )
+    return ",".join(map(str, draws)) + "\n\n" + "\n\n".join(boards)
+
+
+@generator(2021, 5)
+def vents(size: int, rng: random.Random) -> str:
+    """size: vent lines, horizontal, vertical or diagonal on a 1000 x 1000 floor"""
+    lines = []
+    for _ in range(size):
+        x1, y1 = rng.randint(0, 999), rng.randint(0, 999)
+        length = rng.randint(1, 200)
+        dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1), (-1, -1), (-1, 1)])
+        length = min(
+            length,
+            999 - x1 if dx > 0 else x1 if dx < 0 else length,
+            999 - y1 if dy > 0 else y1 if dy < 0 else length,
+        )
+        lines.append(f"{x1},{y1} -> {x1 + dx * length},{y1 + dy * length}")
+    return "\n".join(lines)
+
+
+@generator(2021, 6)
+def lanternfish(size: int, rng: random.Random) -> str:
+    """size: fish"""
+    return ",".join(str(rng.randint(1, 5)) for _ in range(size))
+
+
+@generator(2021, 7)
+def crabs(size: int, rng: random.Random) -> str:
+    """size: crabs, kept within the 10,000 fuel cost table"""
+    return ",".join(str(min(1999, int(rng.expovariate(1 / 400)))) for _ in range(size))
+
+
+@generator(2021, 8)
+def seven_segment(size: int, rng: random.Random) -> str:
+    """size: displays, each with its own wiring"""
+    digits = [
+        "abcefg",
+        "cf",
+        "acdeg",
+        "acdfg",
+        "bcdf",
+        "abdfg",
+        "abdefg",
+        "acf",
+        "abcdefg",
+        "abcdfg",
+    ]
+    lines = []
+    for _ in range(size):
+        wires = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit: str) -> str:
+            return "".join(rng.sample([wires[c] for c in digit], len(digit)))
+
+        patterns = [scramble(d) for d in rng.sample(digits, 10)]
+        output = [scramble(rng.choice(digits)) for _ in range(4)]
+        lines.append(f"{' '.join(patterns)} | {' '.join(output)}")
+    return "\n".join(lines)
+
+
+@generator(2021, 9)
+def heightmap(size: int, rng: random.Random) -> str:
+    """
+    size: side of a square height map. Half the cells are 9s, which keeps basins below the
+    percolation threshold and so finite, as in the real puzzle.
+    """
+    weights = {str(d): 1 for d in range(9)}
+    weights["9"] = 9
+    return _grid(rng, size, size, _digit_table(weights))
+
+
+def _octopuses_synchronise(lines: t.List[str], steps: int = 1000) -> bool:
+    values = [[int(c) for c in line] for line in lines]
+    rows, cols = len(values), len(values[0])
+    for _ in range(steps):
+        flashing = []
+        for r in range(rows):
+            for c in range(cols):
+                values[r][c] += 1
+                if values[r][c] > 9:
+                    flashing.append((r, c))
+        flashed = set()
+        while flashing:
+            r, c = flashing.pop()
+            if (r, c) in flashed:
+                continue
+            flashed.add((r, c))
+            for nr in range(max(0, r - 1), min(rows, r + 2)):
+                for nc in range(max(0, c - 1), min(cols, c + 2)):
+                    values[nr][nc] += 1
+                    if values[nr][nc] > 9:
+                        flashing.append((nr, nc))
+        for r, c in flashed:
+            values[r][c] = 0
+        if len(flashed) == rows * cols:
+            return True
+    return False
+
+
+@generator(2021, 11)
+def octopuses(size: int, rng: random.Random) -> str:
+    """
+    size: side of a square grid. Energy levels are drawn from 5-9: uniform 0-9 grids larger
+    than 10 x 10 usually never flash in unison, which part two needs. Grids up to 100 x 100
+    are checked and redrawn; bigger ones synchronise in practice within a few dozen steps.
+    """
+    table = _digit_table({d: 1 for d in "56789"})
+    while True:
+        lines = _grid(rng, size, size, table).splitlines()
+        if size > 100 or _octopuses_synchronise(lines):
+            return "\n".join(lines)
+
+
+@generator(2021, 10)
+def navigation_subsystem(size: int, rng: random.Random) -> str:
+    """size: lines, roughly half corrupted and half incomplete"""
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    lines = []
+    for i in range(size):
+        stack: t.List[str] = []
+        chars = []
+        length = rng.randint(20, 110)
+        corrupt_at = rng.randint(length // 2, length) if i % 2 else -1
+        for n in range(length):
+            if stack and n >= corrupt_at >= 0:
+                # close with the wrong bracket, then carry on
+                chars.append(rng.choice([c for c in pairs.values() if c != pairs[stack[-1]]]))
+                corrupt_at = -1
+            elif stack and rng.random() < 0.45:
+                chars.append(pairs[stack.pop()])
+            else:
+                stack.append(rng.choice("([{<"))
+                chars.append(stack[-1])
+        if not stack:
+            chars.append(rng.choice("([{<"))
+        lines.append("".join(chars))
+    return "\n".join(lines)
+
+
+@generator(2021, 12)
+def caves(size: int, rng: random.Random) -> str:
+    """
+    size: small caves. Big caves are never joined to each other, otherwise the number of
+    paths would be infinite. The path count grows exponentially with size.
+    """
+    names = (_name(n) for n in itertools.count(26))
+    small = ["start", "end"]
+    small += itertools.islice((name for name in names if name not in small), size)
+    big = [_name(n, string.ascii_uppercase) for n in range(max(1, size // 3))]
+    edges = set()
+    for cave in small[2:]:
+        other = rng.choice(small[2:] + big)
+        if other != cave:
+            edges.add(tuple(sorted((cave, other))))
+    for cave in big:
+        for other in rng.sample(small, min(3, len(small))):
+            edges.add((cave, other))
+    edges.add(("start", rng.choice(small[2:] + big)))
+    edges.add((rng.choice(small[2:] + big), "end"))
+    lines = [f"{a}-{b}" for a, b in edges]
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+@generator(2021, 13)
+def origami(size: int, rng: random.Random) -> str:
+    """
+    size: dots. A 40 x 6 message is unfolded, alternating axes, until the paper has room for
+    the dots, and the folds are listed in the order that folds it back up.
+    """
+    width, height = 40, 6
+    unfolds = []
+    while width * height < 4 * size or len(unfolds) < 2:
+        if len(unfolds) % 2:
+            unfolds.append(("y", height))
+            height = 2 * height + 1
+        else:
+            unfolds.append(("x", width))
+            width = 2 * width + 1
+    dots = set()
+    while len(dots) < size:
+        x, y = rng.randrange(width), rng.randrange(height)
+        # dots can't sit on a fold line
+        if any(
+            (axis == "x" and x == line) or (axis == "y" and y == line) for axis, line in unfolds
+        ):
+            continue
+        dots.add((x, y))
+    lines = [f"{x},{y}" for x, y in dots]
+    rng.shuffle(lines)
+    folds = [f"fold along {axis}={line}" for axis, line in reversed(unfolds)]
+    return "\n".join(lines) + "\n\n" + "\n".join(folds)
+
+
+@generator(2021, 14)
+def polymer(size: int, rng: random.Random) -> str:
+    """size: template length. Every pair of the ten elements has a rule."""
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choices(elements, k=max(2, size)))
+    rules = [f"{a}{b} -> {rng.choice(elements)}" for a in elements for b in elements]
+    rng.shuffle(rules)
+    return template + "\n\n" + "\n".join(rules)
+
+
+@generator(2021, 15)
+def chiton(size: int, rng: random.Random) -> str:
+    """size: side of a square risk map"""
+    return _grid(rng, size, size, _digit_table({str(d): 1 for d in range(1, 10)}))
+
+
+def _bits_packet(rng: random.Random, budget: int, depth: int) -> t.Tuple[str, int]:
+    """Returns the bits of a packet holding `budget` literals, and the literals used."""
+    version = format(rng.randrange(8), "03b")
+    if budget == 1 or depth > 12:
+        value = rng.randrange(1 << rng.randint(1, 24))
+        nibbles = format(value, "b")
+        nibbles = nibbles.zfill(-(-len(nibbles) // 4) * 4)
+        groups = [nibbles[i : i + 4] for i in range(0, len(nibbles), 4)]
+        body = "".join(("1" if i < len(groups) - 1 else "0") + g for i, g in enumerate(groups))
+        return version + "100" + body, 1
+    if rng.random() < 0.2:
+        # comparisons always have exactly two sub-packets
+        type_id = rng.choice((5, 6, 7))
+        count = 2
+    else:
+        type_id = rng.choice((0, 1, 2, 3))
+        count = rng.randint(2, min(budget, 8))
+    cuts = sorted(rng.sample(range(1, budget), count - 1))
+    shares = [b - a for a, b in zip([0] + cuts, cuts + [budget])]
+    children = [_bits_packet(rng, share, depth + 1) for share in shares]
+    payload = "".join(bits for bits, _ in children)
+    if rng.random() < 0.5 and len(payload) < 1 << 15:
+        header = "0" + format(len(payload), "015b")
+    else:
+        header = "1" + format(len(children), "011b")
+    return version + format(type_id, "03b") + header + payload, sum(n for _, n in children)
+
+
+@generator(2021, 16)
+def bits_transmission(size: int, rng: random.Random) -> str:
+    """size: literal values in one nested transmission"""
+    bits, _ = _bits_packet(rng, size, 0)
+    bits += "0" * (-len(bits) % 4)
+    return format(int(bits, 2), "X").zfill(len(bits) // 4)
+
+
+@generator(2021, 17)
+def trick_shot(size: int, rng: random.Random) -> str:
+    """size: distance to the near edge of the target area"""
+    x1 = max(3, size)
+    # make sure some x velocity stalls inside the target, which part one relies on
+    n = 1
+    while n * (n + 1) // 2 < x1:
+        n += 1
+    x2 = max(n * (n + 1) // 2, x1 + rng.randint(5, max(5, size // 5)))
+    y1 = -(size // 3 + rng.randint(10, 50))
+    y2 = y1 + rng.randint(5, max(5, -y1 // 3))
+    return f"target area: x={x1}..{x2}, y={y1}..{y2}"
+
+
+def _snailfish_number(rng: random.Random, depth: int = 0) -> str:
+    parts = []
+    for _ in range(2):
+        if depth < 3 and rng.random() < 0.6:
+            parts.append(_snailfish_number(rng, depth + 1))
+        else:
+            parts.append(str(rng.randint(0, 9)))
+    return f"[{parts[0]},{parts[1]}]"
+
+
+@generator(2021, 18)
+def snailfish(size: int, rng: random.Random) -> str:
+    """size: reduced snailfish numbers"""
+    return "\n".join(_snailfish_number(rng) for _ in range(max(2, size)))
+
+
+def _rotations() -> t.List[t.Tuple[t.Tuple[int, ...], ...]]:
+    found = []
+    for axes in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            matrix = tuple(
+                tuple(signs[r] if c == axes[r] else 0 for c in range(3)) for r in range(3)
+            )
+            (a, b, c), (d, e, f), (g, h, i) = matrix
+            if a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g) == 1:
+                found.append(matrix)
+    return found
+
+
+@generator(2021, 19)
+def scanners(size: int, rng: random.Random) -> str:
+    """
+    size: scanners. Each scanner after the first sits within range of an earlier one, with at
+    least twelve beacons planted in the region they share, so alignment always succeeds.
+    """
+    rotations = _rotations()
+    positions = [(0, 0, 0)]
+    beacons = set()
+
+    def plant(lo: t.Sequence[int], hi: t.Sequence[int], count: int):
+        planted = 0
+        while planted < count:
+            beacon = tuple(rng.randint(lo[a], hi[a]) for a in range(3))
+            if beacon not in beacons:
+                beacons.add(beacon)
+                planted += 1
+
+    plant((-1000,) * 3, (1000,) * 3, 13)
+    for _ in range(size - 1):
+        parent = rng.choice(positions)
+        offset = [rng.randint(-1100, 1100) for _ in range(3)]
+        offset[rng.randrange(3)] = rng.choice((-1, 1)) * rng.randint(1000, 1200)
+        position = tuple(p + o for p, o in zip(parent, offset))
+        shared_lo = [max(p, q) - 1000 for p, q in zip(parent, position)]
+        shared_hi = [min(p, q) + 1000 for p, q in zip(parent, position)]
+        plant(shared_lo, shared_hi, 12)
+        plant([p - 1000 for p in position], [p + 1000 for p in position], 13)
+        positions.append(position)
+
+    reports = []
+    for n, position in enumerate(positions):
+        matrix = rotations[0] if n == 0 else rng.choice(rotations)
+        seen = []
+        for beacon in beacons:
+            relative = [b - p for b, p in zip(beacon, position)]
+            if all(abs(v) <= 1000 for v in relative):
+                seen.append(tuple(sum(m * v for m, v in zip(row, relative)) for row in matrix))
+        rng.shuffle(seen)
+        lines = [f"--- scanner {n} ---"] + [f"{x},{y},{z}" for x, y, z in seen]
+        reports.append("\n".join(lines))
+    return "\n\n".join(reports)
+
+
+@generator(2021, 20)
+def trench_map(size: int, rng: random.Random) -> str:
+    """
+    size: side of a square image. If the algorithm lights dark 3x3 areas it also darkens lit
+    ones, otherwise the infinite image would end up with infinitely many lit pixels.
+    """
+    algorithm = rng.choices("#.", k=512)
+    if algorithm[0] == "#":
+        algorithm[511] = "."
+    image = _grid(rng, size, size, _digit_table({"#": 1, ".": 1}))
+    if "#" not in image:
+        image = "#" + image[1:]
+    return "".join(algorithm) + "\n\n" + image
+
+
+@generator(2021, 21)
+def dirac_dice(size: int, rng: random.Random) -> str:
+    """size: unused, the game is fixed by the two starting positions"""
+    return "\n".join(f"Player {n} starting position: {rng.randint(1, 10)}" for n in (1, 2))
+
+
+@generator(2021, 22)
+def reactor_reboot(size: int, rng: random.Random) -> str:
+    """size: reboot steps. The first twenty stay inside the -50..50 initialization region."""
+    steps = []
+    for n in range(size):
+        if n < 20:
+            bounds = [sorted(rng.randint(-50, 50) for _ in range(2)) for _ in range(3)]
+        else:
+            bounds = []
+            for _ in range(3):
+                lo = rng.randint(-100000, 90000)
+                bounds.append((lo, lo + rng.randint(1000, 50000)))
+        state = "on" if n == 0 or rng.random() < 0.7 else "off"
+        (x1, x2), (y1, y2), (z1, z2) = bounds
+        steps.append(f"{state} x={x1}..{x2},y={y1}..{y2},z={z1}..{z2}")
+    return "\n".join(steps)
@@ -0,0 +1,244 @@
+"""
+Performance history in a local SQLite database.
+
+Every `python -m aoc run` and `python -m aoc bench` records one row in `runs` (when, which
+git commit, whether the tree was dirty) and one row per part in `timings`. `compare` then
+checks the latest timing for each (year, day, part, input) against a rolling baseline of the
+ones before it.
+
+A timing is a regression when it is more than `sigma` standard errors of prediction above the
+baseline mean and at least `min_slowdown` slower, so that parts with very steady timings
+aren't flagged for a few microseconds.
+"""
+import dataclasses
+import datetime
+import math
+import os
+import pathlib
+import platform
+import sqlite3
+import statistics
+import subprocess
+import typing as t
+
+from aoc import puzzles
+
+DEFAULT_PATH = pathlib.Path(
+    os.environ.get("AOC_HISTORY", puzzles.ROOT.parent / ".aoc" / "history.sqlite")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    git_commit TEXT,
+    dirty INTEGER,
+    python TEXT
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    size INTEGER,
+    input_hash TEXT,
+    wall REAL,
+    cpu REAL,
+    peak_memory INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS timings_key ON timings (year, day, part, input_hash, run_id);
+"""
+
+
+@dataclasses.dataclass
+class Timing:
+    year: int
+    day: int
+    part: str
+    input_hash: t.Optional[str]
+    wall: t.Optional[float]
+    cpu: t.Optional[float] = None
+    peak_memory: t.Optional[int] = None
+    size: t.Optional[int] = None
+    error: t.Optional[str] = None
+
+
+@dataclasses.dataclass
+class Regression:
+    year: int
+    day: int
+    part: str
+    size: t.Optional[int]
+    wall: float
+    mean: float
+    stdev: float
+    samples: int
+
+    @property
+    def slowdown(self) -> float:
+        return self.wall / self.mean - 1
+
+    def __str__(self):
+        size = f" size {self.size}" if self.size is not None else ""
+        return (
+            f"{self.year} q{self.day:02d} {self.part}{size}: {self.wall * 1000:.1f}ms vs "
+            f"{self.mean * 1000:.1f}±{self.stdev * 1000:.1f}ms over {self.samples} runs "
+            f"(+{self.slowdown:.0%})"
+        )
+
+
+def git_state() -> t.Tuple[t.Optional[str], t.Optional[bool]]:
+    """The HEAD commit and whether the working tree has changes, or Nones outside git."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=puzzles.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=puzzles.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+class History:
+    def __init__(self, path: t.Union[str, pathlib.Path, None] = None):
+        self.path = pathlib.Path(path or DEFAULT_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, kind: str, timings: t.Iterable[Timing]) -> int:
+        """Store one run and its timings, returning the run id."""
+        commit, dirty = git_state()
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (started, kind, git_commit, dirty, python) VALUES (?,?,?,?,?)",
+                (
+                    datetime.datetime.now().isoformat(timespec="seconds"),
+                    kind,
+                    commit,
+                    dirty,
+                    platform.python_version(),
+                ),
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO timings (run_id, year, day, part, size, input_hash, wall, cpu, "
+                "peak_memory, error) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                [
+                    (
+                        run_id,
+                        x.year,
+                        x.day,
+                        x.part,
+                        x.size,
+                        x.input_hash,
+                        x.wall,
+                        x.cpu,
+                        x.peak_memory,
+                        x.error,
+                    )
+                    for x in timings
+                ],
+            )
+        return run_id
+
+    def runs(self, limit: int = 20) -> t.List[sqlite3.Row]:
+        self.db.row_factory = sqlite3.Row
+        try:
+            return self.db.execute(
+                "SELECT runs.*, COUNT(timings.run_id) AS parts FROM runs "
+                "LEFT JOIN timings ON timings.run_id = runs.id "
+                "GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        finally:
+            self.db.row_factory = None
+
+    def latest_run(self, kind: t.Optional[str] = None) -> t.Optional[int]:
+        if kind:
+            row = self.db.execute("SELECT MAX(id) FROM runs WHERE kind = ?", (kind,)).fetchone()
+        else:
+            row = self.db.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def costs(self, window: int = 5) -> t.Dict[t.Tuple[int, int, str], float]:
+        """
+        Mean wall time of each part over its `window` most recent successful timings from
+        `run`s, on whatever input they used: what the scheduler expects the part to cost.
+        """
+        rows = self.db.execute(
+            "SELECT timings.year, timings.day, timings.part, timings.wall FROM timings "
+            "JOIN runs ON runs.id = timings.run_id WHERE runs.kind = 'run' "
+            "AND timings.error IS NULL AND timings.wall IS NOT NULL "
+            "ORDER BY timings.run_id DESC"
+        )
+        walls: t.Dict[t.Tuple[int, int, str], t.List[float]] = {}
+        for year, day, part, wall in rows:
+            recent = walls.setdefault((year, day, part), [])
+            if len(recent) < window:
+                recent.append(wall)
+        return {key: statistics.fmean(recent) for key, recent in walls.items()}
+
+    def compare(
+        self,
+        run_id: t.Optional[int] = None,
+        window: int = 10,
+        min_samples: int = 3,
+        sigma: float = 3.0,
+        min_slowdown: float = 0.1,
+    ) -> t.List[Regression]:
+        """
+        Check each successful timing in `run_id` (default the latest run) against the `window`
+        most recent successful timings of the same part on the same input from earlier runs.
+        """
+        if run_id is None:
+            run_id = self.latest_run()
+        if run_id is None:
+            return []
+        candidates = self.db.execute(
+            "SELECT year, day, part, size, input_hash, wall FROM timings "
+            "WHERE run_id = ? AND error IS NULL AND wall IS NOT NULL",
+            (run_id,),
+        ).fetchall()
+        regressions = []
+        for year, day, part, size, input_hash, wall in candidates:
+            baseline = [
+                row[0]
+                for row in self.db.execute(
+                    "SELECT wall FROM timings WHERE year = ? AND day = ? AND part = ? "
+                    "AND input_hash IS ? AND run_id < ? AND error IS NULL AND wall IS NOT NULL "
+                    "ORDER BY run_id DESC LIMIT ?",
+                    (year, day, part, input_hash, run_id, window),
+                )
+            ]
+            if len(baseline) < min_samples:
+                continue
+            mean = statistics.fmean(baseline)
+            stdev = statistics.stdev(baseline)
+            # prediction interval for one new observation from the baseline distribution
+            spread = stdev * math.sqrt(1 + 1 / len(baseline))
+            if wall > mean + sigma * spread and wall > mean * (1 + min_slowdown):
+                regressions.append(
+                    Regression(year, day, part, size, wall, mean, stdev, len(baseline))
+                )
+        return regressions
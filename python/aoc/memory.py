@@ -0,0 +1,155 @@
+"""
+Memory accounting for a single part.
+
+`Tracker` runs a part under tracemalloc and reports its peak traced memory along with the
+allocation sites that were holding the most memory near that peak. Snapshots are expensive, so
+rather than taking one per allocation a CPU timer checks the traced total every `interval`
+and only snapshots when it has doubled since the last one. That bounds the snapshot cost at
+about twice that of one snapshot at the peak, and the sites reported come from a heap at least
+half the size of the peak. Only the top sites of each snapshot are kept, since holding on to a
+snapshot would itself count towards the part's memory.
+
+`address_space_limit` turns a memory budget into an RLIMIT_AS for the duration of a part, so
+a runaway part raises MemoryError in its own worker instead of taking the machine into the
+OOM killer.
+"""
+import contextlib
+import dataclasses
+import resource
+import signal
+import tracemalloc
+import typing as t
+
+MB = 2 ** 20
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class Site:
+    location: str
+    size: int
+    count: int
+
+    def __str__(self):
+        return f"{self.size / MB:>8.2f} MB {self.count:>9} blocks  {self.location}"
+
+
+@dataclasses.dataclass
+class Usage:
+    peak: int = 0
+    sites: t.List[Site] = dataclasses.field(default_factory=list)
+
+
+class Tracker:
+    def __init__(self, top: int = 5, interval: float = 0.01):
+        self.top = top
+        self.interval = interval
+        self.peak = 0
+        self.sites: t.List[Site] = []
+        self.threshold = MB
+        self.busy = False
+
+    def check(self, signum: int, frame: t.Any):
+        # a snapshot of a large heap takes longer than the interval, don't nest them
+        if self.busy:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if current < self.threshold:
+            return
+        self.busy = True
+        try:
+            self.peak = max(self.peak, peak)
+            self.sites = self.top_sites(tracemalloc.take_snapshot())
+            self.threshold = current * 2
+            # the snapshot's own allocations aren't the part's
+            tracemalloc.reset_peak()
+        finally:
+            self.busy = False
+
+    def run(self, func: t.Callable, args: t.Tuple) -> t.Tuple[t.Any, Usage]:
+        tracemalloc.start()
+        previous = signal.signal(signal.SIGVTALRM, self.check)
+        signal.setitimer(signal.ITIMER_VIRTUAL, self.interval, self.interval)
+        try:
+            answer = func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+            signal.signal(signal.SIGVTALRM, previous)
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if not self.sites:
+                self.sites = self.top_sites(tracemalloc.take_snapshot())
+            tracemalloc.stop()
+        return answer, Usage(self.peak, self.sites)
+
+    def top_sites(self, snapshot: tracemalloc.Snapshot) -> t.List[Site]:
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+        return [
+            Site(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[: self.top]
+        ]
+
+
+def peak_rss() -> int:
+    """This process's peak resident set size in bytes (Linux reports ru_maxrss in KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_peak_rss():
+    """
+    Restart this process's peak resident set size from its current size, so that a worker
+    reused from part to part reports each part's own peak. Only Linux can, elsewhere this
+    does nothing and the peak carries over.
+    """
+    with contextlib.suppress(OSError):
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+
+
+def address_space() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        return 0
+
+
+@contextlib.contextmanager
+def address_space_limit(budget: t.Optional[int]):
+    """
+    Allow the process twice `budget` more bytes of address space than it has now, as a
+    backstop: address space grows ahead of the memory actually used, so a part a little over
+    budget is left to `check_budget` to report. Does nothing without a budget or where the
+    current size can't be read.
+    """
+    current = address_space() if budget else 0
+    if not current:
+        yield
+        return
+    previous = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + 2 * budget
+    if previous[1] != resource.RLIM_INFINITY:
+        limit = min(limit, previous[1])
+    resource.setrlimit(resource.RLIMIT_AS, (limit, previous[1]))
+    try:
+        yield
+    except MemoryError:
+        raise BudgetExceeded(
+            f"ran out of memory at twice the budget of {budget / MB:.1f} MB"
+        ) from None
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, previous)
+
+
+def check_budget(used: int, budget: t.Optional[int], what: str):
+    if budget and used > budget:
+        raise BudgetExceeded(
+            f"{what} of {used / MB:.1f} MB is over the budget of {budget / MB:.1f} MB"
+        )
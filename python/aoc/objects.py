@@ -0,0 +1,119 @@
+"""
+Micro-benchmarks for the small objects that solvers make by the million: what each one costs
+in memory, and how fast it hashes and compares.
+
+The classes to measure are registered per puzzle in `aoc.samples`, each with a function that
+makes a distinct instance from an int:
+
+    @sampler(2021, 19)
+    def beacons(q19):
+        return {"Beacon": lambda n: q19.Beacon((n, -n, 2 * n))}
+
+`measure` makes `count` of them under tracemalloc, so the memory per object counts the
+instance and everything only it holds (a numpy array, a `__dict__`, boxed fields), but not
+the list holding them. Hashing is timed over all of them and `==` between each and an equal
+copy made separately, so every comparison has to look at every field. A class that can't be
+hashed shows no hash rate.
+
+Write the samples with `--json` before a change and pass that file as `--baseline` after it
+to see the ratio of each figure to the old one.
+"""
+import collections
+import dataclasses
+import json
+import operator
+import time
+import tracemalloc
+import typing as t
+
+from aoc import puzzles, samples
+from aoc.puzzles import Puzzle
+
+
+@dataclasses.dataclass
+class Sample:
+    puzzle: str
+    name: str
+    count: int
+    bytes_per_object: float
+    hashes_per_second: t.Optional[float]
+    comparisons_per_second: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.puzzle} {self.name}"
+
+
+def _rate(function: t.Callable[..., t.Any], *columns: t.List[t.Any], repeats: int) -> float:
+    """Calls per second of `function` over the columns, best of `repeats`, in a C loop."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        collections.deque(map(function, *columns), maxlen=0)
+        best = min(best, time.perf_counter() - start)
+    return len(columns[0]) / best if best else float("inf")
+
+
+def measure(
+    puzzle: str, name: str, make: t.Callable[[int], t.Any], count: int = 100_000, repeats: int = 3
+) -> Sample:
+    objects: t.List[t.Any] = [None] * count
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for n in range(count):
+            objects[n] = make(n)
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    copies = [make(n) for n in range(count)]
+    try:
+        hashes: t.Optional[float] = _rate(hash, objects, repeats=repeats)
+    except TypeError:
+        hashes = None
+    comparisons = _rate(operator.eq, objects, copies, repeats=repeats)
+    return Sample(puzzle, name, count, held / count, hashes, comparisons)
+
+
+def collect(puzzle: Puzzle, count: int = 100_000, repeats: int = 3) -> t.List[Sample]:
+    if (puzzle.year, puzzle.day) not in samples.available():
+        return []
+    makers = samples.samples(puzzle.year, puzzle.day, puzzles.load(puzzle))
+    return [measure(str(puzzle), name, make, count, repeats) for name, make in makers.items()]
+
+
+def report(samples: t.Sequence[Sample], baseline: t.Optional[t.Sequence[Sample]] = None) -> str:
+    old = {s.key: s for s in baseline or ()}
+
+    def ratio(new: t.Optional[float], before: t.Optional[float]) -> str:
+        return f" ({new / before:.2f}x)" if new and before else ""
+
+    lines = [f"{'object':<22} {'bytes each':>18} {'hash/s':>22} {'eq/s':>22}"]
+    for s in samples:
+        was = old.get(s.key)
+        size = f"{s.bytes_per_object:.0f}" + ratio(
+            s.bytes_per_object, was and was.bytes_per_object
+        )
+        hashes = "-"
+        if s.hashes_per_second is not None:
+            hashes = f"{s.hashes_per_second:,.0f}" + ratio(
+                s.hashes_per_second, was and was.hashes_per_second
+            )
+        comparisons = f"{s.comparisons_per_second:,.0f}" + ratio(
+            s.comparisons_per_second, was and was.comparisons_per_second
+        )
+        lines.append(f"{s.key:<22} {size:>18} {hashes:>22} {comparisons:>22}")
+    return "\n".join(lines)
+
+
+def dump(samples: t.Sequence[Sample], path: str):
+    with open(path, "w") as f:
+        json.dump([dataclasses.asdict(s) for s in samples], f, indent=2)
+
+
+def load(path: str) -> t.List[Sample]:
+    with open(path) as f:
+        return [Sample(**s) for s in json.load(f)]
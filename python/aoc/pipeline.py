@@ -0,0 +1,186 @@
+"""
+Overlap reading and parsing inputs with solving, across the whole suite.
+
+`runner.run` hands each part to a worker which reads, parses and solves it in turn, so the
+worker's CPU idles while it waits on the disk, and every part of a puzzle parses the same
+input again. Here those are separate asyncio stages joined by bounded queues:
+
+    load --queue--> parse --queue--> solve
+
+`load` reads each puzzle's input in a thread, so a slow disk doesn't hold up the event loop,
+and answers cached parts straight away. `parse` imports the solver and runs its `prepare`
+once per puzzle, in a thread of this process while the workers solve. `solve` sends every
+part with a pickle of the prepared arguments, so each gets its own copy, to the same kind of
+process pool as `runner.run`, with at most one part per worker in flight. Arguments that can't
+be pickled are left for the worker to prepare again.
+
+Puzzles go in longest first (see `scheduler`). When every worker is busy `solve` stops taking
+parsed puzzles, the queues fill up and the earlier stages wait, so no more than `depth`
+puzzles are ever held loaded or parsed ahead of the solvers.
+"""
+import asyncio
+import contextlib
+import dataclasses
+import functools
+import io
+import os
+import pickle
+import time
+import typing as t
+
+from aoc import cache, inputs, puzzles, runner, scheduler
+from aoc.puzzles import Puzzle
+from aoc.runner import Result
+
+
+@dataclasses.dataclass
+class Work:
+    """One puzzle on its way through the pipeline."""
+
+    puzzle: Puzzle
+    parts: t.List[str]
+    data: t.Optional[str] = None
+    input_hash: t.Optional[str] = None
+    args: t.Optional[bytes] = None
+    parse: float = 0.0
+    parse_cached: bool = False
+    error: t.Optional[str] = None
+
+
+class Pipeline:
+    def __init__(
+        self,
+        jobs: t.Sequence[scheduler.Job],
+        workers: int,
+        store: t.Optional[str] = None,
+        costs: t.Optional[scheduler.Costs] = None,
+        depth: t.Optional[int] = None,
+        **options: t.Any,
+    ):
+        self.workers = workers
+        self.store = store
+        self.depth = depth or workers
+        self.options = options
+        self.results: t.Dict[scheduler.Job, Result] = {}
+        # a puzzle's parts share one parse, so a puzzle is as expensive as its slowest part
+        self.puzzles: t.Dict[Puzzle, t.List[str]] = {}
+        for puzzle, _ in scheduler.longest_first(jobs, costs):
+            self.puzzles.setdefault(puzzle, [])
+        for puzzle, part in jobs:
+            self.puzzles[puzzle].append(part)
+
+    async def run(self):
+        loaded: asyncio.Queue = asyncio.Queue(self.depth)
+        parsed: asyncio.Queue = asyncio.Queue(self.depth)
+        with runner.worker_pool(self.workers) as pool:
+            await asyncio.gather(
+                self.load(loaded), self.parse(loaded, parsed), self.solve(parsed, pool)
+            )
+
+    async def load(self, loaded: asyncio.Queue):
+        answer_cache = runner.uses_answer_cache(self.options)
+        for puzzle, parts in self.puzzles.items():
+            work = Work(puzzle, parts)
+            try:
+                work.data = await asyncio.to_thread(
+                    inputs.InputStore(self.store).text, puzzle.year, puzzle.day
+                )
+                work.input_hash = inputs.digest(work.data)
+            except Exception as e:
+                work.error = runner.describe(e)
+            if answer_cache and not work.error:
+                work.parts = []
+                for part in parts:
+                    hit = await asyncio.to_thread(
+                        runner.cached,
+                        puzzle,
+                        part,
+                        cache_dir=self.options.get("cache_dir"),
+                        data=work.data,
+                    )
+                    if hit:
+                        self.results[puzzle, part] = hit
+                    else:
+                        work.parts.append(part)
+            if work.parts:
+                await loaded.put(work)
+        await loaded.put(None)
+
+    def prepare(self, work: Work):
+        try:
+            module = puzzles.load(work.puzzle)
+            store = None
+            if self.options.get("use_cache"):
+                store = cache.Cache(self.options.get("cache_dir"), self.options["cache_size"])
+            # solvers print progress as they go
+            with contextlib.redirect_stdout(io.StringIO()):
+                args, work.parse, work.parse_cached = runner.parse(
+                    work.puzzle, module, work.data, work.input_hash, store
+                )
+        except Exception as e:
+            work.error = runner.describe(e)
+            return
+        try:
+            work.args = pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            work.parse, work.parse_cached = 0.0, False
+
+    async def parse(self, loaded: asyncio.Queue, parsed: asyncio.Queue):
+        while (work := await loaded.get()) is not None:
+            if not work.error:
+                await asyncio.to_thread(self.prepare, work)
+            await parsed.put(work)
+        await parsed.put(None)
+
+    async def solve(self, parsed: asyncio.Queue, pool: t.Any):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.workers)
+        running = []
+
+        async def finish(future: asyncio.Future, work: Work, part: str):
+            try:
+                result = await future
+            finally:
+                slots.release()
+            if work.args is not None:
+                result.parse, result.parse_cached = work.parse, work.parse_cached
+            self.results[work.puzzle, part] = result
+
+        while (work := await parsed.get()) is not None:
+            for part in work.parts:
+                if work.error:
+                    self.results[work.puzzle, part] = Result(
+                        work.puzzle, part, input_hash=work.input_hash, error=work.error
+                    )
+                    continue
+                await slots.acquire()
+                call = functools.partial(
+                    runner.solve,
+                    work.puzzle,
+                    part,
+                    work.data,
+                    self.store,
+                    prepared=work.args,
+                    **self.options,
+                )
+                running.append(
+                    asyncio.create_task(finish(loop.run_in_executor(pool, call), work, part))
+                )
+        await asyncio.gather(*running)
+
+
+def run(
+    selected: t.Iterable[Puzzle],
+    workers: t.Optional[int] = None,
+    store: t.Optional[str] = None,
+    costs: t.Optional[scheduler.Costs] = None,
+    depth: t.Optional[int] = None,
+    **options: t.Any,
+) -> t.Tuple[t.List[Result], float]:
+    """Like `runner.run`: the results in puzzle order and the elapsed time for the suite."""
+    start = time.perf_counter()
+    pending = runner.jobs(selected)
+    options.setdefault("cache_size", cache.DEFAULT_MAX_BYTES)
+    pipeline = Pipeline(pending, workers or os.cpu_count() or 1, store, costs, depth, **options)
+    asyncio.run(pipeline.run())
+    return [pipeline.results[job] for job in pending], time.perf_counter() - start
@@ -0,0 +1,180 @@
+"""
+Profile a single part without editing the solver.
+
+Two modes, both writing to a directory of reports named after the part, e.g. 2021_q19_tasks:
+
+- "cprofile" wraps the call in cProfile and writes the raw .pstats (for snakeviz and friends),
+  a .txt report sorted by cumulative time, and a .collapsed file for flamegraph tools.
+  cProfile only records caller/callee pairs, so the stacks in the collapsed file are rebuilt
+  from the call graph by splitting each function's time between its callers in proportion.
+  That is exact for tree-shaped call graphs and an estimate when a helper has many callers.
+- "sample" interrupts the process every `interval` seconds of CPU time (ITIMER_PROF) and
+  records the Python stack. The overhead is a handler call per sample rather than per
+  function call, so it is usable on full size inputs, and the stacks are real ones.
+  Unix only.
+
+The collapsed format is one "outer;inner;innermost count" line per distinct stack, as read by
+flamegraph.pl, inferno and speedscope. cProfile counts are microseconds, sample counts are
+samples.
+"""
+import collections
+import cProfile
+import io
+import pathlib
+import pstats
+import signal
+import types
+import typing as t
+
+from aoc import puzzles
+
+MODES = ("cprofile", "sample")
+DEFAULT_DIR = puzzles.ROOT.parent / ".aoc" / "profiles"
+
+FuncKey = t.Tuple[str, int, str]
+
+
+def frame_name(filename: str, line: int, name: str) -> str:
+    if filename == "~":
+        # built-ins, which cProfile reports as ("~", 0, "<built-in method ...>")
+        return name
+    return f"{name} ({pathlib.Path(filename).name}:{line})"
+
+
+def collapse_pstats(stats: pstats.Stats, root: FuncKey) -> t.Counter[str]:
+    """Rebuild approximate stacks below `root` from cProfile's caller/callee totals."""
+    entries = stats.stats  # type: ignore[attr-defined]
+    children: t.Dict[FuncKey, t.Dict[FuncKey, float]] = collections.defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            children[caller][func] = cumulative
+    stacks: t.Counter[str] = collections.Counter()
+
+    def walk(func: FuncKey, share: float, path: t.Tuple[str, ...], seen: t.FrozenSet[FuncKey]):
+        _, _, own, cumulative, _ = entries[func]
+        path = path + (frame_name(*func),)
+        micros = round(own * share * 1e6)
+        if micros:
+            stacks[";".join(path)] += micros
+        for child, edge in children.get(func, {}).items():
+            # recursion is already inside the outer call's cumulative time
+            if child in seen or not entries[child][3]:
+                continue
+            walk(child, share * edge / entries[child][3], path, seen | {child})
+
+    if root in entries:
+        walk(root, 1.0, (), frozenset([root]))
+    return stacks
+
+
+def write_collapsed(stacks: t.Counter[str], path: pathlib.Path):
+    with open(path, "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def code_key(func: t.Callable) -> FuncKey:
+    code = func.__code__
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def run_cprofile(func: t.Callable, args: t.Tuple, prefix: pathlib.Path) -> t.Any:
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(prefix.with_suffix(".pstats"))
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+        prefix.with_suffix(".txt").write_text(report.getvalue())
+        write_collapsed(collapse_pstats(stats, code_key(func)), prefix.with_suffix(".collapsed"))
+
+
+class Sampler:
+    """Counts the Python stacks under `func`'s frame, one sample per `interval` of CPU time."""
+
+    def __init__(self, func: t.Callable, interval: float = 0.005):
+        self.func = func
+        self.root = func.__code__
+        self.interval = interval
+        # frames are keyed by definition line so every sample of a function merges
+        self.stacks: t.Counter[t.Tuple[FuncKey, ...]] = collections.Counter()
+        self.lines: t.Counter[FuncKey] = collections.Counter()
+        self.missed = 0
+
+    def sample(self, signum: int, frame: t.Optional[types.FrameType]):
+        innermost = frame
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            if code is self.root:
+                self.stacks[tuple(reversed(stack))] += 1
+                inner = innermost.f_code
+                self.lines[inner.co_filename, innermost.f_lineno, inner.co_name] += 1
+                return
+            frame = frame.f_back
+        # outside the part, e.g. in the profiler itself
+        self.missed += 1
+
+    def run(self, args: t.Tuple) -> t.Any:
+        previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return self.func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def collapsed(self) -> t.Counter[str]:
+        collapsed: t.Counter[str] = collections.Counter()
+        for stack, count in self.stacks.items():
+            collapsed[";".join(frame_name(*key) for key in stack)] += count
+        return collapsed
+
+    def report(self) -> str:
+        total = sum(self.stacks.values())
+        own: t.Counter[str] = collections.Counter()
+        inclusive: t.Counter[str] = collections.Counter()
+        for stack, count in self.stacks.items():
+            own[frame_name(*stack[-1])] += count
+            for name in {frame_name(*key) for key in stack}:
+                inclusive[name] += count
+        lines = collections.Counter({frame_name(*k): n for k, n in self.lines.items()})
+        out = [f"{total} samples every {self.interval * 1000:g}ms of CPU, {self.missed} missed"]
+        for title, counter in (("own", own), ("inclusive", inclusive), ("hot lines", lines)):
+            out.append(f"\n{title}:")
+            for name, count in counter.most_common(25):
+                out.append(f"{count:>8} {count / (total or 1):>6.1%}  {name}")
+        return "\n".join(out) + "\n"
+
+
+def run_sample(
+    func: t.Callable, args: t.Tuple, prefix: pathlib.Path, interval: float = 0.005
+) -> t.Any:
+    sampler = Sampler(func, interval)
+    try:
+        return sampler.run(args)
+    finally:
+        prefix.with_suffix(".txt").write_text(sampler.report())
+        write_collapsed(sampler.collapsed(), prefix.with_suffix(".collapsed"))
+
+
+def profile(
+    mode: str,
+    func: t.Callable,
+    args: t.Tuple,
+    directory: t.Union[str, pathlib.Path, None],
+    name: str,
+    interval: float = 0.005,
+) -> t.Any:
+    """Call `func(*args)` under the profiler `mode`, writing reports to `directory`/`name`.*"""
+    directory = pathlib.Path(directory or DEFAULT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    prefix = directory / name
+    if mode == "cprofile":
+        return run_cprofile(func, args, prefix)
+    if mode == "sample":
+        return run_sample(func, args, prefix, interval)
+    raise ValueError(f"unknown profile mode {mode!r}, expected one of {MODES}")
@@ -0,0 +1,144 @@
+"""
+Find and import the python/<year>/qNN.py solver modules.
+
+Every solver follows the same convention: `part_one` and `part_two` (or a single `tasks` that
+answers both) take the positional arguments returned by an optional module level
+`prepare(data)`. Modules without `prepare` get the raw puzzle input.
+
+A solver is imported once per process, and again if it or a local module (`utils`) has changed
+on disk since, so a long lived worker never runs code older than the files it hashes.
+"""
+import dataclasses
+import importlib.util
+import os
+import pathlib
+import re
+import sys
+import types
+import typing as t
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+PARTS = ("part_one", "part_two")
+
+# the mtime and size of each file by path, Nones for one that's gone
+Fingerprint = t.Dict[str, t.Tuple[t.Optional[int], t.Optional[int]]]
+
+_module_re = re.compile(r"q(\d\d)\.py")
+_solver_re = re.compile(r"aoc\d{4}_q\d\d")
+_loaded: t.Dict["Puzzle", t.Tuple[types.ModuleType, Fingerprint]] = {}
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class Puzzle:
+    year: int
+    day: int
+
+    def __str__(self):
+        return f"{self.year} q{self.day:02d}"
+
+    @property
+    def path(self) -> pathlib.Path:
+        return ROOT / str(self.year) / f"q{self.day:02d}.py"
+
+    @property
+    def module_name(self) -> str:
+        return f"aoc{self.year}_q{self.day:02d}"
+
+
+def discover(
+    years: t.Optional[t.Iterable[int]] = None, days: t.Optional[t.Iterable[int]] = None
+) -> t.List[Puzzle]:
+    years = set(years or ())
+    days = set(days or ())
+    found = []
+    for year_dir in ROOT.iterdir():
+        if not (year_dir.is_dir() and year_dir.name.isdigit()):
+            continue
+        year = int(year_dir.name)
+        if years and year not in years:
+            continue
+        for path in year_dir.iterdir():
+            match = _module_re.fullmatch(path.name)
+            if match and (not days or int(match[1]) in days):
+                found.append(Puzzle(year, int(match[1])))
+    return sorted(found)
+
+
+def fingerprint(paths: t.Iterable[t.Union[str, pathlib.Path]]) -> Fingerprint:
+    found: Fingerprint = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            found[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            found[str(path)] = (None, None)
+    return found
+
+
+def _local_modules() -> t.Dict[str, str]:
+    """The file of every imported module that lives next to the solvers, other than aoc's."""
+    found = {}
+    for name, module in list(sys.modules.items()):
+        # looked up past any lazily imported module's __getattribute__, which would load it
+        try:
+            path = object.__getattribute__(module, "__dict__").get("__file__")
+        except AttributeError:
+            continue
+        if path is None or name.split(".")[0] == "aoc" or _solver_re.fullmatch(name):
+            continue
+        if pathlib.Path(path).resolve().is_relative_to(ROOT):
+            found[name] = path
+    return found
+
+
+def stale(puzzle: Puzzle) -> bool:
+    """Whether a loaded solver or any local module has changed on disk since it was loaded."""
+    if puzzle not in _loaded:
+        return False
+    seen = _loaded[puzzle][1]
+    return fingerprint(seen) != seen
+
+
+def load(puzzle: Puzzle) -> types.ModuleType:
+    """Import a solver by path, once per process unless its files change."""
+    if puzzle in _loaded:
+        module, seen = _loaded[puzzle]
+        now = fingerprint(seen)
+        if now == seen:
+            return module
+        changed = {path for path in seen if now[path] != seen[path]}
+        # importing the solver again imports these again too
+        for name, path in _local_modules().items():
+            if path in changed:
+                for loaded in [n for n in sys.modules if n == name or n.startswith(name + ".")]:
+                    del sys.modules[loaded]
+        del _loaded[puzzle]
+    # solvers `import utils`, which lives next to this package
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    # taken before running the module, so that an edit made while it runs shows up as a change
+    before = fingerprint([puzzle.path, *_local_modules().values()])
+    spec = importlib.util.spec_from_file_location(puzzle.module_name, puzzle.path)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses using `from __future__ import annotations` look themselves up in sys.modules
+    sys.modules[puzzle.module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[puzzle.module_name]
+        raise
+    _loaded[puzzle] = (module, {**fingerprint(_local_modules().values()), **before})
+    return module
+
+
+def parts(module: types.ModuleType) -> t.List[str]:
+    if hasattr(module, "tasks"):
+        return ["tasks"]
+    return [name for name in PARTS if hasattr(module, name)]
+
+
+def prepare(module: types.ModuleType, data: str) -> t.Tuple:
+    prepare = getattr(module, "prepare", None)
+    if prepare is None:
+        return (data,)
+    return prepare(data)
@@ -0,0 +1,355 @@
+"""
+Run every solver part in a process pool and report wall time, CPU time and the answer.
+
+Each (puzzle, part) is an independent job which prepares its own copy of the input, so parts
+that mutate their arguments can't interfere with each other, and the suite takes roughly as
+long as its slowest part rather than the sum of them all. Workers are reused from job to job,
+so each one imports a solver once however many of its parts it runs.
+"""
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import io
+import multiprocessing
+import os
+import pickle
+import time
+import traceback
+import types
+import typing as t
+
+from aoc import cache, history, inputs, memory, profiling, puzzles, scheduler
+from aoc.puzzles import Puzzle
+
+
+@dataclasses.dataclass
+class Result:
+    puzzle: Puzzle
+    part: str
+    answer: t.Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak: int = 0
+    traced: int = 0
+    sites: t.List[memory.Site] = dataclasses.field(default_factory=list)
+    input_hash: t.Optional[str] = None
+    cached: bool = False
+    parse: float = 0.0
+    parse_cached: bool = False
+    error: t.Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_missing = object()
+
+
+def solve(
+    puzzle: Puzzle,
+    part: str,
+    data: t.Optional[str] = None,
+    store: t.Optional[str] = None,
+    profile: t.Optional[str] = None,
+    profile_dir: t.Optional[str] = None,
+    sample_interval: float = 0.005,
+    track_memory: bool = False,
+    memory_budget: t.Optional[int] = None,
+    cache_dir: t.Optional[str] = None,
+    cache_size: int = cache.DEFAULT_MAX_BYTES,
+    use_cache: bool = False,
+    memo: t.Optional[t.Dict[str, bytes]] = None,
+    prepared: t.Optional[bytes] = None,
+) -> Result:
+    """
+    Import, prepare and time a single part. Runs inside a worker process.
+
+    Without `data` the input is read from the store at `store`, or the default one. `peak` is
+    the worker's peak resident set size in bytes since this part started, where the platform
+    can reset it (see `memory.reset_peak_rss`), and since the worker started otherwise. With
+    `profile` set to one of `profiling.MODES` the part runs under that profiler and its
+    reports are written to `profile_dir`; the timings then include the profiler's overhead.
+
+    `track_memory` runs the part under tracemalloc, filling in `traced` (peak traced bytes) and
+    the top allocation `sites`, at the cost of slowing it down several times. A part fails if it
+    uses more than `memory_budget` bytes: traced bytes when tracking, otherwise the growth in
+    peak RSS over the call. The budget is also applied as an address space limit so that a part
+    far over it gets a MemoryError rather than the OOM killer.
+
+    With `use_cache` answers are looked up in, and saved to, the result cache at `cache_dir`
+    before the module is even imported. A cached result has `cached` set and no timings.
+    Profiling and memory tracking always run the part, but still use cached parsed inputs.
+    `memo` keeps parsed inputs in memory as well, see `parse`. `prepared` is a pickle of the
+    part's arguments already prepared from `data` by the caller, which then accounts for the
+    parse. It's unpickled after the import, since it may hold instances of the solver's classes.
+    """
+    result = Result(puzzle, part)
+    cache_answer = use_cache and not (profile or track_memory)
+    memory.reset_peak_rss()
+    try:
+        if data is None:
+            data = inputs.InputStore(store).text(puzzle.year, puzzle.day)
+        result.input_hash = inputs.digest(data)
+        answers = cache.Cache(cache_dir, cache_size)
+        if cache_answer:
+            answer_key = cache.key(cache.source_hash(puzzle), result.input_hash, part)
+            hit = answers.get("answers", answer_key, _missing)
+            if hit is not _missing:
+                result.answer, result.cached = hit, True
+                return result
+        module = puzzles.load(puzzle)
+        if cache_answer:
+            # the solver may have changed since the lookup, store under the source that runs
+            answer_key = cache.key(cache.source_hash(puzzle), result.input_hash, part)
+        # solvers print progress as they go, which would interleave across workers
+        with contextlib.redirect_stdout(io.StringIO()):
+            if prepared is not None:
+                args = pickle.loads(prepared)
+            elif use_cache or memo is not None:
+                parsed = answers if use_cache else None
+                args, result.parse, result.parse_cached = parse(
+                    puzzle, module, data, result.input_hash, parsed, memo
+                )
+            else:
+                parse_start = time.perf_counter()
+                args = puzzles.prepare(module, data)
+                result.parse = time.perf_counter() - parse_start
+            func = call = getattr(module, part)
+            if profile:
+                name = f"{puzzle.year}_q{puzzle.day:02d}_{part}"
+
+                def profiled(*args):
+                    return profiling.profile(
+                        profile, func, args, profile_dir, name, sample_interval
+                    )
+
+                call = profiled
+
+            rss = memory.peak_rss()
+            wall, cpu = time.perf_counter(), time.process_time()
+            with memory.address_space_limit(memory_budget):
+                if track_memory:
+                    result.answer, usage = memory.Tracker().run(call, args)
+                    result.traced, result.sites = usage.peak, usage.sites
+                else:
+                    result.answer = call(*args)
+            result.wall = time.perf_counter() - wall
+            result.cpu = time.process_time() - cpu
+        result.peak = memory.peak_rss()
+        if track_memory:
+            memory.check_budget(result.traced, memory_budget, "peak traced memory")
+        else:
+            memory.check_budget(result.peak - rss, memory_budget, "peak RSS growth")
+        # nor if it changed while running, when the key may not be the source that ran
+        if cache_answer and not puzzles.stale(puzzle):
+            answers.put("answers", answer_key, result.answer)
+    except Exception as e:
+        result.error = describe(e)
+        result.peak = memory.peak_rss()
+    return result
+
+
+def describe(e: BaseException) -> str:
+    return "".join(traceback.format_exception_only(type(e), e)).strip()
+
+
+def parse(
+    puzzle: Puzzle,
+    module: types.ModuleType,
+    data: str,
+    input_hash: str,
+    store: t.Optional[cache.Cache] = None,
+    memo: t.Optional[t.Dict[str, bytes]] = None,
+    min_seconds: float = 0.005,
+) -> t.Tuple[t.Tuple, float, bool]:
+    """
+    The prepared arguments for a part, unpickled from `memo` (pickles held in memory by a long
+    lived worker) or `store` if this parser has seen this input before. Returns them with the
+    time taken and whether they were cached.
+
+    Parses quicker than `min_seconds` aren't kept, since unpickling wouldn't be any faster,
+    and neither are results that can't be pickled or whose solver changed on disk since it was
+    loaded. Each call returns a fresh copy, so parts are free to modify their arguments.
+    """
+    if not hasattr(module, "prepare"):
+        return (data,), 0.0, False
+    parsed_key = cache.key(cache.parser_hash(puzzle), input_hash)
+    start = time.perf_counter()
+    if memo is not None and parsed_key in memo:
+        return pickle.loads(memo[parsed_key]), time.perf_counter() - start, True
+    if store is not None:
+        args = store.get("parsed", parsed_key, _missing)
+        if args is not _missing:
+            if memo is not None:
+                memo[parsed_key] = pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)
+            return args, time.perf_counter() - start, True
+    args = module.prepare(data)
+    elapsed = time.perf_counter() - start
+    if elapsed >= min_seconds and not puzzles.stale(puzzle):
+        try:
+            blob = pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return args, elapsed, False
+        if memo is not None:
+            memo[parsed_key] = blob
+        if store is not None:
+            store.put("parsed", parsed_key, args)
+    return args, elapsed, False
+
+
+def jobs(selected: t.Iterable[Puzzle]) -> t.List[t.Tuple[Puzzle, str]]:
+    found = []
+    for puzzle in selected:
+        try:
+            names = puzzles.parts(puzzles.load(puzzle))
+        except Exception:
+            # let the worker hit the same import error and report it
+            names = list(puzzles.PARTS)
+        found.extend((puzzle, part) for part in names)
+    return found
+
+
+def cached(
+    puzzle: Puzzle,
+    part: str,
+    store: t.Optional[str] = None,
+    cache_dir: t.Optional[str] = None,
+    data: t.Optional[str] = None,
+) -> t.Optional[Result]:
+    """The cached result of a part, or None if it has to be solved."""
+    if data is None:
+        try:
+            data = inputs.InputStore(store).text(puzzle.year, puzzle.day)
+        except inputs.MissingInput:
+            return None
+    input_hash = inputs.digest(data)
+    answer = cache.Cache(cache_dir).get(
+        "answers", cache.key(cache.source_hash(puzzle), input_hash, part), _missing
+    )
+    if answer is _missing:
+        return None
+    return Result(puzzle, part, answer, input_hash=input_hash, cached=True)
+
+
+def worker_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    # workers are forked from a server that has already imported the runner and its
+    # dependencies, and each one solves part after part, keeping the solvers it has imported
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["aoc.runner"])
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def uses_answer_cache(options: t.Dict[str, t.Any]) -> bool:
+    """Whether parts run with `options` can be answered from the cache without running."""
+    return bool(options.get("use_cache")) and not (
+        options.get("profile") or options.get("track_memory")
+    )
+
+
+def run(
+    selected: t.Iterable[Puzzle],
+    workers: t.Optional[int] = None,
+    store: t.Optional[str] = None,
+    costs: t.Optional[scheduler.Costs] = None,
+    **options: t.Any,
+) -> t.Tuple[t.List[Result], float]:
+    """
+    Returns the results in puzzle order and the elapsed wall time for the whole suite.
+
+    `options` are passed on to `solve` for every part. Cached answers are looked up here first,
+    so a suite with nothing to solve doesn't start a single worker. The rest are started
+    longest first according to `costs`, see `scheduler`.
+    """
+    start = time.perf_counter()
+    pending = jobs(selected)
+    results: t.Dict[t.Tuple[Puzzle, str], Result] = {}
+    if uses_answer_cache(options):
+        for puzzle, part in pending:
+            hit = cached(puzzle, part, store, options.get("cache_dir"))
+            if hit:
+                results[puzzle, part] = hit
+    unsolved = [job for job in pending if job not in results]
+    if unsolved:
+        workers = min(workers or os.cpu_count() or 1, len(unsolved))
+        queue = collections.deque(scheduler.longest_first(unsolved, costs))
+        with worker_pool(workers) as pool:
+            # one part in flight per worker, so the next part is only picked once one is free
+            running: t.Dict[concurrent.futures.Future, t.Tuple[Puzzle, str]] = {}
+
+            def submit():
+                if queue:
+                    job = queue.popleft()
+                    running[pool.submit(solve, *job, store=store, **options)] = job
+
+            for _ in range(workers):
+                submit()
+            while running:
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    results[running.pop(future)] = future.result()
+                    submit()
+    return [results[job] for job in pending], time.perf_counter() - start
+
+
+def format_answer(answer: t.Any) -> str:
+    text = str(answer)
+    if "\n" in text:
+        # multi-line answers (e.g. letters drawn in a grid) go under the table row
+        return "\n" + "\n".join(f"    {line}" for line in text.splitlines())
+    return text
+
+
+def report(results: t.List[Result], elapsed: float) -> str:
+    traced = any(r.traced for r in results)
+    header = f"{'puzzle':<10} {'part':<9} {'parse ms':>9} {'wall ms':>10} {'cpu ms':>10}"
+    header += f" {'peak MB':>8}"
+    lines = [header + (f" {'traced MB':>9}" if traced else "") + "  answer"]
+    for r in results:
+        answer = format_answer(r.answer) if r.ok else f"ERROR {r.error}"
+        if r.cached:
+            row = f"{str(r.puzzle):<10} {r.part:<9} {'':>9} {'cached':>10} {'':>10} {'':>8}"
+        else:
+            parse = f"{r.parse * 1000:.1f}{'*' if r.parse_cached else ' '}"
+            row = (
+                f"{str(r.puzzle):<10} {r.part:<9} {parse:>9} {r.wall * 1000:>10.1f} "
+                f"{r.cpu * 1000:>10.1f} {r.peak / memory.MB:>8.1f}"
+            )
+        if traced:
+            row += f" {r.traced / memory.MB:>9.1f}"
+        lines.append(f"{row}  {answer}")
+        lines.extend(f"    {site}" for site in r.sites)
+    total_wall = sum(r.wall for r in results)
+    total_cpu = sum(r.cpu for r in results)
+    failed = sum(not r.ok for r in results)
+    cached = sum(r.cached for r in results)
+    longest = max((r.wall for r in results), default=0.0)
+    lines.append(
+        f"{len(results)} parts, {failed} failed, {cached} cached: elapsed {elapsed:.2f}s, "
+        f"longest part {longest:.2f}s, sum of part wall {total_wall:.2f}s, "
+        f"sum of part cpu {total_cpu:.2f}s"
+    )
+    if any(r.parse_cached for r in results):
+        lines.append("* parsed input read from the cache")
+    return "\n".join(lines)
+
+
+def timings(results: t.Iterable[Result]) -> t.List[history.Timing]:
+    """History rows for the parts that actually ran."""
+    return [
+        history.Timing(
+            r.puzzle.year,
+            r.puzzle.day,
+            r.part,
+            r.input_hash,
+            r.wall if r.ok else None,
+            r.cpu if r.ok else None,
+            r.peak or None,
+            error=r.error,
+        )
+        for r in results
+        if not r.cached
+    ]
@@ -0,0 +1,64 @@
+"""
+The small objects that solvers make by the million, for `aoc.objects` to measure.
+
+Each entry takes the solver module and returns, per class, a function that makes a distinct
+instance from an int. Keeping them here rather than in the solvers means a solver carries no
+benchmark code, and one that drops or renames a class breaks `python -m aoc objects` rather
+than silently measuring nothing.
+"""
+import types
+import typing as t
+
+Samples = t.Dict[str, t.Callable[[int], t.Any]]
+Sampler = t.Callable[[types.ModuleType], Samples]
+
+_samplers: t.Dict[t.Tuple[int, int], Sampler] = {}
+
+
+def sampler(year: int, day: int) -> t.Callable[[Sampler], Sampler]:
+    def register(func: Sampler) -> Sampler:
+        _samplers[(year, day)] = func
+        return func
+
+    return register
+
+
+def available() -> t.List[t.Tuple[int, int]]:
+    return sorted(_samplers)
+
+
+def samples(year: int, day: int, module: types.ModuleType) -> Samples:
+    """The makers for the solver's hot classes, none for a solver without an entry."""
+    func = _samplers.get((year, day))
+    return func(module) if func else {}
+
+
+@sampler(2020, 8)
+def instructions(q08: types.ModuleType) -> Samples:
+    return {"Instruction": lambda n: q08.Instruction(("nop", "acc", "jmp")[n % 3], n)}
+
+
+@sampler(2021, 4)
+def bingo(q04: types.ModuleType) -> Samples:
+    return {"BingoNumber": lambda n: q04.BingoNumber(n)}
+
+
+@sampler(2021, 19)
+def beacons(q19: types.ModuleType) -> Samples:
+    return {"Beacon": lambda n: q19.Beacon((n, -n, 2 * n))}
+
+
+@sampler(2021, 21)
+def dirac_dice(q21: types.ModuleType) -> Samples:
+    def player(n: int) -> t.Any:
+        return q21.Player(position=n % 10 + 1, score=n)
+
+    def state(n: int) -> t.Any:
+        return q21.GameState(players=(player(n), q21.Player(position=n % 7 + 1, score=n // 2)))
+
+    return {"Player": player, "GameState": state}
+
+
+@sampler(2021, 22)
+def cubes(q22: types.ModuleType) -> Samples:
+    return {"Box": lambda n: q22.Box.of((n, n + 10), (-n, 5), (0, n))}
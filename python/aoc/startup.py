@@ -0,0 +1,131 @@
+"""
+Startup-time audit: how long each solver takes to import, and why.
+
+Every solver is loaded in a fresh interpreter under `-X importtime`, so nothing is shared with
+earlier imports. Its load time is split into the dependencies it imports (each reported with
+its cumulative time) and its own top level code, which is everything else: building tables,
+compiling parsers, defining classes. The same is done for the runner itself, since every
+`python -m aoc` pays that before doing anything.
+"""
+import dataclasses
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import typing as t
+
+from aoc import puzzles
+from aoc.puzzles import Puzzle
+
+_line_re = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+_loaded_re = re.compile(r"--- loaded (\S+) ---")
+
+# run in the child: everything before the marker is interpreter and tooling startup
+_probe = """
+import sys, time
+sys.path.insert(0, {root!r})
+from aoc import puzzles
+sys.stderr.write("--- load ---\\n")
+start = time.perf_counter()
+{load}
+sys.stderr.write(f"--- loaded {{time.perf_counter() - start}} ---\\n")
+"""
+
+
+@dataclasses.dataclass
+class Import:
+    name: str
+    own: float
+    cumulative: float
+
+
+@dataclasses.dataclass
+class Audit:
+    name: str
+    load: float = 0.0
+    process: float = 0.0
+    imports: t.List[Import] = dataclasses.field(default_factory=list)
+    error: t.Optional[str] = None
+
+    @property
+    def imported(self) -> float:
+        return sum(i.cumulative for i in self.imports)
+
+    @property
+    def top_level(self) -> float:
+        return max(self.load - self.imported, 0.0)
+
+
+def parse_importtime(stderr: str) -> t.Tuple[t.List[Import], t.Optional[float]]:
+    """The outermost imports after the load marker, and the load time the probe measured."""
+    lines = stderr.split("--- load ---\n", 1)[-1].splitlines()
+    found = []
+    entries = []
+    loaded = None
+    for line in lines:
+        match = _line_re.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            entries.append((len(indent), Import(name, int(own) / 1e6, int(cumulative) / 1e6)))
+        elif _loaded_re.match(line):
+            loaded = float(_loaded_re.match(line)[1])
+    if entries:
+        # importtime prints children before parents, indented more deeply
+        outermost = min(depth for depth, _ in entries)
+        found = [entry for depth, entry in entries if depth == outermost]
+    return found, loaded
+
+
+def audit(name: str, load: str) -> Audit:
+    result = Audit(name)
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    probe = _probe.format(root=str(puzzles.ROOT), load=load)
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    result.process = time.perf_counter() - start
+    if process.returncode:
+        result.error = process.stderr.strip().splitlines()[-1]
+        return result
+    result.imports, loaded = parse_importtime(process.stderr)
+    result.load = loaded or 0.0
+    return result
+
+
+def audit_puzzle(puzzle: Puzzle) -> Audit:
+    load = f"puzzles.load(puzzles.Puzzle({puzzle.year}, {puzzle.day}))"
+    return audit(str(puzzle), load)
+
+
+def audit_runner() -> Audit:
+    return audit("python -m aoc", "import aoc.__main__")
+
+
+def report(audits: t.Sequence[Audit], budget: t.Optional[float] = None, top: int = 3) -> str:
+    lines = [
+        f"{'module':<14} {'process ms':>10} {'load ms':>8} {'imports':>8} {'top level':>9}  "
+        "heaviest imports"
+    ]
+    for a in audits:
+        if a.error:
+            lines.append(f"{a.name:<14} ERROR {a.error}")
+            continue
+        heaviest = sorted(a.imports, key=lambda i: -i.cumulative)[:top]
+        names = ", ".join(f"{i.name} {i.cumulative * 1000:.0f}ms" for i in heaviest)
+        flag = "  OVER BUDGET" if budget and a.load > budget else ""
+        lines.append(
+            f"{a.name:<14} {a.process * 1000:>10.0f} {a.load * 1000:>8.1f} "
+            f"{a.imported * 1000:>8.1f} {a.top_level * 1000:>9.1f}  {names}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def dump(audits: t.Sequence[Audit], path: str):
+    with open(path, "w") as f:
+        json.dump([dataclasses.asdict(a) for a in audits], f, indent=2)
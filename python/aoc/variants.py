@@ -0,0 +1,161 @@
+"""
+Interchangeable implementations of one problem, and picking between them by input size.
+
+A solver declares a problem with a function giving the size of its arguments and one making
+arguments of a given size, then registers each implementation as a variant of it:
+
+    memory_game = variants.problem("2020 q15 memory game", size=..., sample=...)
+
+    @memory_game.variant("dict")
+    def solve_dict(data, target): ...
+
+Calling the problem calls the variant that was measured fastest at the size it's given.
+`python -m aoc variants` races the variants over a ladder of sizes, checks that they agree,
+and writes the sizes where the fastest one changes, the crossovers, to `.aoc/variants.json`
+(override with `AOC_VARIANTS`). That file is local to the machine it was raced on and isn't
+committed, so each problem also declares the crossovers raced on the reference machine:
+
+    memory_game = variants.problem(..., default="list", crossovers=[(0, "list")])
+
+The file's crossovers for a problem, when it has any, take the place of the declared ones.
+Without either, or for a variant renamed since, the problem's default variant is called.
+Crossovers depend on the host, a variant that wins by a little on one machine can lose on
+another, so the race also reports where this host's differ from the declared ones.
+"""
+import bisect
+import dataclasses
+import json
+import os
+import pathlib
+import typing as t
+
+from aoc import puzzles
+
+DEFAULT_PATH = pathlib.Path(
+    os.environ.get("AOC_VARIANTS", puzzles.ROOT.parent / ".aoc" / "variants.json")
+)
+
+Crossovers = t.List[t.Tuple[int, str]]
+
+_problems: t.Dict[str, "Problem"] = {}
+_crossovers: t.Optional[t.Dict[str, Crossovers]] = None
+
+
+@dataclasses.dataclass
+class Variant:
+    name: str
+    func: t.Callable
+    max_size: t.Optional[int] = None
+
+    def fits(self, size: int) -> bool:
+        return self.max_size is None or size <= self.max_size
+
+
+class Problem:
+    def __init__(
+        self,
+        name: str,
+        size: t.Callable[..., int],
+        sample: t.Callable[[int, int], t.Tuple],
+        default: t.Optional[str] = None,
+        crossovers: t.Optional[Crossovers] = None,
+    ):
+        self.name = name
+        self.size = size
+        self.sample = sample
+        self.default = default
+        self.declared = list(crossovers or [])
+        self.variants: t.Dict[str, Variant] = {}
+
+    def __repr__(self):
+        return f"Problem({self.name!r}, variants={list(self.variants)})"
+
+    def variant(self, name: str, max_size: t.Optional[int] = None) -> t.Callable:
+        """
+        Register the decorated function as a variant, which is only called for sizes up to
+        `max_size` if given, e.g. when it needs memory that grows too fast to go further.
+        """
+
+        def register(func: t.Callable) -> t.Callable:
+            self.variants[name] = Variant(name, func, max_size)
+            return func
+
+        return register
+
+    def crossovers(self) -> Crossovers:
+        """The crossovers raced on this machine if there are any, else the declared ones."""
+        return crossovers().get(self.name) or self.declared
+
+    def choose(self, size: int) -> Variant:
+        """
+        The variant fastest at `size`: the winner of the last crossover at or below it, or
+        of the first crossover when `size` is below all of them.
+        """
+        fitting = {name: v for name, v in self.variants.items() if v.fits(size)}
+        if not fitting:
+            raise ValueError(f"no variant of {self.name} takes size {size}")
+        points = self.crossovers()
+        name = self.default or next(iter(self.variants))
+        if points:
+            n = max(bisect.bisect_right([point[0] for point in points], size) - 1, 0)
+            name = points[n][1]
+        if name not in fitting:
+            name = self.default if self.default in fitting else next(iter(fitting))
+        return fitting[name]
+
+    def __call__(self, *args, **kwargs) -> t.Any:
+        return self.choose(self.size(*args, **kwargs)).func(*args, **kwargs)
+
+
+def problem(
+    name: str,
+    size: t.Callable[..., int],
+    sample: t.Callable[[int, int], t.Tuple],
+    default: t.Optional[str] = None,
+    crossovers: t.Optional[Crossovers] = None,
+) -> Problem:
+    """
+    Declare a problem. `size` takes the same arguments as the variants and `sample(size,
+    seed)` returns a tuple of arguments of that size. `crossovers` are the (size, variant)
+    pairs `python -m aoc variants` found on the reference machine.
+    """
+    _problems[name] = Problem(name, size, sample, default, crossovers)
+    return _problems[name]
+
+
+def problems() -> t.List[Problem]:
+    return list(_problems.values())
+
+
+def load(path: t.Optional[pathlib.Path] = None) -> t.Dict[str, Crossovers]:
+    path = pathlib.Path(path or DEFAULT_PATH)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return {
+            name: [(size, winner) for size, winner in entry["crossovers"]]
+            for name, entry in json.load(f).items()
+        }
+
+
+def crossovers() -> t.Dict[str, Crossovers]:
+    """Every problem's crossovers, read from the file the first time any problem is called."""
+    global _crossovers
+    if _crossovers is None:
+        _crossovers = load()
+    return _crossovers
+
+
+def save(found: t.Dict[str, Crossovers], path: t.Optional[pathlib.Path] = None):
+    """Replace the crossovers of the problems in `found`, keeping the rest of the file."""
+    global _crossovers
+    path = pathlib.Path(path or DEFAULT_PATH)
+    entries = {}
+    if path.exists():
+        with open(path) as f:
+            entries = json.load(f)
+    entries.update({name: {"crossovers": points} for name, points in found.items()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(entries, f, indent=2, sort_keys=True)
+    _crossovers = None
@@ -0,0 +1,5 @@
+import pathlib
+import sys
+
+# the tests import `aoc` and `utils` the way the solvers do, from the python/ directory
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from utils.automaton import VON_NEUMANN, Automaton, Rule, line_of_sight
+from utils.grid import Grid
+
+# Conway's life as a [state, live neighbours] table
+LIFE = np.zeros((2, 9), dtype=np.int8)
+LIFE[0, 3] = LIFE[1, 2] = LIFE[1, 3] = 1
+
+
+def life(text):
+    return Automaton(Grid.parse(text, {"#": 1, ".": 0}).cells, Rule(LIFE))
+
+
+def test_a_blinker_cycles():
+    blinker = life(".....\n..#..\n..#..\n..#..\n.....\n")
+    assert blinker.run(2) == [4, 4]
+    assert blinker.run_until_repeat() == (2, 2)
+    with pytest.raises(ValueError, match="cycles every 2 steps"):
+        life(".....\n..#..\n..#..\n..#..\n.....\n").run_until_stable()
+
+
+def test_a_block_is_stable_and_settling_is_found():
+    assert life("....\n.##.\n.##.\n....\n").run_until_stable() == 0
+    # three cells in an L become a block in one step
+    corner = life("....\n.##.\n.#..\n....\n")
+    assert corner.run_until_stable() == 1
+    assert corner.cells.sum() == 4
+
+
+def test_no_repeat_within_the_limit():
+    glider = life("." * 8 + "\n" + ".#......\n..#.....\n###.....\n" + ("." * 8 + "\n") * 4)
+    with pytest.raises(ValueError, match="no state repeated in 3 steps"):
+        glider.run_until_repeat(3)
+
+
+def test_an_infinite_plain_steps_its_fill():
+    # every cell flips, including all those off the grid
+    flip = Rule(np.array([[1] * 5, [0] * 5]), kernel=VON_NEUMANN)
+    automaton = Automaton(np.zeros((2, 2), dtype=np.int8), flip, infinite=True)
+    automaton.run(3)
+    assert automaton.fill == 1
+    assert automaton.cells.tolist() == [[1, 1], [1, 1]]
+
+
+def test_callable_transitions_and_values():
+    # count only state 2 neighbours; a cell becomes 2 when it sees any
+    def spread(cells, neighbourhood):
+        return np.where(neighbourhood((cells == 2).astype(np.intp)) > 0, 2, cells)
+
+    automaton = Automaton(np.array([[2, 0, 0, 1]]), Rule(spread, kernel=[[1, 0, 1]]))
+    assert automaton.run_until_stable() == 3
+    assert automaton.cells.tolist() == [[2, 2, 2, 2]]
+
+
+def test_line_of_sight_skips_cells_outside_the_mask():
+    mask = np.array([[True, False, False, True]])
+    left, right = line_of_sight(mask, [(0, -1), (0, 1)])
+    assert left.tolist() == [[-1, 0, 0, 0]]
+    assert right.tolist() == [[3, 3, 3, -1]]
+    links = line_of_sight(mask, [(0, 1), (0, -1)])
+    seen = Rule(np.zeros((2, 3)), links=links).neighbourhood(mask.astype(np.intp))
+    assert seen.tolist() == [[1, 2, 2, 1]]
@@ -0,0 +1,46 @@
+import pytest
+
+from aoc import bench
+from aoc.bench import Point
+
+
+def quadratic(sizes, overhead=2e-4, scale=1e-9):
+    return [Point(n, [overhead + scale * n * n]) for n in sizes]
+
+
+def test_fit_ignores_overhead_dominated_sizes():
+    points = quadratic(bench.ladder(16, 2, 11))
+    exponent, r2 = bench.fit(points)
+    assert exponent == pytest.approx(2, abs=0.1)
+    assert r2 > 0.99
+
+
+def test_fit_falls_back_to_the_larger_half():
+    # every size is quicker than the overhead threshold
+    points = quadratic(bench.ladder(16, 2, 8), overhead=1e-8, scale=1e-12)
+    exponent, _ = bench.fit(points)
+    assert exponent == pytest.approx(2, abs=0.3)
+
+
+def test_fit_needs_two_sizes():
+    assert bench.fit([Point(10, [1.0])]) == (None, None)
+    assert bench.fit([Point(10, [1.0]), Point(10, [2.0])]) == (None, None)
+
+
+def test_declared_exponent():
+    assert bench.declared_exponent("O(1)") == 0
+    assert bench.declared_exponent("O(n log n)") == 1
+    assert bench.declared_exponent("O(n^3)") == 3
+    assert bench.declared_exponent("O(2^n)") == float("inf")
+    assert bench.declared_exponent(None) is None
+
+
+def test_ladder_doubles_without_repeats():
+    assert bench.ladder(1, 1.5, 5) == [1, 2, 3, 5, 7]
+    assert bench.ladder(100, 2, 3) == [100, 200, 400]
+
+
+@pytest.mark.parametrize("factor", [1, 0.5])
+def test_ladder_must_grow(factor):
+    with pytest.raises(ValueError, match="must be over 1"):
+        bench.ladder(16, factor, 5)
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from utils.bits import BitReader, pattern, submasks
+
+
+def test_reads_match_a_bit_string():
+    rng = random.Random(1)
+    data = rng.randbytes(40)
+    bits = "".join(f"{byte:08b}" for byte in data)
+    reader, position = BitReader(data), 0
+    while len(reader) > 20:
+        n = rng.randrange(1, 20)
+        assert reader.read(n) == int(bits[position : position + n], 2)
+        position += n
+    assert len(reader) == len(bits) - position
+
+
+def test_from_hex_and_from_int():
+    reader = BitReader.from_hex("D2FE28\n")
+    assert (reader.read(3), reader.read(3), len(reader)) == (6, 4, 18)
+    odd = BitReader.from_hex("A")
+    assert len(odd) == 4 and odd.read(4) == 10
+    assert BitReader.from_int(0b10110, 5).read(5) == 0b10110
+
+
+def test_a_window_reads_only_its_bits_and_is_skipped():
+    reader = BitReader(bytes([0b10110011, 0b11110000]))
+    assert reader.read(2) == 0b10
+    window = reader.window(9)
+    assert len(reader) == 5
+    assert reader.read(5) == 0b10000
+    assert window.data.obj is reader.data.obj
+    inner = window.window(4)
+    assert (inner.read(4), window.read(5)) == (0b1100, 0b11111)
+    with pytest.raises(ValueError, match="can't read 1 bits with 0 left"):
+        window.read(1)
+
+
+def test_reading_past_the_end():
+    reader = BitReader(b"\xff", end=6)
+    with pytest.raises(ValueError):
+        reader.read(7)
+    with pytest.raises(ValueError):
+        reader.window(7)
+    assert reader.read(6) == 0b111111
+
+
+def test_pattern_and_submasks():
+    assert pattern("X1001X0") == 0b0100100
+    assert pattern("X1001X0", "X") == 0b1000010
+    assert list(submasks(0b101)) == [0b101, 0b100, 0b001, 0]
+    assert list(submasks(0)) == [0]
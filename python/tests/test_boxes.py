@@ -0,0 +1,78 @@
+import itertools
+import random
+
+import numpy as np
+
+from utils.boxes import Box, BoxSet, IntervalSet
+
+
+def cubes(box):
+    return set(itertools.product(*(range(low, high + 1) for low, high in box.ranges)))
+
+
+def random_box(rng, size=6):
+    ranges = []
+    for _ in range(3):
+        low = rng.randrange(size)
+        ranges.append((low, rng.randrange(low, size)))
+    return Box.of(*ranges)
+
+
+def test_box_basics():
+    box = Box.of((1, 3), (0, 0), (-2, 2))
+    assert box.volume() == 3 * 1 * 5
+    assert (2, 0, -2) in box and (4, 0, 0) not in box
+    assert box.contains(np.array([[1, 0, 0], [1, 1, 0]])).tolist() == [True, False]
+    assert box & Box.of((3, 9), (0, 9), (2, 9)) == Box.of((3, 3), (0, 0), (2, 2))
+    assert box & Box.of((4, 9), (0, 0), (0, 0)) is None
+    assert not Box((1,), (0,)) and Box((1,), (0,)).volume() == 0
+
+
+def test_difference_is_disjoint_and_exact():
+    rng = random.Random(1)
+    for _ in range(200):
+        a, b = random_box(rng), random_box(rng)
+        pieces = a - b
+        covered = [cubes(p) for p in pieces]
+        assert set().union(*covered) == cubes(a) - cubes(b)
+        assert sum(map(len, covered)) == len(cubes(a) - cubes(b))
+
+
+def test_box_set_matches_a_set_of_cubes():
+    rng = random.Random(2)
+    boxes, on = BoxSet(), set()
+    for _ in range(60):
+        box = random_box(rng)
+        if rng.random() < 0.6:
+            boxes.add(box)
+            on |= cubes(box)
+        else:
+            boxes.discard(box)
+            on -= cubes(box)
+        assert boxes.volume() == len(on)
+    point = next(iter(on))
+    assert point in boxes
+    assert set().union(*map(cubes, boxes)) == on
+
+
+def test_interval_set_merges_overlapping_and_touching():
+    intervals = IntervalSet([(5, 8), (1, 3), (4, 4), (10, 12), (11, 20), (7, 6)])
+    assert list(intervals) == [(1, 8), (10, 20)]
+    assert len(intervals) == 8 + 11
+    assert 9 not in intervals and 10 in intervals and 0 not in intervals
+    assert intervals.contains([0, 1, 9, 20, 21]).tolist() == [False, True, False, True, False]
+    assert IntervalSet().contains([1, 2]).tolist() == [False, False]
+
+
+def test_interval_set_union_and_intersection_match_sets():
+    rng = random.Random(3)
+
+    def random_set():
+        pairs = [(s, s + rng.randrange(6)) for s in (rng.randrange(50) for _ in range(5))]
+        return IntervalSet(pairs), set().union(*(range(s, e + 1) for s, e in pairs))
+
+    for _ in range(100):
+        (a, a_values), (b, b_values) = random_set(), random_set()
+        assert set(np.flatnonzero((a | b).contains(np.arange(60)))) == a_values | b_values
+        assert set(np.flatnonzero((a & b).contains(np.arange(60)))) == a_values & b_values
+        assert a | b == b | a
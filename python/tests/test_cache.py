@@ -0,0 +1,163 @@
+import os
+import sys
+import textwrap
+import types
+
+import pytest
+
+from aoc import cache, puzzles, runner
+from aoc.puzzles import Puzzle
+
+SOLVER = Puzzle(2099, 1)
+
+SOURCE = """
+import collections
+
+from aoc import bench
+import helpers
+
+
+def prepare(data):
+    return (parse_line(data),)
+
+
+def parse_line(line):
+    return helpers.split(line)
+
+
+def part_one(words):
+    return len(words)
+"""
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(puzzles, "ROOT", tmp_path)
+    monkeypatch.setattr(puzzles, "_loaded", {})
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.setattr(sys, "modules", dict(sys.modules))
+    (tmp_path / "2099").mkdir()
+    write(tmp_path / "2099" / "q01.py", SOURCE)
+    write(tmp_path / "helpers.py", "import words\n\n\ndef split(line):\n    return line.split()\n")
+    write(tmp_path / "words.py", "SEP = ' '\n")
+    write(tmp_path / "unrelated.py", "X = 1\n")
+    yield tmp_path
+
+
+def write(path, source):
+    path.write_text(textwrap.dedent(source))
+
+
+def edit(path, old, new):
+    # a later mtime than the file had, however quickly the edits follow each other
+    mtime = path.stat().st_mtime_ns + 10 ** 9
+    path.write_text(path.read_text().replace(old, new))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_local_imports_are_followed_transitively(root):
+    assert cache.local_imports(SOLVER.path) == {root / "helpers.py", root / "words.py"}
+
+
+def test_source_hash_follows_local_modules(root):
+    before = cache.source_hash(SOLVER)
+    edit(root / "unrelated.py", "1", "2")
+    assert cache.source_hash(SOLVER) == before
+    edit(root / "words.py", "' '", "','")
+    assert cache.source_hash(SOLVER) != before
+
+
+def test_editing_a_part_keeps_the_parser_hash(root):
+    parser, source = cache.parser_hash(SOLVER), cache.source_hash(SOLVER)
+    edit(SOLVER.path, "len(words)", "len(words) + 1")
+    assert cache.parser_hash(SOLVER) == parser
+    assert cache.source_hash(SOLVER) != source
+
+
+@pytest.mark.parametrize(
+    "path, old, new",
+    [
+        ("2099/q01.py", "(parse_line(data),)", "(parse_line(data.strip()),)"),
+        ("2099/q01.py", "helpers.split(line)", "helpers.split(line.lower())"),
+        ("helpers.py", "line.split()", "line.split(',')"),
+    ],
+)
+def test_editing_the_parser_changes_its_hash(root, path, old, new):
+    before = cache.parser_hash(SOLVER)
+    edit(root / path, old, new)
+    assert cache.parser_hash(SOLVER) != before
+
+
+def test_parsed_inputs_are_reparsed_after_the_parser_changes(root, tmp_path):
+    store = cache.Cache(tmp_path / "cache")
+    calls = []
+
+    def prepare(data):
+        calls.append(data)
+        return (data.split(),)
+
+    module = types.SimpleNamespace(prepare=prepare)
+    first, _, hit = runner.parse(SOLVER, module, "a b", "hash", store, min_seconds=0)
+    assert (first, hit) == ((["a", "b"],), False)
+    again, _, hit = runner.parse(SOLVER, module, "a b", "hash", store, min_seconds=0)
+    assert (again, hit) == ((["a", "b"],), True)
+    assert again[0] is not first[0]
+    edit(SOLVER.path, "(parse_line(data),)", "(parse_line(data.strip()),)")
+    _, _, hit = runner.parse(SOLVER, module, "a b", "hash", store, min_seconds=0)
+    assert not hit
+    assert len(calls) == 2
+
+
+def test_an_edited_solver_is_loaded_again(root):
+    module = puzzles.load(SOLVER)
+    assert puzzles.load(SOLVER) is module
+    edit(SOLVER.path, "len(words)", "len(words) + 1")
+    assert puzzles.stale(SOLVER)
+    assert puzzles.load(SOLVER).part_one(["a"]) == 2
+    assert not puzzles.stale(SOLVER)
+
+
+def test_an_edited_local_module_is_imported_again(root):
+    assert puzzles.load(SOLVER).prepare("a,b c") == (["a,b", "c"],)
+    edit(root / "helpers.py", "line.split()", "line.split(',')")
+    assert puzzles.load(SOLVER).prepare("a,b c") == (["a", "b c"],)
+
+
+def test_answers_are_cached_under_the_source_that_ran(root, tmp_path):
+    options = dict(cache_dir=str(tmp_path / "cache"), use_cache=True)
+    # loaded before the edit, as by a long lived worker
+    puzzles.load(SOLVER)
+    edit(SOLVER.path, "len(words)", "len(words) + 1000")
+    first = runner.solve(SOLVER, "part_one", "a b", **options)
+    assert (first.answer, first.cached) == (1002, False)
+    again = runner.solve(SOLVER, "part_one", "a b", **options)
+    assert (again.answer, again.cached) == (1002, True)
+    edit(SOLVER.path, "len(words) + 1000", "len(words)")
+    assert runner.solve(SOLVER, "part_one", "a b", **options).answer == 2
+
+
+def test_get_and_put(tmp_path):
+    store = cache.Cache(tmp_path)
+    assert store.get("answers", "k1") is None
+    store.put("answers", "k1", {"answer": 42})
+    assert store.get("answers", "k1") == {"answer": 42}
+
+
+def test_a_corrupt_entry_is_a_miss_and_removed(tmp_path):
+    store = cache.Cache(tmp_path)
+    store.put("answers", "k1", 42)
+    store.path("answers", "k1").write_bytes(b"\x80")
+    assert store.get("answers", "k1", "missing") == "missing"
+    assert not store.path("answers", "k1").exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    store = cache.Cache(tmp_path, max_bytes=10 ** 6)
+    for n, name in enumerate(["old", "used", "new"]):
+        store.put("answers", name, bytes(4000))
+        os.utime(store.path("answers", name), (n, n))
+    store.get("answers", "used")
+    store.evict(9000)
+    assert [path.name for _, _, path in store.entries()] == ["new", "used"]
+    assert store.clear() > 0
+    assert store.size() == 0
@@ -0,0 +1,145 @@
+import sys
+import textwrap
+
+import pytest
+
+from aoc import budgets, checks, inputs, memory, puzzles
+from aoc.budgets import Budget
+from aoc.puzzles import Puzzle
+
+SOLVER = Puzzle(2099, 1)
+
+SOURCE = """
+import time
+
+from aoc import memory
+from aoc.budgets import budget
+
+
+def prepare(data):
+    return (int(data),)
+
+
+@budget(ms=1000, mb=20)
+def quick(n):
+    return n + 1
+
+
+@budget(ms=20)
+def slow(n, seconds=0.05):
+    time.sleep(seconds)
+    return n
+
+
+@budget(ms=20)
+def stuck(n):
+    time.sleep(10)
+
+
+@budget(mb=20)
+def large(n):
+    # filled rather than zeroed, so that every page is resident
+    return len(b"x" * (n * memory.MB))
+
+
+@budget(mb=10, size=500)
+def runaway(n, size=0):
+    return len(b"x" * (size * memory.MB))
+
+
+alias = quick
+"""
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(puzzles, "ROOT", tmp_path)
+    monkeypatch.setattr(puzzles, "_loaded", {})
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.setattr(sys, "modules", dict(sys.modules))
+    (tmp_path / "2099").mkdir()
+    (tmp_path / "2099" / "q01.py").write_text(textwrap.dedent(SOURCE))
+    inputs.InputStore(tmp_path / "inputs").add(SOLVER.year, SOLVER.day, "30\n")
+    yield str(tmp_path / "inputs")
+
+
+def measure(function, store, scale=1.0):
+    # the check runs each function in a fresh worker, here the peak is restarted instead
+    memory.reset_peak_rss()
+    return checks.measure(SOLVER, function, scale, store)
+
+
+def test_budgeted_names_each_function_once(store):
+    module = puzzles.load(SOLVER)
+    assert budgets.budgeted(module) == ["quick", "slow", "stuck", "large", "runaway"]
+    assert module.runaway.budget == Budget(ms=None, mb=10, kwargs={"size": 500})
+
+
+def test_budgets_declared_by_solvers():
+    q09 = puzzles.load(Puzzle(2020, 9))
+    assert budgets.budgeted(q09) == ["part_one_optimised", "part_one_pairs"]
+    assert q09.part_one_pairs.budget == Budget(ms=40, mb=5)
+    q15 = puzzles.load(Puzzle(2020, 15))
+    assert budgets.budgeted(q15) == ["solve_dict", "solve_preallocate"]
+    assert q15.solve_dict.budget.kwargs == {"target": 30_000_000}
+
+
+def test_time_budgets_scale_with_the_host():
+    check = checks.Check(SOLVER, "f", Budget(ms=40, mb=5), scale=2.0)
+    assert check.allowed == pytest.approx(0.08)
+    assert checks.Check(SOLVER, "f", Budget(mb=5), scale=2.0).allowed is None
+    check.seconds, check.used = 0.07, 5 * memory.MB
+    assert check.ok and check.over == []
+    check.seconds, check.used = 0.09, 6 * memory.MB
+    assert check.over == ["time", "memory"]
+    assert not check.ok
+
+
+def test_calibrate():
+    assert checks.calibration_loop(1000) == checks.calibration_loop(1000)
+    assert 0 < checks.calibrate(repeats=1) < 100 * checks.REFERENCE_SECONDS
+
+
+def test_within_budget(store):
+    check = measure("quick", store)
+    assert check.ok, check.error
+    assert 0 <= check.seconds < check.allowed
+    assert check.used < 20 * memory.MB
+
+
+def test_over_the_time_budget(store):
+    check = measure("slow", store)
+    assert check.error is None
+    assert check.over == ["time"]
+    # the same function on a host ten times slower than the reference is within budget
+    assert measure("slow", store, scale=10).ok
+
+
+def test_stopped_at_four_times_the_time_budget(store):
+    check = measure("stuck", store)
+    assert check.error == "stopped after 80.0ms"
+    assert check.seconds is None and not check.ok
+
+
+def test_over_the_memory_budget(store):
+    check = measure("large", store)
+    assert check.error is None
+    assert check.used >= 25 * memory.MB
+    assert check.over == ["memory"]
+
+
+def test_stopped_at_the_address_space_limit(store):
+    check = measure("runaway", store)
+    assert check.error == "BudgetExceeded: ran out of memory at twice the budget of 10.0 MB"
+    assert not check.ok
+    # and the limit is lifted afterwards
+    assert measure("large", store).error is None
+
+
+def test_report(store):
+    found = [measure("quick", store), measure("slow", store), measure("stuck", store)]
+    report = checks.report(found, 1.0).splitlines()
+    assert report[0] == "time budgets scaled by 1.00 for this host"
+    assert report[2].endswith("ok")
+    assert report[3].endswith("OVER BUDGET (time)")
+    assert report[4].endswith("stopped after 80.0ms")
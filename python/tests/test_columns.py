@@ -0,0 +1,78 @@
+import array
+import io
+
+import pytest
+
+from utils.columns import Categorical, parse_columns, stream_columns
+
+COMMANDS = "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n"
+
+
+def test_parse_columns():
+    direction, amount = parse_columns(COMMANDS, [str, int])
+    assert amount == array.array("q", [5, 5, 8, 3, 8, 2])
+    assert list(direction) == ["forward", "down", "forward", "up", "down", "forward"]
+    assert direction.levels == ["forward", "down", "up"]
+    assert list(zip(direction, amount))[3] == ("up", 3)
+
+
+def test_other_separators_and_types():
+    x, y, tag = parse_columns("1.5,2,a\n-3,4,b", [float, int, tuple], separator=",")
+    assert x == array.array("d", [1.5, -3.0])
+    assert y == array.array("q", [2, 4])
+    assert tag == [("a",), ("b",)]
+
+
+def test_empty_input():
+    direction, amount = parse_columns("\n", [str, int])
+    assert len(direction) == len(amount) == 0
+
+
+@pytest.mark.parametrize(
+    "data, line",
+    [
+        ("a 1\nb\nc 3 4\n", 2),
+        # the same number of fields in total, but not on every line
+        ("a 1\nb\nc 3 4\nd 5\n", 2),
+        ("a 1\n\nb 2\n", 2),
+        ("\n\na 1\nb 2 3\n", 4),
+    ],
+)
+def test_the_first_bad_line_is_named(data, line):
+    with pytest.raises(ValueError, match=f"line {line}: expected 2 fields"):
+        parse_columns(data, [str, int])
+
+
+def test_categorical():
+    column = Categorical.encode(["b", "a", "b", "c"])
+    assert column.codes == array.array("l", [0, 1, 0, 2])
+    assert column.code("c") == 2
+    assert column[2] == "b"
+    assert len(column) == 4
+    assert list(column) == ["b", "a", "b", "c"]
+
+
+def test_categorical_levels_shared_between_calls():
+    index = {}
+    first = Categorical.encode(["x", "y"], index)
+    second = Categorical.encode(["z", "x"], index)
+    assert list(second.codes) == [2, 0]
+    assert second.levels == ["x", "y", "z"]
+    assert first.levels == ["x", "y"]
+
+
+def test_stream_columns_in_batches():
+    batches = list(stream_columns(io.StringIO(COMMANDS), [str, int], batch=4))
+    assert [len(amount) for _, amount in batches] == [4, 2]
+    # later batches keep the codes of the first
+    assert batches[1][0].levels == ["forward", "down", "up"]
+    assert list(batches[1][0].codes) == [1, 0]
+    assert [list(c) for c in parse_columns(COMMANDS, [str, int])] == [
+        sum((list(batch[n]) for batch in batches), []) for n in range(2)
+    ]
+
+
+def test_stream_columns_counts_lines_across_batches():
+    lines = ["a 1", "b 2", "c 3", "d"]
+    with pytest.raises(ValueError, match="line 4:"):
+        list(stream_columns(lines, [str, int], batch=2))
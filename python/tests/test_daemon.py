@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from aoc import daemon, generators, memory, runner
+from aoc.puzzles import Puzzle
+
+EXPENSES = Puzzle(2020, 1)
+PASSWORDS = Puzzle(2020, 2)
+
+
+@pytest.fixture(scope="module")
+def socket_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("daemon") / "d.sock"
+    server = daemon.Server(
+        path, workers=1, store=str(path.parent / "inputs"), selected=[EXPENSES, PASSWORDS]
+    )
+    thread = threading.Thread(target=server.run)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not daemon.alive(path):
+        assert thread.is_alive() and time.monotonic() < deadline, "the daemon didn't start"
+        time.sleep(0.05)
+    yield path
+    with daemon.Client(path) as client:
+        client.request("shutdown")
+    thread.join(30)
+    assert not path.exists()
+
+
+def test_results_survive_the_wire():
+    result = runner.Result(
+        EXPENSES,
+        "part_one",
+        answer=np.int64(7),
+        wall=0.5,
+        sites=[memory.Site("q01.py:3", 100, 2)],
+        input_hash="abc",
+    )
+    decoded = daemon.decode(daemon.encode(result))
+    assert decoded == runner.Result(
+        EXPENSES,
+        "part_one",
+        answer=7,
+        wall=0.5,
+        sites=[memory.Site("q01.py:3", 100, 2)],
+        input_hash="abc",
+    )
+    assert type(decoded.answer) is int
+
+
+def test_jsonable():
+    assert daemon.jsonable((1, "a", [np.float64(0.5)])) == [1, "a", [0.5]]
+    assert daemon.jsonable({1}) == "{1}"
+
+
+def test_ping_and_jobs(socket_path):
+    with daemon.Client(socket_path) as client:
+        assert client.request("ping")["workers"] == 1
+        assert client.jobs([2020], [1]) == [(EXPENSES, "part_one"), (EXPENSES, "part_two")]
+
+
+def test_solve_on_the_daemon(socket_path):
+    data = generators.generate(2020, 1, 50)
+    direct = runner.solve(EXPENSES, "part_two", data)
+    with daemon.Client(socket_path) as client:
+        result = client.solve(2020, 1, "part_two", data)
+    assert result.ok, result.error
+    assert result.answer == direct.answer
+
+
+def test_solve_all_answers_in_order(socket_path):
+    jobs = [(PASSWORDS, "part_one"), (EXPENSES, "part_one"), (PASSWORDS, "part_two")]
+    with daemon.Client(socket_path) as client:
+        # the daemon's input store is empty, so each part reports its missing input
+        results = client.solve_all(jobs)
+    assert [(r.puzzle, r.part) for r in results] == jobs
+    assert all("MissingInput" in r.error for r in results)
+
+
+def test_bad_requests_are_answered_with_an_error(socket_path):
+    with daemon.Client(socket_path) as client:
+        with pytest.raises(daemon.DaemonError, match="unknown op 'fly'"):
+            client.request("fly")
+        client.file.write(b"not json\n")
+        client.file.flush()
+        assert "JSONDecodeError" in client.receive()["error"]
+        with pytest.raises(daemon.DaemonError, match="unknown options pipeline"):
+            client.solve(2020, 1, "part_one", "1721\n299", pipeline=True)
+        # and the connection still works
+        assert client.request("ping")["workers"] == 1
+
+
+def test_no_daemon(tmp_path):
+    with pytest.raises(daemon.DaemonError, match="no daemon"):
+        daemon.Client(tmp_path / "none.sock")
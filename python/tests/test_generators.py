@@ -0,0 +1,41 @@
+import pytest
+
+from aoc import generators, runner
+from aoc.puzzles import Puzzle
+
+# solving these takes seconds whatever the size: 30 million turns, and beacon scanners and
+# Dirac dice that don't shrink with the input
+SLOW = {(2020, 15), (2021, 19), (2021, 21)}
+
+
+def test_same_seed_same_input():
+    for year, day in generators.available():
+        assert generators.generate(year, day, 8, seed=3) == generators.generate(
+            year, day, 8, seed=3
+        ), (year, day)
+
+
+def test_seed_varies_the_input():
+    assert generators.generate(2021, 1, 50, seed=1) != generators.generate(2021, 1, 50, seed=2)
+
+
+def test_size_is_the_number_of_lines():
+    for size in (1, 10, 100):
+        assert len(generators.generate(2021, 1, size).splitlines()) == size
+
+
+def test_unknown_puzzle_and_bad_size():
+    with pytest.raises(LookupError):
+        generators.generate(2019, 1, 10)
+    with pytest.raises(ValueError):
+        generators.generate(2021, 1, 0)
+
+
+@pytest.mark.parametrize(
+    "year, day", [p for p in generators.available() if p not in SLOW], ids=lambda v: str(v)
+)
+def test_solvers_answer_generated_inputs(year, day):
+    data = generators.generate(year, day, 10, seed=1)
+    for part in ("part_one", "part_two"):
+        result = runner.solve(Puzzle(year, day), part, data, use_cache=False)
+        assert result.ok, result.error
@@ -0,0 +1,110 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from utils.graph import Graph
+
+# the 2020 q07 example: which bags hold which, and how many
+BAGS = [
+    ("light red", "bright white", 1),
+    ("light red", "muted yellow", 2),
+    ("dark orange", "bright white", 3),
+    ("dark orange", "muted yellow", 4),
+    ("bright white", "shiny gold", 1),
+    ("muted yellow", "shiny gold", 2),
+    ("muted yellow", "faded blue", 9),
+    ("shiny gold", "dark olive", 1),
+    ("shiny gold", "vibrant plum", 2),
+    ("dark olive", "faded blue", 3),
+    ("dark olive", "dotted black", 4),
+    ("vibrant plum", "faded blue", 5),
+    ("vibrant plum", "dotted black", 6),
+]
+
+
+def names(graph, ids):
+    return {graph.names[n] for n in ids}
+
+
+def edges(graph):
+    return [(n, target, w) for n in range(len(graph)) for target, w in graph.edges(n)]
+
+
+def test_from_edges_numbers_names_in_order():
+    graph = Graph.from_edges(BAGS)
+    assert len(graph) == 9
+    assert graph.names[:3] == ["light red", "bright white", "muted yellow"]
+    red = graph.id("light red")
+    assert list(graph.edges(red)) == [(graph.id("bright white"), 1), (graph.id("muted yellow"), 2)]
+    assert names(graph, graph.neighbours(red)) == {"bright white", "muted yellow"}
+
+
+def test_reachable_and_ancestors():
+    graph = Graph.from_edges(BAGS)
+    gold = graph.id("shiny gold")
+    assert names(graph, graph.ancestors(gold)) == {
+        "bright white",
+        "muted yellow",
+        "dark orange",
+        "light red",
+    }
+    assert names(graph, graph.reachable(gold)) == {
+        "shiny gold",
+        "dark olive",
+        "vibrant plum",
+        "faded blue",
+        "dotted black",
+    }
+
+
+def test_fold_counts_bags_inside():
+    graph = Graph.from_edges(BAGS)
+    inside = graph.fold(lambda node, edges: sum(w * (1 + held) for _, w, held in edges))
+    assert inside[graph.id("shiny gold")] == 32
+
+
+def test_topological_order_and_cycles():
+    graph = Graph.from_edges(BAGS)
+    position = {node: n for n, node in enumerate(graph.topological_order())}
+    assert all(position[a] < position[b] for a, b, _ in edges(graph))
+    with pytest.raises(ValueError, match="cycle"):
+        Graph.from_edges([(1, 2), (2, 3), (3, 1)]).topological_order()
+
+
+def test_bfs_and_dfs():
+    graph = Graph.from_edges([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("e", "a")])
+    assert graph.bfs(graph.id("a")) == [0, 1, 1, 2, -1]
+    assert [graph.names[n] for n in graph.dfs(graph.id("a"))] == ["a", "b", "d", "c"]
+    undirected = Graph.from_edges([("a", "b")], undirected=True)
+    assert undirected.bfs(undirected.id("b")) == [1, 0]
+
+
+def dijkstra(graph, source):
+    distances = [float("inf")] * len(graph)
+    distances[source] = 0
+    heap = [(0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        for target, weight in graph.edges(node):
+            if distance + weight < distances[target]:
+                distances[target] = distance + weight
+                heapq.heappush(heap, (distance + weight, target))
+    return distances
+
+
+def test_shortest_paths_on_a_lattice_match_a_heap():
+    costs = np.random.default_rng(1).integers(1, 10, size=(20, 30))
+    graph = Graph.lattice(costs.shape, costs)
+    assert len(graph) == 600
+    distances = graph.shortest_paths(0)
+    assert distances == dijkstra(graph, 0)
+    # stopping at the target still gets its distance right
+    assert graph.shortest_paths(0, 599)[599] == distances[599]
+
+
+def test_shortest_paths_with_unreachable_nodes():
+    graph = Graph.from_arrays(3, [0], [1], [4])
+    assert graph.shortest_paths(0) == [0, 4, float("inf")]
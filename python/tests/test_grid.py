@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from utils.grid import Grid
+
+DIGITS = "123\n456\n"
+
+
+def test_parse_digits_and_mapped_characters():
+    grid = Grid.parse(DIGITS)
+    assert grid.shape == (2, 3)
+    assert grid.cells.tolist() == [[1, 2, 3], [4, 5, 6]]
+    assert Grid.parse("#.\r\n.#", {"#": 1, ".": 0}).cells.tolist() == [[1, 0], [0, 1]]
+
+
+@pytest.mark.parametrize("text", ["12\n345\n", "123\n45\n", "\n", "12\n3x\n"])
+def test_parse_rejects_ragged_and_unknown(text):
+    with pytest.raises(ValueError):
+        Grid.parse(text)
+
+
+def test_shifted_and_neighbours():
+    grid = Grid.parse(DIGITS)
+    # the cell above each cell, 0 above the top row
+    assert grid.shifted(-1, 0).tolist() == [[0, 0, 0], [1, 2, 3]]
+    assert grid.shifted(0, 2, fill=9).tolist() == [[3, 9, 9], [6, 9, 9]]
+    up, down, left, right = grid.neighbours()
+    assert left.tolist() == [[0, 1, 2], [0, 4, 5]]
+    assert len(grid.neighbours(diagonal=True)) == 8
+    lows = (grid.cells < np.stack(grid.neighbours(fill=10))).all(axis=0)
+    assert lows.tolist() == [[True, False, False], [False, False, False]]
+
+
+def test_from_points_pad_tile_and_render():
+    grid = Grid.from_points([0, 1], [2, 0])
+    assert grid.render(".#") == "..#\n#..\n"
+    assert grid.pad().shape == (4, 5)
+    assert Grid.parse("12").tile(2, 2).render() == "1212\n1212\n"
+    assert str(Grid.parse(DIGITS)) == DIGITS
+
+
+def test_components():
+    grid = Grid.parse("1101\n0011\n1000\n1011\n")
+    labels = grid.components(grid.cells == 1)
+    assert labels.tolist() == [
+        [0, 0, -1, 3],
+        [-1, -1, 3, 3],
+        [8, -1, -1, -1],
+        [8, -1, 14, 14],
+    ]
+
+
+def test_components_of_a_winding_region():
+    # a spiral, which a pass per step along the path would take long to label
+    grid = Grid.parse("11111\n00001\n11101\n10001\n11111\n")
+    labels = grid.components(grid.cells == 1)
+    assert set(labels[grid.cells == 1].tolist()) == {0}
@@ -0,0 +1,45 @@
+import argparse
+
+from aoc import __main__ as cli
+from aoc import history
+from aoc.history import Timing
+
+
+def timing(wall, input_hash="abc"):
+    return Timing(2021, 1, "part_one", input_hash, wall)
+
+
+def test_regression_against_earlier_runs(tmp_path):
+    with history.History(tmp_path / "history.sqlite") as db:
+        for wall in (0.100, 0.102, 0.098, 0.101):
+            db.record("run", [timing(wall)])
+        assert db.compare() == []
+        latest = db.record("run", [timing(0.150)])
+        [regression] = db.compare(latest)
+        assert regression.wall == 0.150
+        assert regression.samples == 4
+
+
+def test_other_inputs_are_not_a_baseline(tmp_path):
+    with history.History(tmp_path / "history.sqlite") as db:
+        for wall in (0.100, 0.102, 0.098):
+            db.record("run", [timing(wall, "other")])
+        db.record("run", [timing(0.150)])
+        assert db.compare() == []
+
+
+def test_costs_average_recent_successful_runs(tmp_path):
+    with history.History(tmp_path / "history.sqlite") as db:
+        db.record("run", [timing(1.0), Timing(2021, 2, "part_one", "x", None, error="boom")])
+        db.record("run", [timing(3.0)])
+        db.record("bench", [timing(100.0)])
+        assert db.costs() == {(2021, 1, "part_one"): 2.0}
+
+
+def test_record_skips_a_run_that_timed_nothing(tmp_path, capsys):
+    path = tmp_path / "history.sqlite"
+    args = argparse.Namespace(no_history=False, history=str(path))
+    cli.record(args, "run", [])
+    assert not path.exists()
+    cli.record(args, "run", [timing(0.1)])
+    assert "recorded as run 1" in capsys.readouterr().out
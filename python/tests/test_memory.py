@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+from aoc import memory
+
+
+def hold(mb):
+    held = [bytes(memory.MB) for _ in range(mb)]
+    # long enough for the tracker's CPU timer to see it
+    end = time.process_time() + 0.05
+    while time.process_time() < end:
+        pass
+    return len(held)
+
+
+def test_tracker_finds_the_peak_and_where_it_was_held():
+    answer, usage = memory.Tracker(interval=0.001).run(hold, (20,))
+    assert answer == 20
+    assert 20 * memory.MB <= usage.peak < 25 * memory.MB
+    assert usage.sites[0].location.startswith(__file__)
+    assert usage.sites[0].size >= 15 * memory.MB
+
+
+def test_address_space_limit_stops_a_runaway_part():
+    with pytest.raises(memory.BudgetExceeded, match="twice the budget of 10.0 MB"):
+        with memory.address_space_limit(10 * memory.MB):
+            bytearray(500 * memory.MB)
+    # and the limit is lifted afterwards
+    assert len(bytearray(100 * memory.MB)) == 100 * memory.MB
+
+
+def test_check_budget():
+    memory.check_budget(5 * memory.MB, 10 * memory.MB, "peak")
+    memory.check_budget(5 * memory.MB, None, "peak")
+    with pytest.raises(memory.BudgetExceeded, match="peak of 15.0 MB is over"):
+        memory.check_budget(15 * memory.MB, 10 * memory.MB, "peak")
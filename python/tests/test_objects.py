@@ -0,0 +1,31 @@
+from aoc import objects, puzzles, samples
+from aoc.puzzles import Puzzle
+
+
+def test_every_sampled_class_exists_and_makes_distinct_objects():
+    for year, day in samples.available():
+        module = puzzles.load(Puzzle(year, day))
+        makers = samples.samples(year, day, module)
+        assert makers, (year, day)
+        for name, make in makers.items():
+            assert make(1) == make(1), name
+            assert make(1) != make(2), name
+
+
+def test_collect_skips_puzzles_without_samples():
+    assert objects.collect(Puzzle(2020, 1), count=10, repeats=1) == []
+
+
+def test_collect_measures_registered_classes():
+    (sample,) = objects.collect(Puzzle(2021, 19), count=100, repeats=1)
+    assert sample.key == "2021 q19 Beacon"
+    assert sample.bytes_per_object > 0
+    assert sample.hashes_per_second and sample.comparisons_per_second
+
+
+def test_report_compares_with_baseline(tmp_path):
+    before = objects.Sample("2021 q19", "Beacon", 10, 200.0, 1000.0, 500.0)
+    after = objects.Sample("2021 q19", "Beacon", 10, 100.0, 2000.0, 500.0)
+    objects.dump([before], tmp_path / "before.json")
+    text = objects.report([after], objects.load(tmp_path / "before.json"))
+    assert "(0.50x)" in text and "(2.00x)" in text and "(1.00x)" in text
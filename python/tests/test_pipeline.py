@@ -0,0 +1,85 @@
+import asyncio
+import concurrent.futures
+
+from aoc import generators, inputs, pipeline, runner
+from aoc.puzzles import Puzzle
+
+SELECTED = [Puzzle(2021, day) for day in range(1, 11)]
+
+
+class HeldPool:
+    """Takes parts like a process pool, but only finishes them when told to."""
+
+    def __init__(self):
+        self.held = []
+
+    def submit(self, func, *args):
+        future = concurrent.futures.Future()
+        self.held.append((future, func.args[:2]))
+        return future
+
+    def finish_one(self):
+        future, (puzzle, part) = self.held.pop(0)
+        future.set_result(runner.Result(puzzle, part, answer=f"{puzzle} {part}"))
+
+
+def fill_store(tmp_path):
+    store = inputs.InputStore(tmp_path)
+    for puzzle in SELECTED:
+        store.add(puzzle.year, puzzle.day, generators.generate(puzzle.year, puzzle.day, 10))
+    return str(tmp_path)
+
+
+async def settle():
+    # the load and parse stages run in threads, give them time to go as far as they can
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+def test_stages_stop_at_depth_while_the_workers_are_busy(tmp_path, monkeypatch):
+    loaded, parsed = [], []
+    text = inputs.InputStore.text
+    monkeypatch.setattr(
+        inputs.InputStore, "text", lambda self, *day: loaded.append(day) or text(self, *day)
+    )
+    monkeypatch.setattr(
+        pipeline.Pipeline, "prepare", lambda self, work: parsed.append(work.puzzle)
+    )
+    jobs = runner.jobs(SELECTED)
+    work = pipeline.Pipeline(jobs, workers=1, store=fill_store(tmp_path), depth=2)
+    pool = HeldPool()
+
+    async def run():
+        to_parse, to_solve = asyncio.Queue(work.depth), asyncio.Queue(work.depth)
+        stages = asyncio.gather(
+            work.load(to_parse), work.parse(to_parse, to_solve), work.solve(to_solve, pool)
+        )
+        await settle()
+        # one puzzle being solved; then per stage `depth` puzzles queued plus one waiting to
+        # put its output in a full queue
+        assert len(pool.held) == 1
+        assert len(parsed) == 1 + 2 + 1
+        assert len(loaded) == len(parsed) + 2 + 1
+        pool.finish_one()
+        await settle()
+        assert len(pool.held) == 1
+        while not stages.done():
+            if pool.held:
+                pool.finish_one()
+            await asyncio.sleep(0.01)
+        await stages
+
+    asyncio.run(run())
+    assert len(loaded) == len(parsed) == len(SELECTED)
+    assert sorted(work.results) == sorted(jobs)
+    assert all(r.answer == f"{p} {part}" for (p, part), r in work.results.items())
+
+
+def test_answers_match_the_runner(tmp_path):
+    store = fill_store(tmp_path)
+    piped, _ = pipeline.run(SELECTED[:3], workers=2, store=store, depth=1)
+    plain, _ = runner.run(SELECTED[:3], workers=2, store=store)
+    assert [(r.puzzle, r.part, r.answer) for r in piped] == [
+        (r.puzzle, r.part, r.answer) for r in plain
+    ]
+    assert all(r.ok for r in piped), [r.error for r in piped]
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from aoc import profiling
+
+
+def spin(seconds):
+    end = time.process_time() + seconds
+    total = 0
+    while time.process_time() < end:
+        total += 1
+    return total
+
+
+def outer(seconds):
+    return spin(seconds) + spin(seconds)
+
+
+def read(path):
+    lines = path.read_text().splitlines()
+    return {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+
+
+def test_cprofile_collapses_stacks_under_the_part(tmp_path):
+    assert profiling.profile("cprofile", outer, (0.02,), tmp_path, "part") > 0
+    assert {p.name for p in tmp_path.iterdir()} == {"part.pstats", "part.txt", "part.collapsed"}
+    stacks = read(tmp_path / "part.collapsed")
+    assert all(stack.startswith("outer (test_profiling.py:") for stack in stacks)
+    # counts are microseconds, and both calls of spin land in the same stack
+    spun = sum(n for stack, n in stacks.items() if ";spin (test_profiling.py:" in stack)
+    assert spun > 0.04 * 1e6 * 0.9
+
+
+def test_sampler_counts_stacks_under_the_part(tmp_path):
+    profiling.profile("sample", outer, (0.1,), tmp_path, "part", interval=0.002)
+    assert {p.name for p in tmp_path.iterdir()} == {"part.txt", "part.collapsed"}
+    stacks = read(tmp_path / "part.collapsed")
+    assert stacks
+    assert all(stack.startswith("outer (test_profiling.py:") for stack in stacks)
+    assert any(";spin (test_profiling.py:" in stack for stack in stacks)
+    assert "samples every 2ms of CPU" in (tmp_path / "part.txt").read_text()
+
+
+def test_built_ins_keep_their_name():
+    assert profiling.frame_name("~", 0, "<built-in method len>") == "<built-in method len>"
+    assert profiling.frame_name("/a/b/q01.py", 3, "part_one") == "part_one (q01.py:3)"
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        profiling.profile("perf", outer, (0,), tmp_path, "part")
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+from aoc import generators, inputs, memory, puzzles, runner
+from aoc.puzzles import Puzzle
+
+EXPENSES = Puzzle(2020, 1)
+PASSWORDS = Puzzle(2020, 2)
+
+
+def store_with(tmp_path, *selected):
+    store = inputs.InputStore(tmp_path / "inputs")
+    for puzzle in selected:
+        store.add(puzzle.year, puzzle.day, generators.generate(puzzle.year, puzzle.day, 50))
+    return str(store.root)
+
+
+def test_solve_matches_calling_the_part():
+    data = generators.generate(2020, 1, 50)
+    module = puzzles.load(EXPENSES)
+    result = runner.solve(EXPENSES, "part_one", data)
+    assert result.ok, result.error
+    assert result.answer == module.part_one(*puzzles.prepare(module, data)), result.answer
+    assert result.input_hash == inputs.digest(data)
+
+
+def test_solve_reports_a_missing_input_as_an_error(tmp_path):
+    result = runner.solve(EXPENSES, "part_one", store=str(tmp_path))
+    assert not result.ok
+    assert "MissingInput" in result.error, result.error
+
+
+def test_solve_under_a_profiler(tmp_path):
+    data = generators.generate(2020, 1, 50)
+    plain = runner.solve(EXPENSES, "part_one", data)
+    profiled = runner.solve(
+        EXPENSES, "part_one", data, profile="cprofile", profile_dir=str(tmp_path)
+    )
+    assert profiled.answer == plain.answer, profiled.error
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".collapsed", ".pstats", ".txt"]
+
+
+def test_run_returns_results_in_puzzle_order(tmp_path):
+    store = store_with(tmp_path, EXPENSES, PASSWORDS)
+    results, elapsed = runner.run([PASSWORDS, EXPENSES], workers=2, store=store)
+    assert [(r.puzzle, r.part) for r in results] == [
+        (PASSWORDS, "part_one"),
+        (PASSWORDS, "part_two"),
+        (EXPENSES, "part_one"),
+        (EXPENSES, "part_two"),
+    ]
+    assert all(r.ok for r in results), [r.error for r in results]
+    assert elapsed > 0
+
+
+def test_workers_are_reused_from_part_to_part():
+    with runner.worker_pool(1) as pool:
+        pids = {pool.submit(os.getpid).result() for _ in range(4)}
+    assert len(pids) == 1, pids
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc/self/clear_refs")
+def test_peak_rss_restarts_for_each_part():
+    held = bytearray(200 * memory.MB)
+    del held
+    assert memory.peak_rss() > 200 * memory.MB
+    memory.reset_peak_rss()
+    assert memory.peak_rss() < 200 * memory.MB
@@ -0,0 +1,31 @@
+from aoc import scheduler
+from aoc.puzzles import Puzzle
+
+A, B, C = Puzzle(2021, 1), Puzzle(2021, 2), Puzzle(2021, 3)
+
+
+def test_parts_without_history_count_as_the_slowest():
+    jobs = [(A, "part_one"), (B, "part_one"), (C, "part_one")]
+    costs = {(2021, 1, "part_one"): 0.5, (2021, 2, "part_one"): 2.0}
+    assert scheduler.estimate(jobs, costs) == {
+        (A, "part_one"): 0.5,
+        (B, "part_one"): 2.0,
+        (C, "part_one"): 2.0,
+    }
+    assert scheduler.estimate(jobs, None) == dict.fromkeys(jobs, 1.0)
+
+
+def test_longest_first_keeps_puzzle_order_between_equals():
+    jobs = [(A, "part_one"), (A, "part_two"), (B, "part_one"), (C, "part_one")]
+    costs = {
+        (2021, 1, "part_one"): 0.1,
+        (2021, 1, "part_two"): 3.0,
+        (2021, 2, "part_one"): 0.1,
+        (2021, 3, "part_one"): 1.0,
+    }
+    assert scheduler.longest_first(jobs, costs) == [
+        (A, "part_two"),
+        (C, "part_one"),
+        (A, "part_one"),
+        (B, "part_one"),
+    ]
@@ -0,0 +1,85 @@
+import pickle
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from aoc import generators, puzzles
+from aoc.puzzles import Puzzle
+from utils import shm
+
+
+def row_sums(grid: shm.Shared, rows: range) -> int:
+    view = grid.view()
+    assert not view.flags.writeable
+    return int(view[rows.start : rows.stop].sum())
+
+
+def test_publish_and_view():
+    with shm.Arena() as arena:
+        handle = arena.publish([[1, 2, 3], [4, 5, 6]], dtype="int32")
+        view = handle.view()
+        assert view.dtype == np.int32 and view.shape == (2, 3)
+        assert view.tolist() == [[1, 2, 3], [4, 5, 6]]
+        with pytest.raises(ValueError):
+            view[0, 0] = 9
+        # the handle costs the same to send whatever the array's size
+        big = arena.publish(np.zeros(10 ** 6))
+        assert len(pickle.dumps(big)) < 200
+
+
+def test_publish_ragged():
+    with shm.Arena() as arena:
+        ragged = arena.publish_ragged([[1, 2], [], [3, 4, 5]])
+        assert len(ragged) == 3
+        assert [a.tolist() for a in ragged.view()] == [[1, 2], [], [3, 4, 5]]
+
+
+def test_closing_the_arena_unlinks_its_blocks():
+    with shm.Arena() as arena:
+        handle = arena.publish(np.arange(4))
+    with pytest.raises(FileNotFoundError):
+        shm.Shared(handle.name, handle.dtype, handle.shape).view()
+
+
+def test_fan_out_reads_the_block_in_every_worker():
+    with shm.Arena() as arena:
+        grid = arena.publish(np.arange(100).reshape(10, 10))
+        chunks = [range(0, 5), range(5, 10)]
+        assert shm.fan_out(row_sums, grid, chunks, workers=2) == [1225, 3725]
+
+
+def test_workers_leave_the_resource_tracker_alone(tmp_path):
+    # a worker that registered or unregistered the block would have the tracker unlink it
+    # early, warn about a leak, or fail to find it when the arena unlinks it
+    script = tmp_path / "fan.py"
+    script.write_text(
+        textwrap.dedent(
+            f"""
+            import sys
+            sys.path.insert(0, {str(puzzles.ROOT)!r})
+            from utils import shm
+
+            def total(numbers, _):
+                return int(numbers.view().sum())
+
+            if __name__ == "__main__":
+                with shm.Arena() as arena:
+                    numbers = arena.publish(list(range(10)))
+                    print(shm.fan_out(total, numbers, range(4), workers=2))
+                    print(numbers.view().sum())
+            """
+        )
+    )
+    done = subprocess.run([sys.executable, str(script)], capture_output=True, text=True)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.split("\n")[:2] == ["[45, 45, 45, 45]", "45"]
+    assert done.stderr == ""
+
+
+def test_snailfish_pairs_fanned_out_agree():
+    q18 = puzzles.load(Puzzle(2021, 18))
+    (sfns,) = q18.prepare(generators.generate(2021, 18, q18.FAN_OUT, seed=3))
+    assert q18.part_two(sfns, workers=2) == q18.part_two(sfns, workers=1)
@@ -0,0 +1,88 @@
+import subprocess
+import sys
+import types
+
+import pytest
+
+import utils
+from aoc import puzzles, startup
+
+# what each load must leave unimported: numpy, which the runner and these solvers don't need
+# until a part uses it, if at all, and the dependencies the solvers no longer use at all
+DEFERRED = {
+    "import aoc.__main__": ["numpy"],
+    "import utils.grid": ["numpy"],
+    "import utils.automaton": ["numpy"],
+    "import utils.graph": ["numpy"],
+    "import utils.boxes": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2020, 7))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2020, 11))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2020, 16))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 9))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 11))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 12))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 13))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 15))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 16))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 17))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 19))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 20))": ["numpy"],
+    "puzzles.load(puzzles.Puzzle(2021, 22))": ["numpy"],
+    "[puzzles.load(p) for p in puzzles.discover()]": [
+        "numpy",
+        "networkx",
+        "terminaltables",
+        "bitstring",
+    ],
+}
+
+
+def loaded_after(load, names):
+    """Which of `names` a fresh interpreter has executed after running `load`."""
+    probe = (
+        f"import sys, types; sys.path.insert(0, {str(puzzles.ROOT)!r})\n"
+        "from aoc import puzzles\n"
+        f"{load}\n"
+        # a lazily imported module is in sys.modules, but only becomes a plain module once used
+        f"print([n for n in {names!r} if type(sys.modules.get(n)) is types.ModuleType])"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    return eval(out.stdout)
+
+
+@pytest.mark.parametrize("load", DEFERRED)
+def test_heavy_imports_are_deferred(load):
+    assert loaded_after(load, DEFERRED[load]) == []
+
+
+def test_lazy_import_runs_the_module_on_first_use(tmp_path, monkeypatch):
+    log = types.SimpleNamespace(runs=0)
+    monkeypatch.setitem(sys.modules, "probe_log", log)
+    (tmp_path / "probe_heavy.py").write_text("import probe_log\nprobe_log.runs += 1\nVALUE = 7\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = utils.lazy_import("probe_heavy")
+    assert log.runs == 0
+    assert module.VALUE == 7
+    assert log.runs == 1
+    assert utils.lazy_import("probe_heavy") is module
+    assert log.runs == 1
+
+
+def test_lazy_import_of_a_missing_module_fails_now():
+    with pytest.raises(ModuleNotFoundError):
+        utils.lazy_import("no_such_module_anywhere")
+
+
+def test_parse_importtime_keeps_the_outermost_imports():
+    stderr = (
+        "import time: 10 | 10 | sys\n"
+        "--- load ---\n"
+        "import time:       100 |        100 |     numpy.core\n"
+        "import time:       200 |        300 |   numpy\n"
+        "import time:        50 |         50 |   utils\n"
+        "--- loaded 0.5 ---\n"
+    )
+    imports, loaded = startup.parse_importtime(stderr)
+    assert [(i.name, i.cumulative) for i in imports] == [("numpy", 0.0003), ("utils", 0.00005)]
+    assert loaded == 0.5
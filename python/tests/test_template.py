@@ -0,0 +1,47 @@
+import pytest
+
+from utils.template import compile
+
+INSTRUCTION = compile("{op:w} {n:d}")
+
+
+def test_parse_and_search():
+    result = compile("mem[{address:d}] = {value:d}").parse("mem[8] = 11")
+    assert result.named == {"address": 8, "value": 11}
+    assert compile("mem[{:d}] = {:d}").parse("mem[8] = 11x") is None
+    found = compile("{:f}x{name:l}").search("size: 2.5xwide")
+    assert (found[0], found["name"]) == (2.5, "wide")
+
+
+def test_literal_braces_and_repeated_names():
+    assert compile("{{{}}}").parse("{abc}")[0] == "abc"
+    with pytest.raises(ValueError):
+        compile("{a} {a}")
+
+
+def test_findall():
+    values = [r[0] for r in compile("<{:d}>").findall("<1> <-2> <x>")]
+    assert values == [1, -2]
+
+
+def test_scan():
+    assert list(compile("{:d}-{:d}").scan("1-3 5-7")) == [(1, 3), (5, 7)]
+    assert list(INSTRUCTION.scan("nop +0\nacc 1\n\njmp -4\n", lines=True)) == [
+        ("nop", 0),
+        ("acc", 1),
+        ("jmp", -4),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, line, content",
+    [
+        ("nop +0\nbad\nacc 1\n", 2, "bad"),
+        ("nop +0\nacc 1\nx y", 3, "x y"),
+        ("\n  \n zz\nacc 1\n", 3, " zz"),
+        ("acc 1 \nnop 2\n", 1, "acc 1 "),
+    ],
+)
+def test_scan_lines_rejects_a_line_that_does_not_match(text, line, content):
+    with pytest.raises(ValueError, match=f"line {line} doesn't match .*: {content!r}"):
+        list(INSTRUCTION.scan(text, lines=True))
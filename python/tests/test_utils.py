@@ -0,0 +1,42 @@
+import array
+
+import pytest
+
+import utils
+from aoc import inputs
+
+
+def test_int_array_from_text_and_bytes():
+    assert utils.int_array("1\n-2\n3\n") == array.array("q", [1, -2, 3])
+    assert utils.int_array(b"4,5,6\n", ",") == array.array("q", [4, 5, 6])
+
+
+def test_int_array_across_chunks():
+    data = "\n".join(map(str, range(1000)))
+    assert utils.int_array(data, chunk=7) == array.array("q", range(1000))
+
+
+def test_int_array_from_a_stored_input(tmp_path):
+    store = inputs.InputStore(tmp_path)
+    store.add(2021, 1, "199\n200\n208\n")
+    view = store.view(2021, 1)
+    assert utils.int_array(view) == array.array("q", [199, 200, 208])
+    assert utils.int_array(view[4:]) == array.array("q", [200, 208])
+
+
+def test_blank_entries():
+    with pytest.raises(ValueError, match="blank entry"):
+        utils.int_array("1\n\n2")
+    with pytest.raises(ValueError, match="blank entry"):
+        utils.int_array("1\n  \n2")
+    assert utils.int_array("1\n \n\n 2\r\n", skip_blank=True) == array.array("q", [1, 2])
+    assert utils.int_numbers("\n\n") == array.array("q")
+
+
+def test_sorted_array_keeps_the_storage():
+    values = array.array("q", [3, -1, 2])
+    ordered = utils.sorted_array(values)
+    assert ordered == array.array("q", [-1, 2, 3])
+    assert values == array.array("q", [3, -1, 2])
+    assert utils.sorted_array(array.array("d", [0.5, -0.5])) == array.array("d", [-0.5, 0.5])
+    assert utils.sorted_array(array.array("q")) == array.array("q")
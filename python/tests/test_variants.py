@@ -0,0 +1,72 @@
+import pytest
+
+from aoc import bench, crossovers, puzzles, variants
+from aoc.puzzles import Puzzle
+
+
+@pytest.fixture
+def crossovers_file(tmp_path, monkeypatch):
+    path = tmp_path / "variants.json"
+    monkeypatch.setattr(variants, "DEFAULT_PATH", path)
+    monkeypatch.setattr(variants, "_crossovers", None)
+    yield path
+    variants._crossovers = None
+
+
+def make_problem(**kwargs) -> variants.Problem:
+    problem = variants.Problem(
+        "test problem", size=len, sample=lambda size, seed: ([0] * size,), **kwargs
+    )
+    problem.variant("small")(lambda data: "small")
+    problem.variant("large")(lambda data: "large")
+    return problem
+
+
+def test_declared_crossovers_without_a_file(crossovers_file):
+    problem = make_problem(default="large", crossovers=[(8, "small"), (100, "large")])
+    assert problem([0] * 5) == "small"
+    assert problem([0] * 99) == "small"
+    assert problem([0] * 100) == "large"
+
+
+def test_raced_crossovers_replace_declared(crossovers_file):
+    variants.save({"test problem": [(8, "large"), (50, "small")]})
+    problem = make_problem(default="large", crossovers=[(8, "small"), (100, "large")])
+    assert problem([0] * 10) == "large"
+    assert problem([0] * 60) == "small"
+
+
+def test_default_without_crossovers(crossovers_file):
+    assert make_problem(default="large")([0]) == "large"
+    # a declared variant since renamed falls back to the default
+    assert make_problem(default="large", crossovers=[(0, "gone")])([0]) == "large"
+
+
+def test_lanternfish_size_scales_with_the_school(crossovers_file):
+    q06 = puzzles.load(Puzzle(2021, 6))
+    assert q06.lanternfish.size([3] * 300, 80) == 300 * q06.lanternfish.size([3], 80)
+    assert q06.lanternfish.choose(q06.lanternfish.size([3, 4, 3, 1, 2], 80)).name == "tally"
+    for size in (8, 64, 1000):
+        fish, days = q06.sample(size, seed=1)
+        assert q06.lanternfish.size(fish, days) == pytest.approx(size, rel=0.5)
+        assert q06.simulate(fish, days) == q06.tally(fish, days)
+
+
+def race(declared: variants.Crossovers) -> crossovers.Race:
+    points = {
+        "small": [bench.Point(8, [1.0]), bench.Point(32, [4.0])],
+        "large": [bench.Point(8, [2.0]), bench.Point(32, [3.0])],
+    }
+    return crossovers.Race("test problem", points, declared=declared)
+
+
+def test_race_reports_drift_from_declared_crossovers():
+    assert race([]).crossovers() == [(8, "small"), (16, "large")]
+    assert not race([]).drifted
+    assert not race([(8, "small"), (16, "large")]).drifted
+    drifted = race([(8, "small"), (100, "large")])
+    assert drifted.drifted
+    assert "declared   small from 8, large from 100, not what this host" in crossovers.report(
+        [drifted]
+    )
+    assert "declared" not in crossovers.report([race([(8, "small"), (16, "large")])])
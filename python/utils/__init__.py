@@ -0,0 +1,131 @@
+import array
+import importlib.util
+import mmap
+import sys
+import types
+import typing as t
+
+from utils.columns import Categorical, parse_columns, stream_columns
+
+G = t.TypeVar("G")
+
+
+def int_numbers(input_data: str) -> t.Sequence[int]:
+    """One int per line, skipping blank lines."""
+    return int_array(input_data, skip_blank=True)
+
+
+def int_array(
+    data: t.Union[str, bytes, bytearray, mmap.mmap, memoryview],
+    separator: str = "\n",
+    skip_blank: bool = False,
+    chunk: int = 2 ** 20,
+) -> array.array:
+    """
+    Parse `separator` separated ints from text, bytes, an mmap of a file or a memoryview of
+    one (see `InputStore.view`) into an array('q'), 8 bytes per value rather than a list of
+    boxed ints (`numpy.frombuffer(result, "int64")` views it without a copy). The input is
+    split `chunk` characters at a time, so the only intermediate objects are one chunk's
+    tokens. Whitespace around entries, including a final newline, is ignored. A blank or
+    whitespace only entry is a ValueError unless `skip_blank`.
+    """
+    if isinstance(data, memoryview):
+        # search the mapping itself, the view has no find; a view of part of it is copied
+        whole = isinstance(data.obj, (bytes, mmap.mmap)) and data.nbytes == len(data.obj)
+        data = data.obj if whole else data.tobytes()
+    sep: t.Union[str, bytes] = separator if isinstance(data, str) else separator.encode()
+    strip = type(sep).strip
+    values = array.array("q")
+    start, end = 0, len(data)
+    while end and data[end - 1 : end].isspace():
+        end -= 1
+    while start < end:
+        stop = min(start + chunk, end)
+        if stop < end:
+            # cut at the last separator in the chunk, or the first after it for huge entries
+            cut = data.rfind(sep, start, stop)
+            if cut <= start:
+                cut = data.find(sep, stop, end)
+            stop = end if cut == -1 else cut
+        tokens = data[start:stop].split(sep)
+        parsed = len(values)
+        try:
+            values.extend(map(int, filter(None, tokens) if skip_blank else tokens))
+        except ValueError:
+            # int() takes whitespace around a number but not on its own, so only strip tokens
+            # when a chunk has some whitespace-only entry
+            del values[parsed:]
+            if all(map(strip, tokens)):
+                raise
+            if not skip_blank:
+                raise ValueError(
+                    f"blank entry near offset {start}, pass skip_blank=True to ignore them"
+                ) from None
+            values.extend(map(int, filter(strip, tokens)))
+        start = stop + len(sep)
+    return values
+
+
+def sorted_array(values: array.array) -> array.array:
+    """
+    A sorted copy of an int or float array, still 8 bytes per value where `sorted` would make
+    a list of boxed ones. Sorted in place by numpy, through a view of the copy.
+    """
+    result = array.array(values.typecode, values)
+    if result:
+        _np.frombuffer(result, _np.dtype(result.typecode)).sort()
+    return result
+
+
+def parse_lines(
+    input_data: str, type_or_types: t.List = str, separator=" ", types: t.List = None
+) -> t.List:
+    """
+    Split each line by `separator` and put each token through the matching type_or_type function.
+    `types` is another name for `type_or_types`. For large inputs see `parse_columns`.
+    """
+    if types is not None:
+        type_or_types = types
+    result = []
+    for line in input_data.splitlines():
+        tokens = line.split(separator)
+        if len(tokens) == 1:
+            result.append(type_or_types(tokens[0]))
+        else:
+            result.append([t(v) for t, v in zip(type_or_types, tokens)])
+    return result
+
+
+def first(i: t.Iterable[G]) -> G:
+    """Goes boom if empty"""
+    return next(iter(i))
+
+
+def only(i: t.Iterable[G]) -> G:
+    """Goes boom if len != 1"""
+    consumed = list(i)
+    if len(consumed) != 1:
+        raise ValueError(f"i had {len(consumed)} values")
+    return consumed[0]
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Import a module on first attribute access rather than now, so heavy dependencies only cost
+    anything for the parts that use them. Attribute access at import time, e.g. in an
+    annotation, loads it straight away.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+_np = lazy_import("numpy")
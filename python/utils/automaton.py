@@ -0,0 +1,193 @@
+"""
+Step a cellular automaton over a whole numpy grid at a time.
+
+A `Rule` says how each cell's next state follows from its current state and a neighbourhood
+total. The total is a weighted sum over a `kernel` of offsets around the cell (the 8 cells
+around it by default, so a count of neighbours) or over `links`, explicit neighbour indexes
+for neighbourhoods that aren't a fixed shape. States are mapped through `values` before they
+are summed, if given, so a rule over several states can count just one of them. The
+transition is either a table indexed `[state, total]` or a function of the cells and a
+`neighbourhood` function that it can call as often as it needs to, e.g. to let changes
+cascade within one step:
+
+    seats = Rule(table, values=[0, 0, 1])
+    automaton = Automaton(grid.cells, seats)
+    automaton.run_until_stable()
+
+`Automaton` keeps two state buffers and writes each generation into the one not in use,
+recording how many cells each step changed. Off the grid every cell is `fill`; with
+`infinite=True` the fill is itself stepped, as the state of an endless plain of fill cells.
+`run_until_repeat` hashes every state it visits, so it finds a fixpoint or a cycle of any
+length without keeping the states themselves.
+"""
+from __future__ import annotations
+
+import hashlib
+import typing as t
+
+from utils import lazy_import
+
+np = lazy_import("numpy")
+
+# kernels are anything `numpy.asarray` takes, so these don't load numpy at import
+MOORE = ((1, 1, 1), (1, 0, 1), (1, 1, 1))
+VON_NEUMANN = ((0, 1, 0), (1, 0, 1), (0, 1, 0))
+
+Neighbourhood = t.Callable[["np.ndarray"], "np.ndarray"]
+Transition = t.Union["np.ndarray", t.Callable[["np.ndarray", Neighbourhood], "np.ndarray"]]
+
+
+class Rule:
+    def __init__(
+        self,
+        transition: Transition,
+        kernel: t.Any = MOORE,
+        links: t.Optional[np.ndarray] = None,
+        values: t.Optional[t.Sequence[int]] = None,
+    ):
+        self.transition = np.asarray(transition) if not callable(transition) else transition
+        self.values = None if values is None else np.asarray(values)
+        self.links = links
+        kernel = np.asarray(kernel)
+        if kernel.shape[0] % 2 == 0 or kernel.shape[1] % 2 == 0:
+            raise ValueError("a kernel needs a centre cell")
+        self.radius = max(kernel.shape) // 2
+        centre_r, centre_c = kernel.shape[0] // 2, kernel.shape[1] // 2
+        self.offsets = [
+            (r - centre_r, c - centre_c, int(kernel[r, c])) for r, c in zip(*np.nonzero(kernel))
+        ]
+        self.weight = int(kernel.sum()) if links is None else len(links)
+
+    def value(self, cells: np.ndarray) -> np.ndarray:
+        return cells if self.values is None else self.values[cells]
+
+    def neighbourhood(self, values: np.ndarray, fill: t.Any = 0) -> np.ndarray:
+        """The kernel (or links) total of `values` for every cell, `fill` off the grid."""
+        if self.links is not None:
+            # a link of -1 picks the appended fill
+            extended = np.append(values.ravel(), fill)
+            return extended[self.links].sum(axis=0, dtype=np.intp)
+        rows, columns = values.shape
+        width = self.radius
+        padded = np.pad(values, width, constant_values=fill)
+        total = np.zeros(values.shape, dtype=np.intp)
+        scratch = np.empty_like(total)
+        for dr, dc, weight in self.offsets:
+            window = padded[width + dr : width + dr + rows, width + dc : width + dc + columns]
+            if weight == 1:
+                total += window
+            else:
+                total += np.multiply(window, weight, out=scratch, dtype=np.intp)
+        return total
+
+    def next_fill(self, fill: t.Any) -> t.Any:
+        """The next state of a cell with nothing but `fill` around it, itself included."""
+        if callable(self.transition):
+
+            def uniform(values: np.ndarray) -> np.ndarray:
+                # everything the transition sums is as uniform as the cell, so it is its own fill
+                return self.neighbourhood(values, values[0, 0])
+
+            return self.transition(np.full((1, 1), fill), uniform)[0, 0]
+        return self.transition[fill, self.weight * int(self.value(np.asarray(fill)))]
+
+
+class Automaton:
+    def __init__(self, cells: np.ndarray, rule: Rule, fill: t.Any = 0, infinite: bool = False):
+        self.rule = rule
+        self.fill = cells.dtype.type(fill)
+        self.infinite = infinite
+        self.buffers = [np.array(cells), np.empty_like(cells)]
+        self.current = 0
+        self.generation = 0
+        # the number of cells each step changed
+        self.changes: t.List[int] = []
+
+    @property
+    def cells(self) -> np.ndarray:
+        return self.buffers[self.current]
+
+    def neighbourhood(self, values: np.ndarray) -> np.ndarray:
+        return self.rule.neighbourhood(values, self.rule.value(np.asarray(self.fill)))
+
+    def step(self) -> int:
+        """Move on a generation, returning the number of cells that changed."""
+        cells, target = self.cells, self.buffers[1 - self.current]
+        transition = self.rule.transition
+        if callable(transition):
+            target[...] = transition(cells, self.neighbourhood)
+        else:
+            total = self.neighbourhood(self.rule.value(cells))
+            index = cells.astype(np.intp) * transition.shape[1] + total
+            np.take(transition, index, out=target)
+        if self.infinite:
+            self.fill = cells.dtype.type(self.rule.next_fill(self.fill))
+        changed = int(np.count_nonzero(target != cells))
+        self.current = 1 - self.current
+        self.generation += 1
+        self.changes.append(changed)
+        return changed
+
+    def steps(self, limit: t.Optional[int] = None) -> t.Iterator[int]:
+        """Step `limit` times, or forever, yielding each step's number of changed cells."""
+        while limit is None or limit > 0:
+            yield self.step()
+            if limit is not None:
+                limit -= 1
+
+    def run(self, steps: int) -> t.List[int]:
+        return list(self.steps(steps))
+
+    def state_hash(self) -> bytes:
+        digest = hashlib.blake2b(self.cells.tobytes(), digest_size=16)
+        digest.update(self.fill.tobytes())
+        return digest.digest()
+
+    def run_until_repeat(self, limit: t.Optional[int] = None) -> t.Tuple[int, int]:
+        """
+        Step until a state comes round again: the generation it first appeared in and the
+        length of the cycle, which is 1 for a fixpoint.
+        """
+        seen = {self.state_hash(): self.generation}
+        for _ in self.steps(limit):
+            key = self.state_hash()
+            if key in seen:
+                return seen[key], self.generation - seen[key]
+            seen[key] = self.generation
+        raise ValueError(f"no state repeated in {limit} steps")
+
+    def run_until_stable(self, limit: t.Optional[int] = None) -> int:
+        """Step until a step changes nothing, returning the generation it settled at."""
+        start, period = self.run_until_repeat(limit)
+        if period != 1:
+            raise ValueError(f"the automaton cycles every {period} steps from generation {start}")
+        return start
+
+
+def line_of_sight(mask: np.ndarray, offsets: t.Sequence[t.Tuple[int, int]]) -> np.ndarray:
+    """
+    `links` to the nearest cell in `mask` in each direction of `offsets` from every cell:
+    its flat index, or -1 if there is none before the edge of the grid.
+
+    Each direction is one pass over the rows towards it (or columns, for a direction along a
+    row), every cell taking either the next cell along, if it is in the mask, or whatever that
+    cell sees.
+    """
+    rows, columns = mask.shape
+    links = np.full((len(offsets), rows, columns), -1, dtype=np.intp)
+    targets = np.where(mask, np.arange(rows * columns).reshape(rows, columns), -1)
+    for seen, (dr, dc) in zip(links, offsets):
+        along = targets
+        if dr == 0:
+            # transposed views make every direction cross rows, and write through to `links`
+            seen, along, dr, dc = seen.T, along.T, dc, 0
+        order = range(1, len(seen)) if dr < 0 else range(len(seen) - 2, -1, -1)
+        for r in order:
+            nearest = np.where(along[r + dr] != -1, along[r + dr], seen[r + dr])
+            if dc > 0:
+                seen[r, :-dc] = nearest[dc:]
+            elif dc < 0:
+                seen[r, -dc:] = nearest[:dc]
+            else:
+                seen[r] = nearest
+    return links
@@ -0,0 +1,87 @@
+"""
+Bit-level decoding over plain bytes and ints.
+
+`BitReader` reads big-endian unsigned fields of any width from `bytes` (or an int, or hex)
+with a cursor. A read takes the few bytes under the field from a `memoryview` and shifts
+them into place, so it costs the width of the field rather than the length of the stream,
+and `window` hands out a reader over the next n bits that shares the same bytes, where
+slicing a bit string would copy the rest of it. Decoding a stream is then linear in its
+length however the fields nest.
+
+`pattern` and `submasks` are for bit masks written out as text, like "X1001X0": the int with
+a bit set under each of some characters, and every int whose bits are a subset of a mask.
+"""
+import functools
+import typing as t
+
+
+class BitReader:
+    __slots__ = ("data", "position", "end")
+
+    def __init__(
+        self,
+        data: t.Union[bytes, bytearray, memoryview],
+        start: int = 0,
+        end: t.Optional[int] = None,
+    ):
+        self.data = memoryview(data)
+        self.position = start
+        self.end = len(self.data) * 8 if end is None else end
+
+    @classmethod
+    def from_int(cls, value: int, length: int) -> "BitReader":
+        """The low `length` bits of `value`, highest first."""
+        padding = -length % 8
+        reader = cls((value << padding).to_bytes((length + padding) // 8, "big"))
+        reader.end = length
+        return reader
+
+    @classmethod
+    def from_hex(cls, text: str) -> "BitReader":
+        """Four bits per hex digit, even for an odd number of digits."""
+        text = text.strip()
+        return cls(bytes.fromhex(text + "0" * (len(text) % 2)), end=4 * len(text))
+
+    def __len__(self):
+        """The number of bits left to read."""
+        return self.end - self.position
+
+    def read(self, n: int) -> int:
+        start = self.position
+        if start + n > self.end:
+            raise ValueError(f"can't read {n} bits with {self.end - start} left")
+        self.position = start + n
+        first, last = start >> 3, (start + n + 7) >> 3
+        chunk = int.from_bytes(self.data[first:last], "big")
+        return (chunk >> ((last << 3) - start - n)) & ((1 << n) - 1)
+
+    def flag(self) -> bool:
+        return bool(self.read(1))
+
+    def window(self, n: int) -> "BitReader":
+        """A reader over the next `n` bits, which this reader then skips."""
+        if self.position + n > self.end:
+            raise ValueError(f"can't take {n} bits with {self.end - self.position} left")
+        reader = BitReader(self.data, self.position, self.position + n)
+        self.position += n
+        return reader
+
+
+@functools.lru_cache(maxsize=None)
+def _table(ones: str) -> bytes:
+    return bytes(ord("1") if chr(c) in ones else ord("0") for c in range(256))
+
+
+def pattern(text: str, ones: str = "1") -> int:
+    """The int with a bit set for each character of `text` in `ones`, the first highest."""
+    return int(text.encode("ascii").translate(_table(ones)), 2)
+
+
+def submasks(mask: int) -> t.Iterator[int]:
+    """Every int whose set bits are all set in `mask`, from `mask` itself down to 0."""
+    sub = mask
+    while True:
+        yield sub
+        if not sub:
+            return
+        sub = (sub - 1) & mask
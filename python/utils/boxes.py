@@ -0,0 +1,208 @@
+"""
+Integer intervals and axis-aligned boxes, with inclusive bounds as the puzzles give them.
+
+A `Box` is a pair of corner tuples, `lower` and `upper`, in any number of dimensions, so a
+range along one axis is a 1-D box and a cuboid of cubes a 3-D one. Boxes intersect into a
+box and subtract into at most two boxes per dimension, none of them overlapping, so a
+`BoxSet` can keep a union of boxes as disjoint pieces and measure it by adding up volumes,
+whatever the size of the space the boxes cover.
+
+An `IntervalSet` is a union of 1-D intervals normalised into sorted arrays of starts and
+ends, overlapping or touching intervals merged, so a value is in the set if the last start
+at or below it has its end at or above it: one binary search, or one `numpy.searchsorted`
+for a whole array of values at once.
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+import typing as t
+
+from utils import lazy_import
+
+np = lazy_import("numpy")
+
+Point = t.Tuple[int, ...]
+
+
+class Box:
+    __slots__ = ("lower", "upper")
+
+    def __init__(self, lower: Point, upper: Point):
+        self.lower = tuple(lower)
+        self.upper = tuple(upper)
+
+    @classmethod
+    def of(cls, *ranges: t.Tuple[int, int]) -> "Box":
+        """The box spanning each (start, end) range along successive axes."""
+        return cls(tuple(r[0] for r in ranges), tuple(r[1] for r in ranges))
+
+    @property
+    def ranges(self) -> t.Tuple[t.Tuple[int, int], ...]:
+        return tuple(zip(self.lower, self.upper))
+
+    def __eq__(self, other: t.Any) -> bool:
+        if not isinstance(other, Box):
+            return NotImplemented
+        return self.lower == other.lower and self.upper == other.upper
+
+    def __hash__(self):
+        return hash((self.lower, self.upper))
+
+    def __repr__(self):
+        return f"Box({self.lower}, {self.upper})"
+
+    def __bool__(self):
+        return all(low <= high for low, high in zip(self.lower, self.upper))
+
+    def volume(self) -> int:
+        volume = 1
+        for low, high in zip(self.lower, self.upper):
+            if high < low:
+                return 0
+            volume *= high - low + 1
+        return volume
+
+    def __contains__(self, point: t.Sequence[int]) -> bool:
+        return all(low <= p <= high for low, p, high in zip(self.lower, point, self.upper))
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """Which of an array of points, one per row, are in the box."""
+        points = np.asarray(points)
+        return ((points >= self.lower) & (points <= self.upper)).all(axis=-1)
+
+    def intersection(self, other: "Box") -> t.Optional["Box"]:
+        """The box both boxes cover, or None if they don't overlap."""
+        box = Box(map(max, self.lower, other.lower), map(min, self.upper, other.upper))
+        return box if box else None
+
+    __and__ = intersection
+
+    def difference(self, other: "Box") -> t.List["Box"]:
+        """
+        The parts of this box outside `other`, as disjoint boxes: along each axis in turn,
+        the slabs below and above the overlap are cut off and what is left narrows to it.
+        """
+        overlap = self.intersection(other)
+        if overlap is None:
+            return [self]
+        pieces = []
+        lower, upper = list(self.lower), list(self.upper)
+        for axis, (low, high) in enumerate(overlap.ranges):
+            if lower[axis] < low:
+                pieces.append(Box(lower, upper[:axis] + [low - 1] + upper[axis + 1 :]))
+            if high < upper[axis]:
+                pieces.append(Box(lower[:axis] + [high + 1] + lower[axis + 1 :], upper))
+            lower[axis], upper[axis] = low, high
+        return pieces
+
+    __sub__ = difference
+
+
+class BoxSet:
+    """
+    A union of boxes, kept as disjoint pieces. The pieces' corners are held as two arrays, so
+    finding the pieces a new box overlaps is one comparison over all of them, and only those
+    are split.
+    """
+
+    __slots__ = ("lower", "upper")
+
+    def __init__(self, boxes: t.Iterable[Box] = (), dimensions: int = 3):
+        self.lower = np.empty((0, dimensions), dtype=np.int64)
+        self.upper = np.empty((0, dimensions), dtype=np.int64)
+        for box in boxes:
+            self.add(box)
+
+    def add(self, box: Box):
+        self.discard(box)
+        self.lower = np.vstack([self.lower, box.lower])
+        self.upper = np.vstack([self.upper, box.upper])
+
+    def discard(self, box: Box):
+        overlaps = ((self.lower <= box.upper) & (self.upper >= box.lower)).all(axis=1)
+        if not overlaps.any():
+            return
+        split = [
+            piece
+            for lower, upper in zip(self.lower[overlaps].tolist(), self.upper[overlaps].tolist())
+            for piece in Box(lower, upper).difference(box)
+        ]
+        self.lower = np.vstack([self.lower[~overlaps], *(p.lower for p in split)])
+        self.upper = np.vstack([self.upper[~overlaps], *(p.upper for p in split)])
+
+    def volume(self) -> int:
+        # as Python ints, which can't overflow
+        return sum(math.prod(sides) for sides in (self.upper - self.lower + 1).tolist())
+
+    def __contains__(self, point: t.Sequence[int]) -> bool:
+        return bool(((self.lower <= point) & (self.upper >= point)).all(axis=1).any())
+
+    def __len__(self):
+        return len(self.lower)
+
+    def __iter__(self) -> t.Iterator[Box]:
+        return map(Box, self.lower.tolist(), self.upper.tolist())
+
+
+class IntervalSet:
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals: t.Iterable[t.Tuple[int, int]] = ()):
+        starts: t.List[int] = []
+        ends: t.List[int] = []
+        for start, end in sorted(intervals):
+            if end < start:
+                continue
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+
+    def __iter__(self) -> t.Iterator[t.Tuple[int, int]]:
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def __repr__(self):
+        return f"IntervalSet({list(self)})"
+
+    def __eq__(self, other: t.Any) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __len__(self):
+        """How many ints the set holds."""
+        return int((self.ends - self.starts + 1).sum())
+
+    def __contains__(self, value: int) -> bool:
+        n = bisect.bisect_right(self.starts, value) - 1
+        return n >= 0 and bool(value <= self.ends[n])
+
+    def contains(self, values: t.Any) -> np.ndarray:
+        """Which of an array of values are in the set, with one search for all of them."""
+        values = np.asarray(values)
+        if not len(self.ends):
+            return np.zeros(values.shape, dtype=bool)
+        n = np.searchsorted(self.starts, values, side="right") - 1
+        return (n >= 0) & (values <= self.ends[np.maximum(n, 0)])
+
+    def union(self, *others: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(itertools.chain(self, *others))
+
+    __or__ = union
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        pieces = []
+        for start, end in other:
+            # the intervals of this set that could overlap this one of the other
+            first = bisect.bisect_right(self.starts, start) - 1
+            last = bisect.bisect_right(self.starts, end)
+            for s, e in zip(self.starts[max(first, 0) : last], self.ends[max(first, 0) : last]):
+                pieces.append((max(int(s), start), min(int(e), end)))
+        return IntervalSet(pieces)
+
+    __and__ = intersection
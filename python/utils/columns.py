@@ -0,0 +1,122 @@
+"""
+Parse lines of separated fields into columns rather than a list per line.
+
+`parse_columns(data, [str, int])` splits the whole input in one call and converts each column
+with one `map`, so the per-token work happens in C. Numeric columns come back as `array`s (8
+bytes per value rather than a boxed int plus a list slot), and string columns as a
+`Categorical`: one small int code per row and each distinct string stored once. The result is
+a tuple of columns, and `zip(*columns)` gives the rows back.
+
+Every line must have exactly as many fields as the schema, so blank lines are an error, and the
+first line that doesn't is reported by its number. `stream_columns` parses a file (or any
+iterable of lines) in batches of `batch` lines, so only one batch is held at a time, and all
+batches share the same categorical codes.
+"""
+import array
+import itertools
+import typing as t
+
+_typecodes = {int: "q", float: "d"}
+
+
+class Categorical:
+    """A column of strings stored as `codes` into `levels`, in order of first appearance."""
+
+    def __init__(self, codes: array.array, levels: t.List[str]):
+        self.codes = codes
+        self.levels = levels
+
+    @classmethod
+    def encode(cls, values: t.Iterable[str], index: t.Optional[t.Dict[str, int]] = None):
+        """Encode `values`, adding new levels to `index` (shared between batches) if given."""
+        index = {} if index is None else index
+        values = list(values)
+        for value in dict.fromkeys(values):
+            index.setdefault(value, len(index))
+        return cls(array.array("l", map(index.__getitem__, values)), list(index))
+
+    def code(self, value: str) -> int:
+        return self.levels.index(value)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.levels[self.codes[i]]
+
+    def __iter__(self) -> t.Iterator[str]:
+        return map(self.levels.__getitem__, self.codes)
+
+    def __repr__(self):
+        return f"Categorical({len(self)} rows, levels={self.levels!r})"
+
+
+Column = t.Union[array.array, Categorical, t.List]
+Columns = t.Tuple[Column, ...]
+
+
+def _tokens(data: str, width: int, separator: t.Optional[str], first: int = 1) -> t.List[str]:
+    first += len(data) - len(data.lstrip("\n"))
+    data = data.strip("\n")
+    if not data:
+        return []
+    lines = data.split("\n")
+    if separator is None or separator == " ":
+        tokens = data.split()
+        counts = list(map(len, map(str.split, lines)))
+    else:
+        tokens = data.replace("\n", separator).split(separator)
+        counts = [line.count(separator) + 1 for line in lines]
+    if counts.count(width) != len(counts):
+        n = next(n for n, count in enumerate(counts) if count != width)
+        raise ValueError(
+            f"line {first + n}: expected {width} fields, got {counts[n]} in {lines[n]!r}"
+        )
+    return tokens
+
+
+def _convert(
+    values: t.Sequence[str], kind: t.Callable, index: t.Optional[t.Dict[str, int]] = None
+) -> Column:
+    if kind is str:
+        return Categorical.encode(values, index)
+    if kind in _typecodes:
+        return array.array(_typecodes[kind], map(kind, values))
+    return list(map(kind, values))
+
+
+def parse_columns(
+    data: str,
+    schema: t.Sequence[t.Callable],
+    separator: t.Optional[str] = " ",
+    _indexes: t.Optional[t.List[t.Dict[str, int]]] = None,
+    _first: int = 1,
+) -> Columns:
+    """
+    One column per `schema` type: int and float give arrays, str a `Categorical`, anything
+    else a list of whatever it returns. `separator` " " or None splits on any whitespace.
+    """
+    width = len(schema)
+    tokens = _tokens(data, width, separator, _first)
+    indexes = _indexes or [{} for _ in schema]
+    return tuple(_convert(tokens[n::width], kind, indexes[n]) for n, kind in enumerate(schema))
+
+
+def stream_columns(
+    source: t.Union[str, t.Iterable[str]],
+    schema: t.Sequence[t.Callable],
+    separator: t.Optional[str] = " ",
+    batch: int = 65536,
+) -> t.Iterator[Columns]:
+    """`parse_columns` over `batch` lines at a time of a string, file or iterable of lines."""
+    lines = iter(source.splitlines(keepends=True) if isinstance(source, str) else source)
+    indexes: t.List[t.Dict[str, int]] = [{} for _ in schema]
+    first = 1
+    while True:
+        chunk = list(itertools.islice(lines, batch))
+        if not chunk:
+            return
+        # lines from a file keep their newlines, lines from elsewhere might not
+        text = "".join(line if line.endswith("\n") else line + "\n" for line in chunk)
+        yield parse_columns(text, schema, separator, indexes, first)
+        first += len(chunk)
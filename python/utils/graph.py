@@ -0,0 +1,219 @@
+"""
+Graphs over integer node ids, stored as compressed sparse rows.
+
+Node `n`'s edges are `targets[offsets[n]:offsets[n + 1]]`, with matching `weights`, so a
+graph is three flat arrays however many nodes and edges it has, rather than a dict of lists
+or an object per node. `from_edges` builds one from (source, target[, weight]) tuples of any
+hashable names, numbering the names in order of first appearance (`graph.id(name)` and
+`graph.names[id]` translate), and `lattice` builds the grid graph of a `Grid` shape directly.
+
+The searches run on plain lists copied out of the arrays once, which Python indexes faster
+than numpy, and none of them recurse:
+
+- `bfs` and `dfs` visit everything reachable from a node,
+- `reachable` and `ancestors` are the nodes reachable from (or that can reach) a node,
+- `shortest_paths` is Dijkstra with Dial's bucket queue: for small integer weights a ring of
+  `max weight + 1` buckets indexed by distance replaces the heap,
+- `topological_order` and `fold`, which computes a value for every node of a DAG from the
+  values of its successors, each node once.
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import typing as t
+
+from utils import lazy_import
+
+np = lazy_import("numpy")
+
+V = t.TypeVar("V")
+Edge = t.Tuple[int, int, V]
+
+
+class Graph:
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        targets: np.ndarray,
+        weights: t.Optional[np.ndarray] = None,
+        names: t.Optional[t.List[t.Hashable]] = None,
+    ):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = np.ones(len(targets), dtype=np.intp) if weights is None else weights
+        self.names = names
+        self.ids = None if names is None else {name: n for n, name in enumerate(names)}
+
+    @classmethod
+    def from_arrays(
+        cls,
+        nodes: int,
+        sources: t.Any,
+        targets: t.Any,
+        weights: t.Any = None,
+        names: t.Optional[t.List[t.Hashable]] = None,
+    ) -> "Graph":
+        """The graph of `nodes` nodes with an edge from each of `sources` to each of `targets`."""
+        sources = np.asarray(sources, dtype=np.intp)
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(nodes + 1, dtype=np.intp)
+        np.cumsum(np.bincount(sources, minlength=nodes), out=offsets[1:])
+        targets = np.asarray(targets, dtype=np.intp)[order]
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.intp)[order]
+        return cls(offsets, targets, weights, names)
+
+    @classmethod
+    def from_edges(cls, edges: t.Iterable[t.Tuple], undirected: bool = False) -> "Graph":
+        """
+        The graph of (source, target) or (source, target, weight) `edges` between names,
+        with each edge both ways if `undirected`.
+        """
+        ids: t.Dict[t.Hashable, int] = {}
+        sources, targets, weights = [], [], []
+        for source, target, *weight in edges:
+            sources.append(ids.setdefault(source, len(ids)))
+            targets.append(ids.setdefault(target, len(ids)))
+            weights.append(weight[0] if weight else 1)
+        if undirected:
+            sources, targets, weights = sources + targets, targets + sources, weights * 2
+        return cls.from_arrays(len(ids), sources, targets, weights, list(ids))
+
+    @classmethod
+    def lattice(cls, shape: t.Tuple[int, int], costs: t.Optional[np.ndarray] = None) -> "Graph":
+        """
+        The cells of a grid of `shape`, numbered row by row, each with an edge to the cells
+        beside it, which costs `costs[cell]` to move into if given.
+        """
+        rows, columns = shape
+        cells = np.arange(rows * columns).reshape(rows, columns)
+        pairs = [
+            (cells[:-1].ravel(), cells[1:].ravel()),
+            (cells[:, :-1].ravel(), cells[:, 1:].ravel()),
+        ]
+        sources = np.concatenate([p for a, b in pairs for p in (a, b)])
+        targets = np.concatenate([p for a, b in pairs for p in (b, a)])
+        weights = None if costs is None else np.asarray(costs).ravel()[targets]
+        return cls.from_arrays(rows * columns, sources, targets, weights)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def id(self, name: t.Hashable) -> int:
+        return self.ids[name]
+
+    def neighbours(self, node: int) -> np.ndarray:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def edges(self, node: int) -> t.Iterator[t.Tuple[int, int]]:
+        """(target, weight) for each edge out of `node`."""
+        offsets, targets, weights = self.lists
+        start, end = offsets[node], offsets[node + 1]
+        return zip(targets[start:end], weights[start:end])
+
+    @functools.cached_property
+    def lists(self) -> t.Tuple[t.List[int], t.List[int], t.List[int]]:
+        return self.offsets.tolist(), self.targets.tolist(), self.weights.tolist()
+
+    def reverse(self) -> "Graph":
+        """The same graph with every edge turned round."""
+        sources = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        return Graph.from_arrays(len(self), self.targets, sources, self.weights, self.names)
+
+    def bfs(self, source: int) -> t.List[int]:
+        """The number of edges on the shortest path from `source` to each node, or -1."""
+        offsets, targets, _ = self.lists
+        distances = [-1] * len(self)
+        distances[source] = 0
+        queue = collections.deque([source])
+        while queue:
+            node = queue.popleft()
+            step = distances[node] + 1
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                if distances[target] == -1:
+                    distances[target] = step
+                    queue.append(target)
+        return distances
+
+    def dfs(self, source: int) -> t.Iterator[int]:
+        """The nodes reachable from `source`, depth first, each as it is first visited."""
+        offsets, targets, _ = self.lists
+        seen = [False] * len(self)
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            if seen[node]:
+                continue
+            seen[node] = True
+            yield node
+            # pushed in reverse, so the first edge is followed first
+            stack.extend(reversed(targets[offsets[node] : offsets[node + 1]]))
+
+    def reachable(self, source: int) -> t.Set[int]:
+        return set(self.dfs(source))
+
+    def ancestors(self, node: int) -> t.Set[int]:
+        """The nodes with a path to `node`, not counting `node` itself."""
+        return self.reverse().reachable(node) - {node}
+
+    def shortest_paths(self, source: int, target: t.Optional[int] = None) -> t.List[float]:
+        """
+        The least total weight of a path from `source` to each node, or infinity. Weights
+        must be small non-negative ints. With a `target` the search stops once that node's
+        distance is known, and only the nodes nearer than it are sure to be final.
+        """
+        offsets, targets, weights = self.lists
+        ring = max(weights, default=0) + 1
+        buckets: t.List[t.List[int]] = [[] for _ in range(ring)]
+        distances: t.List[float] = [float("inf")] * len(self)
+        distances[source] = 0
+        buckets[0].append(source)
+        pending, distance = 1, 0
+        while pending:
+            bucket = buckets[distance % ring]
+            while bucket:
+                node = bucket.pop()
+                pending -= 1
+                # a node is queued again each time its distance improves, and only counts
+                # from the bucket of its final distance
+                if distances[node] != distance:
+                    continue
+                if node == target:
+                    return distances
+                start, end = offsets[node], offsets[node + 1]
+                for next_node, weight in zip(targets[start:end], weights[start:end]):
+                    through = distance + weight
+                    if through < distances[next_node]:
+                        distances[next_node] = through
+                        buckets[through % ring].append(next_node)
+                        pending += 1
+            distance += 1
+        return distances
+
+    def topological_order(self) -> t.List[int]:
+        """Every node, each before all the nodes it has an edge to."""
+        offsets, targets, _ = self.lists
+        incoming = np.bincount(self.targets, minlength=len(self)).tolist()
+        order = [node for node, count in enumerate(incoming) if count == 0]
+        for node in order:
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                incoming[target] -= 1
+                if incoming[target] == 0:
+                    order.append(target)
+        if len(order) != len(self):
+            raise ValueError("the graph has a cycle")
+        return order
+
+    def fold(self, combine: t.Callable[[int, t.List[Edge]], V]) -> t.List[V]:
+        """
+        A value for every node of a DAG: `combine(node, edges)`, where `edges` is a
+        (target, weight, value of target) tuple for each edge out of the node.
+        """
+        offsets, targets, weights = self.lists
+        values: t.List[t.Any] = [None] * len(self)
+        for node in reversed(self.topological_order()):
+            start, end = offsets[node], offsets[node + 1]
+            edges = [(n, w, values[n]) for n, w in zip(targets[start:end], weights[start:end])]
+            values[node] = combine(node, edges)
+        return values
@@ -0,0 +1,146 @@
+"""
+A dense 2-D grid over a numpy array, for the puzzles that come as a block of characters.
+
+Cells are indexed `[row, column]`. Whole-grid operations replace loops over cells: `shifted`
+gives, for every cell, its neighbour in some direction as an array of the same shape (with
+`fill` where that neighbour would be off the grid), so comparing a cell with its neighbours
+is `grid.cells < grid.shifted(-1, 0)` and so on, and `neighbours` gives all 4 or 8 of them at
+once. The shifted arrays are views into one padded copy rather than copies each.
+"""
+from __future__ import annotations
+
+import typing as t
+
+from utils import lazy_import
+
+np = lazy_import("numpy")
+
+ORTHOGONAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class Grid:
+    def __init__(self, cells: np.ndarray):
+        self.cells = cells
+
+    @classmethod
+    def parse(
+        cls, text: str, mapping: t.Optional[t.Dict[str, int]] = None, dtype: t.Any = "int8"
+    ) -> "Grid":
+        """
+        A rectangular block of digits, or of the characters in `mapping` mapped to its values,
+        converted as one array rather than character by character.
+        """
+        lines = text.replace("\r", "").strip("\n")
+        width = lines.find("\n") if "\n" in lines else len(lines)
+        raw = np.frombuffer((lines + "\n").encode(), dtype=np.uint8)
+        if width == 0 or len(raw) % (width + 1):
+            raise ValueError("lines aren't all the same length")
+        raw = raw.reshape(-1, width + 1)
+        if (raw[:, width] != ord("\n")).any():
+            raise ValueError("lines aren't all the same length")
+        raw = raw[:, :width]
+        if mapping is None:
+            lookup = np.full(256, -1, dtype=np.int16)
+            lookup[ord("0") : ord("9") + 1] = np.arange(10)
+        else:
+            lookup = np.full(256, -1, dtype=np.int64)
+            for char, value in mapping.items():
+                lookup[ord(char)] = value
+        cells = lookup[raw]
+        if (cells == -1).any():
+            bad = chr(raw[cells == -1][0])
+            raise ValueError(f"unexpected character {bad!r} in grid")
+        return cls(cells.astype(dtype))
+
+    @classmethod
+    def from_points(
+        cls, rows: t.Sequence[int], columns: t.Sequence[int], shape: t.Tuple[int, int] = None
+    ) -> "Grid":
+        """A boolean grid, True at each (row, column), just big enough for them by default."""
+        rows, columns = np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)
+        if shape is None:
+            shape = (int(rows.max(initial=-1)) + 1, int(columns.max(initial=-1)) + 1)
+        cells = np.zeros(shape, dtype=bool)
+        cells[rows, columns] = True
+        return cls(cells)
+
+    @property
+    def shape(self) -> t.Tuple[int, int]:
+        return self.cells.shape
+
+    @property
+    def rows(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def columns(self) -> int:
+        return self.cells.shape[1]
+
+    def __getitem__(self, key: t.Any) -> t.Any:
+        return self.cells[key]
+
+    def pad(self, width: int = 1, fill: t.Any = 0) -> "Grid":
+        return Grid(np.pad(self.cells, width, constant_values=fill))
+
+    def tile(self, rows: int, columns: int) -> "Grid":
+        """The grid repeated `rows` times down and `columns` times across."""
+        return Grid(np.tile(self.cells, (rows, columns)))
+
+    def shifted(self, dr: int, dc: int, fill: t.Any = 0) -> np.ndarray:
+        """`cells[r + dr, c + dc]` for every cell, or `fill` where that is off the grid."""
+        width = max(abs(dr), abs(dc))
+        return self._window(np.pad(self.cells, width, constant_values=fill), dr, dc, width)
+
+    def neighbours(self, fill: t.Any = 0, diagonal: bool = False) -> t.List[np.ndarray]:
+        """`shifted` in each of the 4 orthogonal directions, then the 4 diagonals if asked."""
+        padded = np.pad(self.cells, 1, constant_values=fill)
+        offsets = ORTHOGONAL + DIAGONAL if diagonal else ORTHOGONAL
+        return [self._window(padded, dr, dc, 1) for dr, dc in offsets]
+
+    def _window(self, padded: np.ndarray, dr: int, dc: int, width: int) -> np.ndarray:
+        rows, columns = self.shape
+        return padded[width + dr : width + dr + rows, width + dc : width + dc + columns]
+
+    def components(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Label the orthogonally connected regions of `mask`: each True cell gets the flat index
+        of the first cell of its region, other cells -1.
+
+        Every label is the index of a cell in the same region, so labels form trees. Each pass
+        finds cells with a lower labelled neighbour and points the root of the cell's label at
+        that lower label, merging the two trees, then follows the labels until every cell
+        points at its root. That takes a handful of whole-grid passes rather than a visit per
+        cell or a pass per step along the longest path through a region.
+        """
+        rows, columns = self.shape
+        size = rows * columns
+        # one extra slot, labelled with itself, for the cells outside the mask
+        labels = np.append(np.where(mask.ravel(), np.arange(size), size), size)
+        while True:
+            current = labels[:-1].reshape(rows, columns)
+            lowest = current.copy()
+            np.minimum(lowest[1:], current[:-1], out=lowest[1:])
+            np.minimum(lowest[:-1], current[1:], out=lowest[:-1])
+            np.minimum(lowest[:, 1:], current[:, :-1], out=lowest[:, 1:])
+            np.minimum(lowest[:, :-1], current[:, 1:], out=lowest[:, :-1])
+            changed = mask & (lowest < current)
+            if not changed.any():
+                return np.where(mask, current, -1)
+            np.minimum.at(labels, current[changed], lowest[changed])
+            while True:
+                jumped = labels[labels]
+                if (jumped == labels).all():
+                    break
+                labels = jumped
+
+    def render(self, symbols: t.Optional[str] = None) -> str:
+        """One line per row: `symbols[value]` for each cell, or the value itself."""
+        if symbols is None:
+            rows = ("".join(map(str, row)) for row in self.cells.tolist())
+        else:
+            rows = ("".join(symbols[v] for v in row) for row in self.cells.tolist())
+        return "".join(row + "\n" for row in rows)
+
+    def __str__(self):
+        return self.render()
@@ -0,0 +1,157 @@
+"""
+Hand parsed arrays to worker processes without pickling them.
+
+`Arena.publish` copies an array (or anything `numpy.asarray` accepts: a grid as nested lists,
+a list of coordinates, a list of ints) into a `multiprocessing.shared_memory` block once, and
+returns a `Shared` handle. The handle is only the block's name, dtype and shape, so sending
+it to a worker costs the same whatever the size of the input, and `Shared.view()` in the
+worker maps the block as a read-only array without copying it. `publish_ragged` does the same
+for a list of arrays of different lengths, e.g. one array of beacons per scanner.
+
+The arena owns its blocks and unlinks them when it closes, so publish inside a `with Arena()`
+that outlives the workers. `fan_out` starts the workers, and lets them unpickle functions of a
+solver, which is imported by path rather than by name:
+
+    with Arena() as arena:
+        grid = arena.publish(parsed)
+        totals = fan_out(score, grid, rows, workers=4)
+
+    def score(grid: Shared, rows: range) -> int:
+        return int(grid.view()[rows.start : rows.stop].sum())
+
+Only the arena registers a block with the resource tracker. Workers attach without
+registering, as `track=False` does from Python 3.13: they share their parent's tracker, so
+unregistering there instead would drop the arena's own registration along with theirs.
+"""
+from __future__ import annotations
+
+import dataclasses
+import importlib.util
+import itertools
+import sys
+import threading
+import typing as t
+
+from utils import lazy_import
+
+np = lazy_import("numpy")
+
+# multiprocessing is imported where it's used, so that a solver which only fans out for big
+# inputs doesn't pay for it at import
+if t.TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+# blocks this process has attached to, which must stay open while their views are in use
+_attached: t.Dict[str, shared_memory.SharedMemory] = {}
+_attaching = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    from multiprocessing import resource_tracker, shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # before 3.13 opening a block always registers it, through this module level function
+    with _attaching:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+@dataclasses.dataclass(frozen=True)
+class Shared:
+    name: str
+    dtype: str
+    shape: t.Tuple[int, ...]
+
+    def view(self) -> np.ndarray:
+        """The published array, read-only and backed by the shared block."""
+        if self.name not in _attached:
+            _attached[self.name] = _attach(self.name)
+        array = np.ndarray(self.shape, np.dtype(self.dtype), buffer=_attached[self.name].buf)
+        array.flags.writeable = False
+        return array
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedRagged:
+    values: Shared
+    offsets: Shared
+
+    def __len__(self) -> int:
+        return self.offsets.shape[0] - 1
+
+    def view(self) -> t.List[np.ndarray]:
+        values, offsets = self.values.view(), self.offsets.view()
+        return [values[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+class Arena:
+    def __init__(self):
+        self.blocks: t.List[shared_memory.SharedMemory] = []
+
+    def publish(self, value: t.Any, dtype: t.Any = None) -> Shared:
+        from multiprocessing import shared_memory
+
+        array = np.ascontiguousarray(value, dtype=dtype)
+        # a zero sized block isn't allowed, and an empty array still needs a name to attach to
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.blocks.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        return Shared(block.name, array.dtype.str, array.shape)
+
+    def publish_ragged(self, arrays: t.Sequence[t.Any], dtype: t.Any = None) -> SharedRagged:
+        """Publish arrays that differ only in their first dimension as one block."""
+        arrays = [np.asarray(a, dtype=dtype) for a in arrays]
+        offsets = np.cumsum([0] + [len(a) for a in arrays])
+        return SharedRagged(self.publish(np.concatenate(arrays)), self.publish(offsets))
+
+    def close(self):
+        for block in self.blocks:
+            # views of it taken here may outlive the arena, closing it is left to them
+            _attached.pop(block.name, None)
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _import(name: str, path: t.Optional[str]):
+    """Import the module `name` from `path` in a worker, unless it already has it."""
+    if name in sys.modules or path is None:
+        return
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+
+def fan_out(
+    func: t.Callable[[t.Any, t.Any], t.Any],
+    shared: t.Any,
+    chunks: t.Iterable[t.Any],
+    workers: int,
+) -> t.List[t.Any]:
+    """
+    `func(shared, chunk)` for every chunk, in order, across `workers` fresh processes. `shared`
+    is sent to each call, so it should be a handle, or something else small.
+    """
+    import concurrent.futures
+    import multiprocessing
+
+    path = getattr(sys.modules[func.__module__], "__file__", None)
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=_import,
+        initargs=(func.__module__, path),
+    ) as pool:
+        return list(pool.map(func, itertools.repeat(shared), chunks))
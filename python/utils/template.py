@@ -0,0 +1,128 @@
+"""
+`parse`-style templates compiled to a single `re` pattern.
+
+    >>> compile("mem[{address:d}] = {value:d}").parse("mem[8] = 11").named
+    {'address': 8, 'value': 11}
+
+Fields are `{}` or `{name}`, optionally with a type: `d` (int), `f` (float), `w` (a word) or
+`l` (letters); untyped fields match as little as they can. `{{` and `}}` are literal braces.
+`parse` matches a whole string, `search` the first match in it and `findall` every match,
+returning `Result`s that index like the `parse` library's: `result[0]` for the n-th unnamed
+field, `result["name"]` or `result.named` for named ones.
+
+`scan` is the fast path for whole inputs: one `re.finditer` over the text yielding a plain
+tuple of converted fields per match, every field in template order. With `lines=True` each
+match must be a whole line, and a line that isn't blank and doesn't match is a ValueError
+rather than skipped.
+"""
+import re
+import typing as t
+
+_field_re = re.compile(r"\{\{|\}\}|\{([A-Za-z_]\w*)?(?::([dfwl]))?\}")
+_patterns = {
+    None: r".+?",
+    "d": r"[-+]?\d+",
+    "f": r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?",
+    "w": r"\w+",
+    "l": r"[A-Za-z]+",
+}
+_converters: t.Dict[t.Optional[str], t.Callable[[str], t.Any]] = {"d": int, "f": float}
+
+
+class Result:
+    __slots__ = ("fixed", "named")
+
+    def __init__(self, fixed: t.Tuple, named: t.Dict[str, t.Any]):
+        self.fixed = fixed
+        self.named = named
+
+    def __getitem__(self, key: t.Union[int, str]) -> t.Any:
+        if isinstance(key, str):
+            return self.named[key]
+        return self.fixed[key]
+
+    def __repr__(self):
+        return f"<Result {self.fixed!r} {self.named!r}>"
+
+
+class Template:
+    def __init__(self, format: str):
+        self.format = format
+        pattern = []
+        self.names: t.List[t.Optional[str]] = []
+        self.converters: t.List[t.Tuple[int, t.Callable[[str], t.Any]]] = []
+        end = 0
+        for match in _field_re.finditer(format):
+            pattern.append(re.escape(format[end : match.start()]))
+            end = match.end()
+            if match[0] in ("{{", "}}"):
+                pattern.append(re.escape(match[0][0]))
+                continue
+            name, kind = match.groups()
+            if name is not None and name in self.names:
+                raise ValueError(f"{name!r} appears twice in {format!r}")
+            if kind in _converters:
+                self.converters.append((len(self.names), _converters[kind]))
+            self.names.append(name)
+            pattern.append(f"({_patterns[kind]})")
+        pattern.append(re.escape(format[end:]))
+        self.pattern = re.compile("".join(pattern))
+        self.lines = re.compile(f"^{self.pattern.pattern}$", re.MULTILINE)
+
+    def convert(self, groups: t.Sequence[str]) -> t.Tuple:
+        if not self.converters:
+            return tuple(groups)
+        values = list(groups)
+        for index, converter in self.converters:
+            values[index] = converter(values[index])
+        return tuple(values)
+
+    def result(self, match: t.Optional[re.Match]) -> t.Optional[Result]:
+        if match is None:
+            return None
+        values = self.convert(match.groups())
+        fixed = tuple(v for v, name in zip(values, self.names) if name is None)
+        named = {name: v for v, name in zip(values, self.names) if name is not None}
+        return Result(fixed, named)
+
+    def parse(self, text: str) -> t.Optional[Result]:
+        return self.result(self.pattern.fullmatch(text))
+
+    def search(self, text: str) -> t.Optional[Result]:
+        return self.result(self.pattern.search(text))
+
+    def findall(self, text: str) -> t.Iterator[Result]:
+        return map(self.result, self.pattern.finditer(text))
+
+    def whole_lines(self, text: str) -> t.Iterator[re.Match]:
+        """Every line of `text` matched, checking that only blank lines are left between."""
+        end = 0
+        for match in self.lines.finditer(text):
+            if not text[end : match.start()].isspace() and end < match.start():
+                self.unmatched(text, end)
+            end = match.end()
+            yield match
+        if text[end:].strip():
+            self.unmatched(text, end)
+
+    def unmatched(self, text: str, start: int):
+        """Raise for the first line after `start` that isn't blank."""
+        found = len(text) - len(text[start:].lstrip())
+        start = text.rfind("\n", 0, found) + 1
+        end = text.find("\n", found)
+        line = text[start : end if end != -1 else len(text)]
+        number = text.count("\n", 0, start) + 1
+        raise ValueError(f"line {number} doesn't match {self.format!r}: {line!r}")
+
+    def scan(self, text: str, lines: bool = False) -> t.Iterator[t.Tuple]:
+        matches = self.whole_lines(text) if lines else self.pattern.finditer(text)
+        if not self.converters:
+            return (match.groups() for match in matches)
+        return (self.convert(match.groups()) for match in matches)
+
+    def __repr__(self):
+        return f"<Template {self.format!r}>"
+
+
+def compile(format: str) -> Template:
+    return Template(format)